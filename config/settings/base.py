@@ -83,6 +83,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -157,6 +158,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "pptp.middleware.CSRFDebugMiddleware",
+    "pptp.middleware.StorageProfilingMiddleware",
 ]
 
 # STATIC
@@ -180,6 +182,23 @@ MEDIA_ROOT = str(APPS_DIR / "media")
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "/media/"
 
+# STORAGES
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#storages
+# Product photos use the "images" alias. Point DJANGO_IMAGE_STORAGE at
+# pptp.storage.local.LocalBlobStorage or InMemoryBlobStorage to run without Azure.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    "images": {
+        "BACKEND": env("DJANGO_IMAGE_STORAGE", default="pptp.storage.azure.AzureBlobStorage"),
+    },
+}
+
 # TEMPLATES
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#templates
@@ -305,3 +324,34 @@ SOCIALACCOUNT_FORMS = {"signup": "pptp.users.forms.UserSocialSignupForm"}
 AZURE_ACCOUNT_URL = os.environ.get('AZURE_ACCOUNT_URL')
 AZURE_SAS_TOKEN = os.environ.get('AZURE_SAS_TOKEN')
 AZURE_CONTAINER = os.environ.get('AZURE_CONTAINER', 'media')
+# Per-operation timeouts (seconds), retries and circuit breaker for blob storage.
+# See pptp/storage/resilience.py for the defaults.
+AZURE_STORAGE_TIMEOUTS = {
+    'connect': env.int('AZURE_STORAGE_CONNECT_TIMEOUT', default=5),
+    'save': env.int('AZURE_STORAGE_SAVE_TIMEOUT', default=60),
+    'open': env.int('AZURE_STORAGE_OPEN_TIMEOUT', default=30),
+    'delete': 10,
+    'exists': 5,
+}
+AZURE_STORAGE_RETRY = {
+    'max_attempts': env.int('AZURE_STORAGE_RETRY_ATTEMPTS', default=3),
+    'base_delay': 0.2,
+    'max_delay': 2.0,
+}
+AZURE_STORAGE_CIRCUIT_BREAKER = {
+    'failure_threshold': env.int('AZURE_STORAGE_BREAKER_THRESHOLD', default=5),
+    'reset_timeout': env.int('AZURE_STORAGE_BREAKER_RESET', default=30),
+}
+
+# Worker threads for post-upload processing (perceptual hashes etc.)
+PPTP_BACKGROUND_WORKERS = env.int('PPTP_BACKGROUND_WORKERS', default=2)
+# Worker processes for CPU-bound post-upload work (barcode decoding)
+PPTP_PROCESS_POOL_WORKERS = env.int('PPTP_PROCESS_POOL_WORKERS', default=1)
+# Images whose perceptual hashes differ by at most this many bits are flagged as duplicates
+PPTP_DUPLICATE_MAX_DISTANCE = env.int('PPTP_DUPLICATE_MAX_DISTANCE', default=6)
+# Parquet batch snapshots written by `manage.py snapshot_batches`
+PPTP_SNAPSHOT_ROOT = env('PPTP_SNAPSHOT_ROOT', default=str(Path(MEDIA_ROOT) / 'snapshots'))
+# Blob downloads kept in flight while streaming photo ZIP bundles
+PPTP_ZIP_PREFETCH = env.int('PPTP_ZIP_PREFETCH', default=8)
+# Unnamed, unsubmitted drafts without photos untouched this long are removed by `manage.py reap_drafts`
+PPTP_DRAFT_MAX_AGE_DAYS = env.int('PPTP_DRAFT_MAX_AGE_DAYS', default=7)
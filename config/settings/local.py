@@ -2,6 +2,7 @@
 from .base import *  # noqa: F403
 from .base import INSTALLED_APPS
 from .base import MIDDLEWARE
+from .base import STORAGES
 from .base import env
 
 # GENERAL
@@ -67,3 +68,12 @@ INSTALLED_APPS += ["django_extensions"]
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Keep product photos on disk unless an Azure account is configured
+STORAGES["images"]["BACKEND"] = env(
+    "DJANGO_IMAGE_STORAGE",
+    default=(
+        "pptp.storage.azure.AzureBlobStorage"
+        if env("AZURE_ACCOUNT_URL", default="")
+        else "pptp.storage.local.LocalBlobStorage"
+    ),
+)
@@ -71,6 +71,9 @@ STORAGES = {
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
+    "images": {
+        "BACKEND": "pptp.storage.azure.AzureBlobStorage",
+    },
 }
 
 # EMAIL
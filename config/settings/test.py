@@ -34,5 +34,19 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#media-url
 MEDIA_URL = "http://media.testserver"
+# Product photos never leave the test process
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    "images": {
+        "BACKEND": "pptp.storage.local.InMemoryBlobStorage",
+    },
+}
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Run background tasks in the calling thread after commit
+PPTP_BACKGROUND_TASKS_INLINE = True
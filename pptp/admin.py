@@ -1,8 +1,141 @@
 from django.contrib import admin
-from .models.products import Product, Barcode, NutritionFacts, Ingredients, ProductImage
+from django.contrib.admin.views.main import ChangeList
+from django.http import Http404, HttpResponse
+from django.urls import path, reverse
+from django.utils.cache import patch_cache_control
+from django.utils.html import format_html
+from django.utils.translation import gettext_lazy as _
 
-admin.site.register(Product)
-admin.site.register(Barcode)
-admin.site.register(NutritionFacts)
-admin.site.register(Ingredients) 
-admin.site.register(ProductImage)
\ No newline at end of file
+from .barcodes import normalize_gtin
+from .models.products import Product, Photo, get_image_storage
+from .models.progress import BatchProgress
+from .models.review import ReviewTask
+from .pagination import EstimatedCountPaginator
+from .thumbnails import get_thumbnail
+
+def thumbnail_tag(image):
+    if not image.pk or not image.is_uploaded or not image.image:
+        return '-'
+    url = reverse('admin:pptp_product_thumbnail', args=[image.pk])
+    return format_html('<img src="{}" alt="" loading="lazy" style="max-width: 160px; max-height: 160px;">', url)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables too big to COUNT(*) on every page"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class PhotoInline(admin.TabularInline):
+    model = Photo
+    extra = 0
+    fields = ['thumbnail', 'kind', 'image', 'is_uploaded', 'device_filename', 'barcode_number', 'notes', 'created_at']
+    readonly_fields = ['thumbnail', 'created_at']
+    ordering = ['kind', 'pk']
+    show_change_link = True
+
+    @admin.display(description=_("Preview"))
+    def thumbnail(self, obj):
+        return thumbnail_tag(obj)
+
+
+class ProductChangeList(ChangeList):
+    # Only the columns the changelist shows; the counters replace per-row COUNT queries
+    columns = [
+        'pk', 'product_name', 'source_batch', 'created_by', 'submission_complete',
+        'needs_manual_verification', 'created_at', *Product.COUNTER_FIELDS,
+    ]
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(*self.columns)
+
+
+@admin.register(Product)
+class ProductAdmin(LargeTableAdmin):
+    list_display = [
+        'product_name', 'source_batch', 'created_by', 'submission_complete', 'needs_manual_verification',
+        'barcode_count', 'nutrition_count', 'ingredients_count', 'photo_count', 'created_at',
+    ]
+    list_filter = ['source_batch', 'submission_complete', 'needs_manual_verification']
+    search_fields = ['product_name', '=manual_barcode', '=import_ref']
+    search_help_text = _("Product name, barcode or import reference")
+    ordering = ['-created_at']
+    readonly_fields = [
+        'created_at', 'updated_at', 'normalized_barcode', 'import_ref',
+        'barcode_count', 'nutrition_count', 'ingredients_count',
+        'front_image_count', 'back_image_count', 'side_image_count', 'other_image_count',
+    ]
+    raw_id_fields = ['created_by_user']
+    inlines = [PhotoInline]
+
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        # A scanned or typed barcode matches any formatting of the same GTIN
+        normalized = normalize_gtin(search_term)
+        if normalized:
+            return queryset.filter(normalized_barcode=normalized), False
+        return super().get_search_results(request, queryset, search_term)
+
+    @admin.display(description=_("Photos"))
+    def photo_count(self, obj):
+        return obj.product_image_count
+
+    def get_urls(self):
+        return [
+            path(
+                'thumbnail/<int:pk>/',
+                self.admin_site.admin_view(self.thumbnail_view),
+                name='pptp_product_thumbnail',
+            ),
+        ] + super().get_urls()
+
+    def thumbnail_view(self, request, pk):
+        name = Photo.objects.filter(pk=pk, is_uploaded=True).values_list('image', flat=True).first()
+        data = get_thumbnail(get_image_storage(), name) if name else None
+        if data is None:
+            raise Http404
+        response = HttpResponse(data, content_type='image/jpeg')
+        patch_cache_control(response, private=True, max_age=86400)
+        return response
+
+
+@admin.register(Photo)
+class PhotoAdmin(LargeTableAdmin):
+    list_display = ['pk', 'product_id', 'kind', 'is_uploaded', 'barcode_number', 'created_at']
+    list_filter = ['kind']
+    search_fields = ['=barcode_number', '=normalized_barcode']
+    raw_id_fields = ['product']
+    readonly_fields = [
+        'thumbnail', 'created_at', 'phash',
+        'normalized_barcode', 'decoded_at', 'decode_confidence', 'decode_ms',
+    ]
+
+    @admin.display(description=_("Preview"))
+    def thumbnail(self, obj):
+        return thumbnail_tag(obj)
+
+
+@admin.register(BatchProgress)
+class BatchProgressAdmin(admin.ModelAdmin):
+    list_display = [
+        'source_batch', 'storage_condition', 'primary_package_material',
+        'submission_complete', 'needs_manual_verification', 'product_count', 'updated_at',
+    ]
+    list_filter = ['source_batch']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReviewTask)
+class ReviewTaskAdmin(LargeTableAdmin):
+    list_display = ['pk', 'product', 'claimed_by', 'lease_expires_at', 'completed_at', 'outcome']
+    list_filter = ['outcome']
+    list_select_related = ['product', 'claimed_by']
+    raw_id_fields = ['product', 'claimed_by']
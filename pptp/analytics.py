@@ -0,0 +1,115 @@
+"""
+Claim co-occurrence and packaging cross-tabs for analysts.
+
+The report needs four columns per product: the ``claim_flags`` bitmask and
+the storage, packaging and batch choices. They are read in one
+``values_list`` query, grouped by the database, so a million products
+arrive as a few thousand distinct combinations with a count each. NumPy
+then unpacks the bitmask and weights every combination by its count.
+
+* The co-occurrence matrix is ``bits.T @ (bits * counts)``.
+* The cross-tab is a single ``bincount`` over the flattened cell index.
+
+Neither step loops over products in Python. Results are cached until a
+product is saved or deleted, keyed on the newest ``Product.updated_at``
+and the BatchProgress total.
+"""
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Max, Sum
+
+from .models import BatchProgress, Product
+from .models.products import BATCH_CHOICES, CLAIM_CHOICES, FLAG_BITS, PACKAGING_CHOICES, STORAGE_CHOICES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional analytics dependency
+    np = None
+
+CACHE_PREFIX = 'pptp:analytics'
+# Bulk updates skip updated_at, so never serve a report older than this
+CACHE_TIMEOUT = 60 * 60
+
+REPORT_COLUMNS = ['claim_flags', 'storage_condition', 'primary_package_material', 'source_batch']
+
+
+def require_numpy():
+    if np is None:
+        raise ImproperlyConfigured("The analytics report needs numpy, install it with 'pip install numpy'")
+
+
+def data_version():
+    """Changes whenever a product is saved, created or deleted"""
+    latest = Product.objects.aggregate(latest=Max('updated_at'))['latest']
+    total = BatchProgress.objects.aggregate(total=Sum('product_count'))['total']
+    return f"{latest.timestamp() if latest else 0}:{total or 0}"
+
+
+def encode(values, choices):
+    """Integer codes for ``values``; labels start with ``choices`` and grow with unknown values"""
+    labels = dict(choices)
+    index = {value: code for code, value in enumerate(labels)}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.intp, count=len(values))
+    return codes, [labels.get(value, value or '-') for value in index]
+
+
+def claim_cooccurrence(flags, counts):
+    """``(claims, claims)`` matrix of products carrying both claims; the diagonal is each claim alone"""
+    bits = np.array([FLAG_BITS[field] for field, _label in CLAIM_CHOICES], dtype=np.int64)
+    present = ((flags[:, None] & bits) != 0).astype(np.int64)
+    return present.T @ (present * counts[:, None])
+
+
+def packaging_crosstab(storage, material, batch, counts, shape):
+    """``(storage, material, batch)`` array of product counts"""
+    cells = np.ravel_multi_index((storage, material, batch), shape)
+    return np.bincount(cells, weights=counts, minlength=int(np.prod(shape))).astype(np.int64).reshape(shape)
+
+
+def build_report():
+    require_numpy()
+    rows = list(
+        Product.objects.order_by()
+        .values_list(*REPORT_COLUMNS)
+        .annotate(count=Count('pk'))
+    )
+    flags, storage, material, batch, counts = zip(*rows) if rows else ([], [], [], [], [])
+    flags = np.array(flags, dtype=np.int64)
+    counts = np.array(counts, dtype=np.int64)
+    storage, storage_labels = encode(storage, STORAGE_CHOICES)
+    material, material_labels = encode(material, PACKAGING_CHOICES)
+    # Unbatched products are grouped under '' whether stored as NULL or ''
+    batch, batch_labels = encode([value or '' for value in batch], BATCH_CHOICES + [('', '-')])
+
+    matrix = claim_cooccurrence(flags, counts)
+    crosstab = packaging_crosstab(
+        storage, material, batch, counts, (len(storage_labels), len(material_labels), len(batch_labels))
+    )
+    batch_totals = crosstab.sum(axis=(0, 1))
+    return {
+        'total': int(counts.sum()),
+        'claims': {
+            'labels': [label for _field, label in CLAIM_CHOICES],
+            'fields': [field for field, _label in CLAIM_CHOICES],
+            'cooccurrence': matrix.tolist(),
+        },
+        'packaging': {
+            'storage': storage_labels,
+            'materials': material_labels,
+            'batches': [
+                {'label': label, 'total': int(total), 'counts': crosstab[:, :, index].tolist()}
+                for index, (label, total) in enumerate(zip(batch_labels, batch_totals))
+                if total
+            ],
+        },
+    }
+
+
+def get_report():
+    """The report for the current data, built at most once per change"""
+    key = f'{CACHE_PREFIX}:{data_version()}'
+    report = cache.get(key)
+    if report is None:
+        report = build_report()
+        cache.set(key, report, CACHE_TIMEOUT)
+    return report
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class PptpConfig(AppConfig):
+    name = "pptp"
+    verbose_name = _("Product Photos")
+
+    def ready(self):
+        import pptp.signals  # noqa: F401
@@ -0,0 +1,101 @@
+"""
+Barcode lookup: which products have already been collected with a barcode.
+
+Both the number a collector types (``Product.manual_barcode``) and numbers
+read from barcode photos (``Barcode.barcode_number``) are stored as a
+normalised GTIN-14 in an indexed ``normalized_barcode`` column, so a UPC-A
+and the equivalent EAN-13 find each other. Results are cached per code in
+the Django cache (Redis in production) because the upload page looks codes
+up as the collector types.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from .barcodes import normalize_gtin
+from .models import Product
+
+CACHE_PREFIX = 'pptp:barcode_lookup'
+CACHE_TIMEOUT = 60 * 10
+MAX_MATCHES = 20
+
+
+def cache_key(normalized):
+    return f'{CACHE_PREFIX}:{normalized}'
+
+
+def invalidate_lookup(*codes):
+    # Drop the entries once the change is visible: deleted any earlier, a
+    # concurrent lookup would cache the old rows again for CACHE_TIMEOUT.
+    keys = [cache_key(code) for code in codes if code]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def find_products(normalized, source_batch=None):
+    """
+    Uncached lookup of the products carrying the normalised code, newest
+    first. The batch filter is part of the queries so a busy code's matches
+    in other batches cannot crowd out the ones asked for. One row more than
+    MAX_MATCHES is kept so the caller can drop the product being edited.
+    """
+    limit = MAX_MATCHES + 1
+    products = Product.objects.all()
+    if source_batch:
+        products = products.filter(source_batch=source_batch)
+
+    matched_on = {}
+    manual = products.filter(normalized_barcode=normalized).order_by('-created_at').values_list('pk', flat=True)
+    for pk in manual[:limit]:
+        matched_on.setdefault(pk, []).append('manual_barcode')
+    decoded = (
+        products.filter(photos__kind='barcode', photos__normalized_barcode=normalized)
+        .order_by('-created_at')
+        .values_list('pk', flat=True)
+        .distinct()
+    )
+    for pk in decoded[:limit]:
+        matched_on.setdefault(pk, []).append('barcode_photo')
+
+    # Collectors' emails are left out: any signed-in user can call the lookup
+    products = (
+        Product.objects.filter(pk__in=matched_on)
+        .only('pk', 'product_name', 'source_batch', 'submission_complete', 'created_at')
+        .order_by('-created_at')
+    )
+    return [
+        {
+            'id': product.pk,
+            'product_name': product.product_name,
+            'source_batch': product.source_batch,
+            'submission_complete': product.submission_complete,
+            'created_at': product.created_at.isoformat(),
+            'matched_on': matched_on[product.pk],
+        }
+        for product in products[:limit]
+    ]
+
+
+def lookup_barcode(value, source_batch=None, exclude=None):
+    """
+    Products already collected with the barcode ``value``, newest first and
+    at most MAX_MATCHES. Returns ``(normalized, matches)``; ``normalized`` is
+    '' (and there are no matches) while the value is not yet a complete,
+    valid GTIN.
+    """
+    normalized = normalize_gtin(value)
+    if not normalized:
+        return '', []
+
+    # One cache entry per code holds each batch's matches, so saving a
+    # barcode invalidates them all at once
+    key = cache_key(normalized)
+    by_batch = cache.get(key) or {}
+    batch_key = source_batch or ''
+    if batch_key not in by_batch:
+        by_batch[batch_key] = find_products(normalized, source_batch)
+        cache.set(key, by_batch, CACHE_TIMEOUT)
+    matches = by_batch[batch_key]
+
+    if exclude is not None:
+        matches = [match for match in matches if match['id'] != exclude]
+    return normalized, matches[:MAX_MATCHES]
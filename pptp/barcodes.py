@@ -0,0 +1,328 @@
+"""
+Barcode helpers: a small EAN-13 / UPC-A / EAN-8 decoder for barcode photos.
+
+The decoder is pure Python on top of Pillow so it runs anywhere. If pyzbar
+(and the zbar shared library) is installed it is tried first, since it copes
+better with blur and skew. Nothing in this module touches Django at import
+time so worker processes can import it cheaply.
+"""
+import io
+import time
+from collections import Counter
+
+from PIL import Image, ImageOps
+
+try:
+    from pyzbar import pyzbar
+except ImportError:  # pragma: no cover - optional native decoder
+    pyzbar = None
+
+
+# Run lengths (in modules) of the L-code for each digit: space, bar, space, bar.
+# R-codes have the same run lengths starting with a bar; G-codes are reversed.
+L_RUNS = {
+    0: (3, 2, 1, 1),
+    1: (2, 2, 2, 1),
+    2: (2, 1, 2, 2),
+    3: (1, 4, 1, 1),
+    4: (1, 1, 3, 2),
+    5: (1, 2, 3, 1),
+    6: (1, 1, 1, 4),
+    7: (1, 3, 1, 2),
+    8: (1, 2, 1, 3),
+    9: (3, 1, 1, 2),
+}
+G_RUNS = {digit: tuple(reversed(runs)) for digit, runs in L_RUNS.items()}
+
+# Parity (L or G) of the six left-hand digits encodes the first EAN-13 digit.
+FIRST_DIGIT_PARITY = {
+    'LLLLLL': 0, 'LLGLGG': 1, 'LLGGLG': 2, 'LLGGGL': 3, 'LGLLGG': 4,
+    'LGGLLG': 5, 'LGGGLL': 6, 'LGLGLG': 7, 'LGLGGL': 8, 'LGGLGL': 9,
+}
+
+MAX_WIDTH = 1600
+SCANLINES = 15
+# Average per-run error (in modules) above which a digit match is rejected
+MAX_DIGIT_ERROR = 0.45
+
+
+class DecodeResult:
+    __slots__ = ('number', 'symbology', 'confidence', 'decoder', 'elapsed_ms')
+
+    def __init__(self, number, symbology, confidence, decoder, elapsed_ms=0):
+        self.number = number
+        self.symbology = symbology
+        self.confidence = confidence
+        self.decoder = decoder
+        self.elapsed_ms = elapsed_ms
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def gtin_check_digit(digits):
+    """Check digit for the GTIN payload ``digits`` (all digits except the last)"""
+    total = 0
+    for position, char in enumerate(reversed(digits)):
+        total += int(char) * (3 if position % 2 == 0 else 1)
+    return str((10 - total % 10) % 10)
+
+
+def has_valid_check_digit(number):
+    return len(number) > 1 and number.isdigit() and gtin_check_digit(number[:-1]) == number[-1]
+
+
+GTIN_LENGTHS = (8, 12, 13, 14)
+
+
+def normalize_gtin(value):
+    """
+    Canonical GTIN-14 key for a typed or decoded barcode, or '' if it is not a
+    valid GTIN. Zero-padding leaves the check digit unchanged and makes a UPC-A
+    code and its EAN-13 form (with the leading 0) the same key.
+    """
+    digits = str(value or '').strip().replace(' ', '').replace('-', '')
+    if len(digits) not in GTIN_LENGTHS or not has_valid_check_digit(digits):
+        return ''
+    return digits.zfill(14)
+
+
+def run_lengths(row):
+    """Collapse a binarised scanline into [(is_bar, width), ...]"""
+    runs = []
+    current = row[0]
+    width = 0
+    for value in row:
+        if value == current:
+            width += 1
+        else:
+            runs.append((current, width))
+            current = value
+            width = 1
+    runs.append((current, width))
+    return runs
+
+
+def binarise(pixels):
+    ordered = sorted(pixels)
+    low = ordered[len(ordered) // 10]
+    high = ordered[(len(ordered) * 9) // 10]
+    if high - low < 40:
+        return None
+    threshold = (low + high) / 2
+    return [value < threshold for value in pixels]
+
+
+def match_digit(widths, module, tables):
+    best = None
+    for parity, table in tables:
+        for digit, pattern in table.items():
+            error = sum(abs(width / module - expected) for width, expected in zip(widths, pattern)) / 4
+            if best is None or error < best[0]:
+                best = (error, digit, parity)
+    if best is None or best[0] > MAX_DIGIT_ERROR:
+        return None
+    return best
+
+
+def guard_ok(widths, module):
+    return all(0.4 <= width / module <= 1.8 for width in widths)
+
+
+def decode_ean_runs(widths, digits_per_side):
+    """
+    Decode an EAN-13 (6 digits per side) or EAN-8 (4 per side) symbol from the
+    run widths starting at the first bar of the start guard.
+    """
+    modules = 3 + digits_per_side * 7 + 5 + digits_per_side * 7 + 3
+    module = sum(widths) / modules
+
+    left_start = 3
+    center = left_start + digits_per_side * 4
+    right_start = center + 5
+    end = right_start + digits_per_side * 4
+    if not (guard_ok(widths[:3], module) and guard_ok(widths[center:right_start], module)
+            and guard_ok(widths[end:end + 3], module)):
+        return None
+
+    left_tables = [('L', L_RUNS), ('G', G_RUNS)] if digits_per_side == 6 else [('L', L_RUNS)]
+    digits = []
+    parities = []
+    errors = []
+    for index in range(digits_per_side):
+        chunk = widths[left_start + index * 4:left_start + index * 4 + 4]
+        # Each digit is exactly 7 modules wide, so normalise locally for skew
+        match = match_digit(chunk, sum(chunk) / 7, left_tables)
+        if match is None:
+            return None
+        errors.append(match[0])
+        digits.append(match[1])
+        parities.append(match[2])
+
+    for index in range(digits_per_side):
+        chunk = widths[right_start + index * 4:right_start + index * 4 + 4]
+        match = match_digit(chunk, sum(chunk) / 7, [('R', L_RUNS)])
+        if match is None:
+            return None
+        errors.append(match[0])
+        digits.append(match[1])
+
+    if digits_per_side == 6:
+        first = FIRST_DIGIT_PARITY.get(''.join(parities))
+        if first is None:
+            return None
+        digits.insert(0, first)
+
+    number = ''.join(str(digit) for digit in digits)
+    if not has_valid_check_digit(number):
+        return None
+    return number, 1 - sum(errors) / len(errors)
+
+
+def decode_runs(runs):
+    """Look for an EAN symbol anywhere in a scanline's runs"""
+    for digits_per_side, count in ((6, 59), (4, 43)):
+        for start in range(len(runs) - count + 1):
+            if not runs[start][0]:
+                continue
+            widths = [width for _, width in runs[start:start + count]]
+            decoded = decode_ean_runs(widths, digits_per_side)
+            if decoded:
+                return decoded
+    return None
+
+
+def decode_scanlines(image):
+    width, height = image.size
+    pixels = image.load()
+    results = []
+    attempted = 0
+    for line in range(SCANLINES):
+        y = int(height * (0.1 + 0.8 * line / max(1, SCANLINES - 1)))
+        row = binarise([pixels[x, y] for x in range(width)])
+        if row is None:
+            continue
+        attempted += 1
+        runs = run_lengths(row)
+        # Read left-to-right, then right-to-left for upside-down photos
+        decoded = decode_runs(runs) or decode_runs(list(reversed(runs)))
+        if decoded:
+            results.append(decoded)
+    return results, attempted
+
+
+def symbology_for(number):
+    if len(number) == 8:
+        return 'EAN8'
+    if len(number) == 13 and number.startswith('0'):
+        return 'UPCA'
+    return 'EAN13'
+
+
+def display_number(number):
+    """UPC-A codes are printed with 12 digits, without the EAN-13 leading zero"""
+    return number[1:] if symbology_for(number) == 'UPCA' else number
+
+
+def decode_with_pyzbar(image):
+    if pyzbar is None:
+        return None
+    symbols = [
+        symbol for symbol in pyzbar.decode(image)
+        if symbol.type in ('EAN13', 'UPCA', 'EAN8')
+    ]
+    if not symbols:
+        return None
+    # zbar only reports symbols whose check digit verified, so treat them as certain
+    number = symbols[0].data.decode('ascii')
+    return DecodeResult(display_number(number), symbology_for(number), 1.0, 'zbar')
+
+
+def decode_image(image):
+    """Decode the first EAN/UPC barcode in a PIL image, or return None"""
+    native = decode_with_pyzbar(image)
+    if native:
+        return native
+
+    image = ImageOps.exif_transpose(image).convert('L')
+    if image.width > MAX_WIDTH:
+        image = image.resize((MAX_WIDTH, int(image.height * MAX_WIDTH / image.width)))
+
+    for candidate in (image, image.rotate(90, expand=True)):
+        results, attempted = decode_scanlines(candidate)
+        if not results:
+            continue
+        votes = Counter(number for number, _ in results)
+        number, count = votes.most_common(1)[0]
+        quality = sum(score for found, score in results if found == number) / count
+        # Agreement across scanlines times how cleanly the digits matched
+        confidence = round(quality * count / max(attempted, 1), 3)
+        return DecodeResult(display_number(number), symbology_for(number), confidence, 'pillow')
+    return None
+
+
+def decode_image_bytes(data):
+    """
+    Entry point for worker processes: bytes in, DecodeResult (or None) out,
+    with the time spent decoding.
+    """
+    start = time.perf_counter()
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            result = decode_image(image)
+    except (OSError, ValueError):
+        result = None
+    elapsed_ms = int((time.perf_counter() - start) * 1000)
+    if result is not None:
+        result.elapsed_ms = elapsed_ms
+    return result, elapsed_ms
+
+
+def save_decode_result(barcode_pk, result, elapsed_ms):
+    """Store a decode attempt; never overwrites a number the collector entered"""
+    from django.utils import timezone
+
+    from .models import Barcode
+
+    updates = {'decoded_at': timezone.now(), 'decode_ms': elapsed_ms}
+    if result is None:
+        updates['decode_confidence'] = 0
+        Barcode.objects.filter(pk=barcode_pk).update(**updates)
+        return None
+
+    updates['decode_confidence'] = result.confidence
+    Barcode.objects.filter(pk=barcode_pk).update(**updates)
+    normalized = normalize_gtin(result.number)
+    filled = Barcode.objects.filter(pk=barcode_pk, barcode_number='').update(
+        barcode_number=result.number,
+        normalized_barcode=normalized,
+    )
+    if filled:
+        from .barcode_index import invalidate_lookup
+        from .models import Product
+        invalidate_lookup(normalized)
+        Product.objects.filter(photos=barcode_pk).touch_images()
+    return result
+
+
+def decode_stored_barcode(barcode_pk):
+    """Background task: decode one uploaded barcode photo in the process pool"""
+    from django.conf import settings
+
+    from .models import Barcode
+    from .storage.utils import read_blob
+    from .tasks import get_process_pool
+
+    barcode = Barcode.objects.filter(pk=barcode_pk).first()
+    if barcode is None or not barcode.image:
+        return None
+    data = read_blob(barcode.image.storage, barcode.image.name)
+    if not data:
+        return None
+
+    if getattr(settings, 'PPTP_BACKGROUND_TASKS_INLINE', False):
+        result, elapsed_ms = decode_image_bytes(data)
+    else:
+        result, elapsed_ms = get_process_pool().submit(decode_image_bytes, data).result()
+    return save_decode_result(barcode_pk, result, elapsed_ms)
@@ -0,0 +1,122 @@
+"""
+Streaming ZIP bundles of product photos.
+
+Blobs are downloaded by a small thread pool while earlier ones are being
+written out, keeping at most ``prefetch`` downloads in flight or waiting to
+be written, so memory use is bounded by the window rather than the batch.
+Photos are stored uncompressed (JPEG/PNG are already compressed) in
+``<product_id>/<image_type>/<image_id>_<filename>`` and a ``manifest.csv``
+describing every entry is written last.
+"""
+import csv
+import io
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Photo
+from .storage.azure import AzureBlobStorageError
+from .storage.utils import read_blob
+
+DEFAULT_PREFETCH = 8
+
+MANIFEST_COLUMNS = ['product_id', 'product_name', 'image_type', 'image_id', 'path', 'blob_name', 'size', 'status']
+
+def get_prefetch():
+    return getattr(settings, 'PPTP_ZIP_PREFETCH', DEFAULT_PREFETCH)
+
+
+def bundle_entries(products):
+    """Yield one dict per uploaded photo of the ``products`` queryset"""
+    rows = (
+        Photo.objects.filter(product__in=products, is_uploaded=True)
+        .exclude(image='')
+        .order_by('product_id', 'pk')
+        .values_list('pk', 'product_id', 'product__product_name', 'image', 'kind')
+        .iterator(chunk_size=2000)
+    )
+    for pk, product_id, product_name, blob_name, image_type in rows:
+        yield {
+            'product_id': product_id,
+            'product_name': product_name,
+            'image_type': image_type,
+            'image_id': pk,
+            'path': f'{product_id}/{image_type}/{pk}_{os.path.basename(blob_name)}',
+            'blob_name': blob_name,
+        }
+
+
+class StreamBuffer:
+    """Write-only sink for ZipFile; drain() hands back what was written since"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def fetch(storage, entry):
+    try:
+        data = read_blob(storage, entry['blob_name'])
+    except AzureBlobStorageError as e:
+        return entry, None, f'error: {e}'
+    return entry, data, 'ok' if data is not None else 'missing'
+
+
+def prefetched(storage, entries, prefetch):
+    """Download entries concurrently, yielding (entry, data, status) in order"""
+    executor = ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix='pptp-zip')
+    window = deque()
+    try:
+        for entry in entries:
+            window.append(executor.submit(fetch, storage, entry))
+            if len(window) >= prefetch:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+    finally:
+        for future in window:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stream_zip(entries, storage, prefetch=None):
+    """Yield the bytes of a ZIP archive holding ``entries`` and a manifest"""
+    buffer = StreamBuffer()
+    manifest = io.StringIO()
+    writer = csv.DictWriter(manifest, fieldnames=MANIFEST_COLUMNS)
+    writer.writeheader()
+    now = timezone.localtime().timetuple()[:6]
+
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for entry, data, status in prefetched(storage, entries, prefetch or get_prefetch()):
+            size = None
+            if data is not None:
+                info = zipfile.ZipInfo(entry['path'], date_time=now)
+                info.compress_type = zipfile.ZIP_STORED
+                archive.writestr(info, data)
+                size = len(data)
+                del data
+            writer.writerow({**entry, 'size': size, 'status': status})
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+
+        info = zipfile.ZipInfo('manifest.csv', date_time=now)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        archive.writestr(info, manifest.getvalue())
+    yield buffer.drain()
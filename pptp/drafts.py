@@ -0,0 +1,82 @@
+"""
+Abandoned submission drafts.
+
+A new submission only gets a Product row once its page uploads a photo or
+is saved (see ``get_draft`` in views/products.py). Drafts that were never
+given a name or submitted and have not changed for
+``PPTP_DRAFT_MAX_AGE_DAYS`` are abandoned. Unless asked to, the reaper
+leaves drafts with photos alone: a collector may photograph a product and
+come back to name it weeks later. :func:`reap_drafts` deletes them a chunk
+at a time and then deletes their photo blobs and thumbnails. Blobs
+are only removed after the rows are gone, so a failure part way through
+leaves orphaned blobs rather than rows that point at missing files.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Photo, Product
+from .models.products import get_image_storage
+from .storage.azure import AzureBlobStorageError
+from .thumbnails import thumbnail_name
+
+DEFAULT_MAX_AGE_DAYS = 7
+DEFAULT_CHUNK_SIZE = 500
+
+
+def get_max_age():
+    return timedelta(days=getattr(settings, 'PPTP_DRAFT_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS))
+
+
+def abandoned_drafts(max_age=None, with_photos=False):
+    cutoff = timezone.now() - (max_age or get_max_age())
+    drafts = Product.objects.filter(submission_complete=False, product_name='', updated_at__lt=cutoff)
+    if not with_photos:
+        drafts = drafts.filter(~Exists(Photo.objects.filter(product=OuterRef('pk'))))
+    return drafts
+
+
+def reap_drafts(chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, max_age=None, with_photos=False, storage=None):
+    """
+    Delete abandoned drafts and their blobs. Drafts with photos are only
+    included with ``with_photos``. Returns ``(products, blobs, failed blob
+    names)``; with ``dry_run`` nothing is deleted and the counts are what
+    would have been.
+    """
+    storage = storage or get_image_storage()
+    drafts = abandoned_drafts(max_age, with_photos)
+    products = blobs = 0
+    failed = []
+    last_pk = 0
+    while True:
+        # Walk by primary key; a dry run cannot rely on deleted rows dropping out
+        pks = list(drafts.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+        if dry_run:
+            products += len(pks)
+            blobs += Photo.objects.filter(product_id__in=pks).exclude(image='').count()
+            continue
+
+        with transaction.atomic():
+            # Lock the rows and re-check them: an upload since the pks were read
+            # bumps updated_at, and that product and its blobs must survive.
+            # New photos of a locked row wait for the delete and then fail.
+            pks = list(drafts.filter(pk__in=pks).select_for_update().values_list('pk', flat=True))
+            names = list(
+                Photo.objects.filter(product_id__in=pks).exclude(image='').values_list('image', flat=True)
+            )
+            Product.objects.filter(pk__in=pks).delete()
+        products += len(pks)
+        blobs += len(names)
+        for name in names:
+            try:
+                storage.delete(name)
+                storage.delete(thumbnail_name(name))
+            except AzureBlobStorageError:
+                failed.append(name)
+    return products, blobs, failed
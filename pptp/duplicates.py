@@ -0,0 +1,198 @@
+"""
+Perceptual hashing and near-duplicate lookup for product photos.
+
+Every image gets a 64-bit difference hash (dHash). Two photos of the same
+package taken in different sessions end up a few bits apart, so "near
+duplicate" means a small Hamming distance between hashes.
+
+To avoid comparing against the whole corpus, the hash is also stored as four
+indexed 16-bit chunks (multi-index hashing). If two hashes are within
+``d`` bits, at least one chunk differs by at most ``d // 4`` bits, so the
+candidates are the rows where some chunk is one of a handful of values.
+"""
+import io
+from itertools import combinations
+
+from django.conf import settings
+from django.db.models import Q
+from PIL import Image
+
+from .storage.utils import read_blob
+
+HASH_BITS = 64
+CHUNKS = 4
+CHUNK_BITS = HASH_BITS // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+HASH_MASK = (1 << HASH_BITS) - 1
+
+DEFAULT_MAX_DISTANCE = 6
+
+
+def get_max_distance():
+    return getattr(settings, 'PPTP_DUPLICATE_MAX_DISTANCE', DEFAULT_MAX_DISTANCE)
+
+
+def dhash(image):
+    """Difference hash of a PIL image as an unsigned 64-bit int"""
+    small = image.convert('L').resize((9, 8), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left < right)
+    return value
+
+
+def hash_image_bytes(data):
+    with Image.open(io.BytesIO(data)) as image:
+        return dhash(image)
+
+
+def to_signed(value):
+    """Postgres bigint is signed, so store the top bit as the sign"""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def to_unsigned(value):
+    return value & HASH_MASK
+
+
+def split_hash(value):
+    value = to_unsigned(value)
+    return tuple((value >> (CHUNK_BITS * index)) & CHUNK_MASK for index in range(CHUNKS))
+
+
+def hamming(a, b):
+    return ((to_unsigned(a) ^ to_unsigned(b))).bit_count()
+
+
+def hash_fields(value):
+    """Model field values for an unsigned hash"""
+    fields = {'phash': to_signed(value)}
+    for index, chunk in enumerate(split_hash(value)):
+        fields[f'phash_{index}'] = chunk
+    return fields
+
+
+def chunk_variants(chunk, radius):
+    variants = {chunk}
+    for distance in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), distance):
+            flipped = chunk
+            for bit in bits:
+                flipped ^= 1 << bit
+            variants.add(flipped)
+    return variants
+
+
+def candidate_filter(hashes, max_distance):
+    """Q matching every row that could be within ``max_distance`` of any of ``hashes``"""
+    radius = max_distance // CHUNKS
+    per_chunk = [set() for _ in range(CHUNKS)]
+    for value in hashes:
+        for index, chunk in enumerate(split_hash(value)):
+            per_chunk[index] |= chunk_variants(chunk, radius)
+
+    query = Q()
+    for index, values in enumerate(per_chunk):
+        if values:
+            query |= Q(**{f'phash_{index}__in': sorted(values)})
+    return query
+
+
+def compute_image_hash(model, pk):
+    """Hash one stored image and save the result; used as a background task"""
+    from .models.products import Product
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not instance.image:
+        return None
+
+    data = read_blob(instance.image.storage, instance.image.name)
+    if not data:
+        return None
+
+    try:
+        value = hash_image_bytes(data)
+    except (OSError, ValueError):
+        # Not an image Pillow understands; nothing to compare against.
+        return None
+
+    model.objects.filter(pk=pk).update(**hash_fields(value))
+    # The edit page's duplicate warnings depend on the hash
+    Product.objects.filter(pk=instance.product_id).touch_images()
+    return value
+
+
+def find_near_duplicates(images, max_distance=None):
+    """
+    Find stored images of *other* products within ``max_distance`` bits of any
+    of ``images``. Returns ``{image: [(distance, match), ...]}`` sorted by distance.
+    """
+    from .models.products import Photo
+
+    max_distance = get_max_distance() if max_distance is None else max_distance
+    hashed = [image for image in images if image.phash is not None]
+    if not hashed:
+        return {}
+
+    query = candidate_filter([image.phash for image in hashed], max_distance)
+    product_ids = {image.product_id for image in hashed}
+
+    candidates = list(Photo.objects.filter(query).exclude(product_id__in=product_ids).select_related('product'))
+
+    results = {}
+    for image in hashed:
+        matches = []
+        for candidate in candidates:
+            distance = hamming(image.phash, candidate.phash)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        if matches:
+            results[image] = sorted(matches, key=lambda match: match[0])
+    return results
+
+
+def find_duplicates_for_product(product, max_distance=None):
+    """Near-duplicates of every photo of ``product``, in a fixed number of queries"""
+    from .models.products import Photo
+
+    images = list(Photo.objects.filter(product=product, phash__isnull=False))
+    return find_near_duplicates(images, max_distance)
+
+
+class HashIndex:
+    """
+    In-memory multi-index over a set of hashes, for batch reports that
+    compare many images against the whole corpus in one pass.
+    """
+
+    def __init__(self):
+        self.tables = [{} for _ in range(CHUNKS)]
+        self.hashes = {}
+
+    def add(self, key, value):
+        value = to_unsigned(value)
+        self.hashes[key] = value
+        for index, chunk in enumerate(split_hash(value)):
+            self.tables[index].setdefault(chunk, []).append(key)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def query(self, value, max_distance):
+        value = to_unsigned(value)
+        radius = max_distance // CHUNKS
+        seen = set()
+        matches = []
+        for index, chunk in enumerate(split_hash(value)):
+            for variant in chunk_variants(chunk, radius):
+                for key in self.tables[index].get(variant, ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    distance = hamming(value, self.hashes[key])
+                    if distance <= max_distance:
+                        matches.append((distance, key))
+        return sorted(matches)
@@ -0,0 +1,132 @@
+"""
+Streaming exports of products with their image metadata.
+
+Rows are produced one at a time from ``iterator(chunk_size=...)``; image
+rows are prefetched per chunk (one query per chunk, not per product), so
+memory use stays flat however many products are exported.
+"""
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .models import Photo, Product
+from .models.products import PRODUCT_IMAGE_KINDS
+
+DEFAULT_CHUNK_SIZE = 2000
+FORMATS = ('csv', 'jsonl')
+
+PRODUCT_FIELDS = [
+    'id',
+    'created_at',
+    'updated_at',
+    'created_by',
+    'source_batch',
+    'submission_complete',
+    'is_offline',
+    'product_name',
+    'manual_barcode',
+    'normalized_barcode',
+    'package_size',
+    'package_size_unit',
+    'num_units',
+    'storage_condition',
+    'primary_package_material',
+    'secondary_package_material',
+    'is_variety_pack',
+    'is_supplemented_food',
+    'is_tds',
+    'needs_manual_verification',
+    'notes',
+]
+
+# (column prefix, photo kinds)
+IMAGE_RELATIONS = [
+    ('barcode', ['barcode']),
+    ('nutrition', ['nutrition']),
+    ('ingredients', ['ingredients']),
+    ('product_image', PRODUCT_IMAGE_KINDS),
+]
+
+COLUMNS = PRODUCT_FIELDS + ['decoded_barcodes'] + [
+    column
+    for prefix, _ in IMAGE_RELATIONS
+    for column in (f'{prefix}_count', f'{prefix}_blobs')
+]
+
+
+def start_of_day(day):
+    """Midnight in the current time zone of a date or ``YYYY-MM-DD`` string"""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def export_queryset(source_batch=None, since=None, until=None, updated_after=None, fields=PRODUCT_FIELDS):
+    """
+    Products to export, oldest first; ``since``/``until`` are inclusive
+    creation dates, ``updated_after`` an exclusive modification time.
+    """
+    queryset = Product.objects.only(*fields).order_by('created_at', 'pk')
+    if updated_after:
+        queryset = queryset.filter(updated_at__gt=updated_after)
+    if source_batch:
+        queryset = queryset.filter(source_batch=source_batch)
+    # Half-open datetime ranges; a __date lookup casts the column and
+    # cannot use the created_at indexes
+    if since:
+        queryset = queryset.filter(created_at__gte=start_of_day(since))
+    if until:
+        queryset = queryset.filter(created_at__lt=start_of_day(until) + timedelta(days=1))
+
+    return queryset.prefetch_related(
+        Prefetch(
+            'photos',
+            queryset=Photo.objects.only('pk', 'product_id', 'kind', 'image', 'barcode_number').order_by('pk'),
+        )
+    )
+
+
+def export_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE, fields=PRODUCT_FIELDS):
+    """One dict per product; blob names and decoded numbers are lists"""
+    for product in queryset.iterator(chunk_size=chunk_size):
+        row = {field: getattr(product, field) for field in fields}
+        photos = product.photos.all()
+        row['decoded_barcodes'] = [
+            photo.barcode_number for photo in photos if photo.kind == 'barcode' and photo.barcode_number
+        ]
+        for prefix, kinds in IMAGE_RELATIONS:
+            images = [photo for photo in photos if photo.kind in kinds]
+            row[f'{prefix}_count'] = len(images)
+            row[f'{prefix}_blobs'] = [image.image.name for image in images if image.image]
+        yield row
+
+
+class Echo:
+    """File-like object whose write() hands back the line it was given"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow([
+            ';'.join(value) if isinstance(value, list) else value
+            for value in (row[column] for column in COLUMNS)
+        ])
+
+
+def jsonl_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def export_lines(queryset, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    rows = export_rows(queryset, chunk_size=chunk_size)
+    return csv_lines(rows) if export_format == 'csv' else jsonl_lines(rows)
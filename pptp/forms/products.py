@@ -1,6 +1,9 @@
 from django import forms
 from django.utils.translation import gettext_lazy as _
 from ..models import Product, Barcode, NutritionFacts, Ingredients, ProductImage
+from ..models.products import BATCH_CHOICES, CLAIM_CHOICES, FLAG_BITS, UNIT_CHOICES
+from ..units import UNIT_FACTORS
+from ..models.review import ReviewTask
 
 
 class BaseUploadForm(forms.ModelForm):
@@ -136,6 +139,25 @@ class ProductSetupForm(forms.ModelForm):
             raise forms.ValidationError(_("Please enter the full product name (at least two words)"))
         return name
 
+    def clean_partial(self, data):
+        """
+        Validate only the fields in ``data``, as sent by autosave. Each value
+        goes through its form field and any ``clean_<field>`` method; returns
+        ``(cleaned, errors)`` keyed by field name.
+        """
+        cleaned, errors = {}, {}
+        for name, value in data.items():
+            if name not in self.fields:
+                errors[name] = [_("Unknown field")]
+                continue
+            try:
+                self.cleaned_data = {name: self.fields[name].clean(value)}
+                custom = getattr(self, f'clean_{name}', None)
+                cleaned[name] = custom() if custom else self.cleaned_data[name]
+            except forms.ValidationError as e:
+                errors[name] = e.messages
+        return cleaned, errors
+
 
 class BarcodeUploadForm(BaseUploadForm):
     """Form for uploading barcode images"""
@@ -171,4 +193,153 @@ class ProductImageUploadForm(BaseUploadForm):
     
     class Meta:
         model = ProductImage
-        fields = ['image', 'notes']
\ No newline at end of file
+        fields = ['image', 'notes']
+
+
+class ProductFilterForm(forms.Form):
+    """Filters for the product listing; every field is optional"""
+
+    FLAG_CHOICES = [
+        ('is_variety_pack', _('Variety pack')),
+        ('is_supplemented_food', _('Supplemented food')),
+        ('is_tds', _('Total Diet Study')),
+        ('is_offline', _('Offline submission')),
+        ('needs_manual_verification', _('Needs manual verification')),
+        ('has_multiple_barcodes', _('Multiple barcodes')),
+        ('has_multiple_nutrition_facts', _('Multiple nutrition facts')),
+    ]
+
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control form-control-sm',
+            'placeholder': _('Search name, notes or barcode'),
+            'type': 'search',
+        })
+    )
+    batch = forms.ChoiceField(
+        choices=[('', _('All batches'))] + BATCH_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'})
+    )
+    status = forms.ChoiceField(
+        choices=[('', _('Any status')), ('complete', _('Complete')), ('incomplete', _('Incomplete'))],
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'})
+    )
+    flags = forms.MultipleChoiceField(
+        choices=FLAG_CHOICES,
+        required=False,
+        widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'})
+    )
+    any_claims = forms.MultipleChoiceField(
+        choices=CLAIM_CHOICES,
+        required=False,
+        label=_('Any of these claims'),
+        widget=forms.SelectMultiple(attrs={'class': 'form-select form-select-sm'})
+    )
+    no_claims = forms.MultipleChoiceField(
+        choices=CLAIM_CHOICES,
+        required=False,
+        label=_('None of these claims'),
+        widget=forms.SelectMultiple(attrs={'class': 'form-select form-select-sm'})
+    )
+    size_min = forms.DecimalField(
+        required=False,
+        min_value=0,
+        label=_('Package size from'),
+        widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'step': 'any'})
+    )
+    size_max = forms.DecimalField(
+        required=False,
+        min_value=0,
+        label=_('to'),
+        widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'step': 'any'})
+    )
+    size_unit = forms.ChoiceField(
+        choices=[(unit, label) for unit, label in UNIT_CHOICES if unit in UNIT_FACTORS],
+        required=False,
+        label=_('Unit'),
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm'})
+    )
+
+    def filter(self, queryset):
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        if data['batch']:
+            queryset = queryset.filter(source_batch=data['batch'])
+        if data['status']:
+            queryset = queryset.filter(submission_complete=data['status'] == 'complete')
+        # Label flags go through the claim_flags bitmask and its index
+        queryset = queryset.with_flags(
+            any_of=data['any_claims'],
+            all_of=[flag for flag in data['flags'] if flag in FLAG_BITS],
+            none_of=data['no_claims'],
+        )
+        for flag in data['flags']:
+            if flag not in FLAG_BITS:
+                queryset = queryset.filter(**{flag: True})
+        if data['size_min'] is not None or data['size_max'] is not None:
+            queryset = queryset.with_package_size(data['size_min'], data['size_max'], data['size_unit'] or 'G')
+        return queryset
+
+
+class ExportFilterForm(forms.Form):
+    """Query string options for the product export"""
+    format = forms.ChoiceField(choices=[('csv', 'CSV'), ('jsonl', 'JSON Lines')], required=False)
+    batch = forms.ChoiceField(choices=[('', _('All batches'))] + BATCH_CHOICES, required=False)
+    since = forms.DateField(required=False, help_text=_("First creation date to include"))
+    until = forms.DateField(required=False, help_text=_("Last creation date to include"))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        since, until = cleaned_data.get('since'), cleaned_data.get('until')
+        if since and until and since > until:
+            raise forms.ValidationError(_("The start date must be before the end date"))
+        cleaned_data['format'] = cleaned_data.get('format') or 'csv'
+        return cleaned_data
+
+
+class ImageBundleForm(forms.Form):
+    """Selects the products whose photos go into a ZIP bundle"""
+    batch = forms.ChoiceField(choices=[('', _('No batch'))] + BATCH_CHOICES, required=False)
+    products = forms.CharField(required=False, help_text=_("Comma-separated product IDs"))
+
+    def clean_products(self):
+        value = self.cleaned_data['products']
+        try:
+            return [int(pk) for pk in value.split(',') if pk.strip()]
+        except ValueError:
+            raise forms.ValidationError(_("Product IDs must be whole numbers"))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('batch') and not cleaned_data.get('products'):
+            raise forms.ValidationError(_("Choose a batch or a list of products"))
+        return cleaned_data
+
+    def get_products(self):
+        products = Product.objects.all()
+        if self.cleaned_data['batch']:
+            products = products.filter(source_batch=self.cleaned_data['batch'])
+        if self.cleaned_data['products']:
+            products = products.filter(pk__in=self.cleaned_data['products'])
+        return products
+
+
+class ReviewForm(forms.Form):
+    """A reviewer's decision on a claimed ReviewTask"""
+    outcome = forms.ChoiceField(choices=ReviewTask.OUTCOME_CHOICES, widget=forms.RadioSelect)
+    notes = forms.CharField(
+        widget=forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
+        required=False,
+        help_text=_("Required when returning a product to its collector"),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('outcome') == ReviewTask.RETURNED and not cleaned_data.get('notes'):
+            self.add_error('notes', _("Tell the collector what needs fixing"))
+        return cleaned_data
@@ -0,0 +1,226 @@
+"""
+Bulk import of historic collections from a CSV or JSONL manifest.
+
+Each manifest row describes one product using the ``ProductSetupForm``
+field names, plus optional ``import_id`` and image columns listing photo
+files relative to the images directory (``;``-separated in CSV, lists in
+JSONL)::
+
+    import_id,product_name,source_batch,manual_barcode,barcode_images,front_images
+    tds-0001,Whole Wheat Bread,tds,0036000291452,tds-0001/barcode.jpg,tds-0001/front.jpg
+
+Rows are handled in chunks: photos are uploaded through the image storage
+by a thread pool, then the chunk's products and image rows are inserted
+with ``bulk_create`` in one transaction. Every product records its
+``import_ref`` (source plus ``import_id`` or line number), so re-running an
+interrupted import skips the chunks that were already committed.
+"""
+import csv
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import models, transaction
+from django.db.models.functions import Lower
+
+from .barcode_index import invalidate_lookup
+from .forms.products import ProductSetupForm
+from .models import Photo, Product
+from .models.products import KIND_FOLDERS, get_image_storage
+from .progress import record_products
+from .review import enqueue
+from .storage.azure import AzureBlobStorageError
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_UPLOAD_THREADS = 16
+
+# Manifest column -> photo kind
+IMAGE_COLUMNS = {
+    'barcode_images': 'barcode',
+    'nutrition_images': 'nutrition',
+    'ingredients_images': 'ingredients',
+    'front_images': 'front',
+    'back_images': 'back',
+    'side_images': 'side',
+    'other_images': 'other',
+}
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'on'}
+
+# Product flags that are not on ProductSetupForm but may be in a manifest
+EXTRA_FLAGS = ['is_tds', 'is_supplemented_food']
+
+
+class ImportRowError(Exception):
+    pass
+
+
+def read_manifest(path):
+    """Yield (line number, row dict) from a .csv or .jsonl manifest"""
+    path = Path(path)
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        if path.suffix.lower() in ('.jsonl', '.ndjson'):
+            for number, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield number, json.loads(line)
+        else:
+            for number, row in enumerate(csv.DictReader(handle), start=2):
+                yield number, row
+
+
+def image_paths(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(';')
+    return [item.strip() for item in value if item and item.strip()]
+
+
+def parse_bool(value):
+    return value if isinstance(value, bool) else str(value or '').strip().lower() in TRUE_VALUES
+
+
+def form_data(row):
+    """Manifest row -> ProductSetupForm data, with model defaults for missing fields"""
+    data = {}
+    for name in ProductSetupForm._meta.fields:
+        field = Product._meta.get_field(name)
+        value = row.get(name)
+        if value in (None, ''):
+            value = field.get_default() if field.has_default() else ''
+        if isinstance(field, models.BooleanField):
+            value = parse_bool(value)
+            if not value:
+                continue
+        data[name] = value
+    return data
+
+
+class ProductImporter:
+    def __init__(self, source, images_dir, created_by=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 upload_threads=DEFAULT_UPLOAD_THREADS, storage=None):
+        self.source = source
+        self.images_dir = Path(images_dir)
+        self.created_by = created_by
+        self.chunk_size = chunk_size
+        self.upload_threads = upload_threads
+        self.storage = storage or get_image_storage()
+        # Collector email (lower-cased) -> user id, or None for unknown emails
+        self.users = {}
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def import_ref(self, number, row):
+        return f"{self.source}:{row.get('import_id') or number}"
+
+    def run(self, rows, progress=None):
+        rows = iter(rows)
+        with ThreadPoolExecutor(max_workers=self.upload_threads, thread_name_prefix='pptp-import') as uploads:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, uploads)
+                if progress:
+                    progress(self)
+        return self
+
+    def prepare(self, number, row):
+        """Validate one row; returns (unsaved product, [(kind, path), ...])"""
+        form = ProductSetupForm(form_data(row))
+        if not form.is_valid():
+            raise ImportRowError('; '.join(
+                f"{field}: {' '.join(messages)}" for field, messages in form.errors.items()
+            ))
+
+        images = []
+        for column, kind in IMAGE_COLUMNS.items():
+            for relative in image_paths(row.get(column)):
+                path = self.images_dir / relative
+                if not path.is_file():
+                    raise ImportRowError(f"{column}: file not found: {relative}")
+                images.append((kind, path))
+
+        product = form.save(commit=False)
+        for flag in EXTRA_FLAGS:
+            setattr(product, flag, parse_bool(row.get(flag)))
+        product.created_by = row.get('created_by') or self.created_by
+        product.submission_complete = True
+        product.import_ref = self.import_ref(number, row)
+        # bulk_create skips save(), so fill in derived columns here
+        product.populate_derived_fields()
+        return product, images
+
+    def link_users(self, products):
+        """Set created_by_user from each product's created_by email, one query per chunk"""
+        emails = {product.created_by.lower() for product in products if product.created_by}
+        missing = emails - self.users.keys()
+        if missing:
+            self.users.update(dict.fromkeys(missing))
+            users = User.objects.alias(lower_email=Lower('email')).filter(lower_email__in=missing)
+            for pk, email in users.values_list('pk', 'email'):
+                self.users[email.lower()] = pk
+        for product in products:
+            if product.created_by:
+                product.created_by_user_id = self.users[product.created_by.lower()]
+
+    def upload(self, kind, path):
+        # Every row has its own front.jpg and the uploads run in parallel, so
+        # give each blob a name no other upload can take.
+        name = f'{KIND_FOLDERS[kind]}/{uuid.uuid4().hex}/{path.name}'
+        with open(path, 'rb') as handle:
+            return self.storage.save(name, File(handle, name=path.name))
+
+    def import_chunk(self, chunk, uploads):
+        refs = [self.import_ref(number, row) for number, row in chunk]
+        done = set(Product.objects.filter(import_ref__in=refs).values_list('import_ref', flat=True))
+        self.skipped += len(done)
+
+        prepared = []
+        for (number, row), ref in zip(chunk, refs):
+            if ref in done:
+                continue
+            # Later duplicates of a row are reported rather than imported twice
+            done.add(ref)
+            try:
+                product, images = self.prepare(number, row)
+            except ImportRowError as e:
+                self.errors.append((number, str(e)))
+                continue
+            # Start uploading straight away; the pool works through the chunk
+            pending = [(kind, uploads.submit(self.upload, kind, path)) for kind, path in images]
+            prepared.append((number, product, pending))
+
+        ready = []
+        for number, product, pending in prepared:
+            try:
+                images = [(kind, future.result()) for kind, future in pending]
+            except (AzureBlobStorageError, OSError) as e:
+                self.errors.append((number, f"upload failed: {e}"))
+                continue
+            ready.append((product, images))
+        if not ready:
+            return
+        self.link_users([product for product, _ in ready])
+
+        with transaction.atomic():
+            products = Product.objects.bulk_create([product for product, _ in ready])
+            record_products(products)
+            enqueue(*[product.pk for product in products if product.needs_manual_verification])
+            Photo.objects.bulk_create([
+                Photo(product=product, kind=kind, image=name, is_uploaded=True)
+                for product, (_, images) in zip(products, ready)
+                for kind, name in images
+            ], batch_size=self.chunk_size)
+            # bulk_create sends no post_save, so set the image counters in one pass
+            Product.objects.filter(pk__in=[product.pk for product in products]).refresh_image_counters()
+
+        invalidate_lookup(*{product.normalized_barcode for product in products})
+        self.created += len(products)
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from pptp.duplicates import compute_image_hash
+from pptp.models import Photo
+
+
+def _hash_one(pk):
+    close_old_connections()
+    try:
+        return compute_image_hash(Photo, pk)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = "Compute perceptual hashes for uploaded images that do not have one yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help="Concurrent downloads")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        pending = (
+            Photo.objects.filter(phash__isnull=True, is_uploaded=True, image__isnull=False)
+            .exclude(image='')
+            .values_list('pk', flat=True)
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        # executor.map would queue a task for every pending image up front;
+        # hand it a few batches per worker at a time instead
+        window = options['workers'] * 4
+        total = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while batch := list(islice(pending, window)):
+                total += sum(1 for value in executor.map(_hash_one, batch) if value is not None)
+        self.stdout.write(self.style.SUCCESS(f"Hashed {total} images."))
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from pptp.barcodes import decode_image_bytes, save_decode_result
+from pptp.models import Barcode
+from pptp.storage.utils import read_blob
+
+
+class Command(BaseCommand):
+    help = "Decode uploaded barcode photos and fill in Barcode.barcode_number"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Decoder processes (default: one per core)")
+        parser.add_argument('--download-threads', type=int, default=8,
+                            help="Threads fetching images from storage")
+        parser.add_argument('--all', action='store_true',
+                            help="Re-decode barcodes that were already attempted")
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        barcodes = Barcode.objects.filter(is_uploaded=True, image__isnull=False).exclude(image='')
+        if not options['all']:
+            barcodes = barcodes.filter(decoded_at__isnull=True)
+        rows = barcodes.order_by('pk').values_list('pk', 'image').iterator(chunk_size=options['chunk_size'])
+
+        storage = Barcode._meta.get_field('image').storage
+        workers = max(1, options['workers'])
+        # Keep every core busy without queueing the whole backlog in memory.
+        window = workers * 4
+        decoded = attempted = 0
+
+        with ThreadPoolExecutor(max_workers=options['download_threads']) as downloads, \
+                ProcessPoolExecutor(
+                    # Spawn, as in pptp.tasks.get_process_pool: forking now would copy
+                    # the download threads and the open DB connection into the children.
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                ) as decoders:
+            pending = deque()
+
+            def drain(limit):
+                nonlocal decoded, attempted
+                while len(pending) > limit:
+                    pk, future = pending.popleft()
+                    result, elapsed_ms = future.result()
+                    attempted += 1
+                    if save_decode_result(pk, result, elapsed_ms):
+                        decoded += 1
+                    if attempted % 1000 == 0:
+                        self.stdout.write(f"{attempted} processed, {decoded} decoded")
+
+            fetches = deque()
+            for pk, name in rows:
+                fetches.append((pk, downloads.submit(read_blob, storage, name)))
+                while len(fetches) > window:
+                    self._dispatch(fetches.popleft(), decoders, pending)
+                    drain(window)
+            while fetches:
+                self._dispatch(fetches.popleft(), decoders, pending)
+            drain(0)
+
+        self.stdout.write(self.style.SUCCESS(f"Decoded {decoded} of {attempted} barcode images."))
+
+    def _dispatch(self, fetch, decoders, pending):
+        pk, future = fetch
+        data = future.result()
+        if data:
+            pending.append((pk, decoders.submit(decode_image_bytes, data)))
+        else:
+            # Blob is gone; record the attempt so later runs skip it
+            save_decode_result(pk, None, 0)
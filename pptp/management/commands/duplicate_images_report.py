@@ -0,0 +1,55 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pptp.duplicates import HashIndex, get_max_distance
+from pptp.models import Photo
+from pptp.models.products import BATCH_CHOICES
+
+
+class Command(BaseCommand):
+    help = "Report photos in a collection batch that are near-duplicates of photos of other products"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', help="Only report images of products in this source_batch")
+        parser.add_argument('--max-distance', type=int, default=None,
+                            help="Maximum Hamming distance between hashes (default: PPTP_DUPLICATE_MAX_DISTANCE)")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch = options['batch']
+        if batch and batch not in dict(BATCH_CHOICES):
+            raise CommandError(f"Unknown batch '{batch}'")
+        max_distance = get_max_distance() if options['max_distance'] is None else options['max_distance']
+
+        # One pass over the corpus to build the index, keyed by (kind, pk).
+        index = HashIndex()
+        owners = {}
+        targets = []
+        rows = (
+            Photo.objects.filter(phash__isnull=False)
+            .values_list('kind', 'pk', 'phash', 'product_id', 'product__source_batch')
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        for kind, pk, phash, product_id, source_batch in rows:
+            key = (kind, pk)
+            index.add(key, phash)
+            owners[key] = product_id
+            if batch is None or source_batch == batch:
+                targets.append(key)
+
+        writer = csv.writer(self.stdout)
+        writer.writerow(['product_id', 'image_kind', 'image_id', 'duplicate_product_id',
+                         'duplicate_image_kind', 'duplicate_image_id', 'distance'])
+        reported = set()
+        for key in targets:
+            for distance, match in index.query(index.hashes[key], max_distance):
+                if owners[match] == owners[key]:
+                    continue
+                pair = tuple(sorted([key, match]))
+                if pair in reported:
+                    continue
+                reported.add(pair)
+                writer.writerow([owners[key], key[0], key[1], owners[match], match[0], match[1], distance])
+
+        self.stderr.write(f"Indexed {len(index)} images, found {len(reported)} near-duplicate pairs.")
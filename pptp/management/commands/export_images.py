@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pptp.bundles import bundle_entries, get_prefetch, stream_zip
+from pptp.forms.products import ImageBundleForm
+from pptp.models.products import get_image_storage
+
+
+class Command(BaseCommand):
+    help = "Write a ZIP bundle of the photos of a collection batch or a list of products"
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Path of the ZIP file to write")
+        parser.add_argument('--batch', help="Include every product in this source_batch")
+        parser.add_argument('--products', help="Comma-separated product IDs")
+        parser.add_argument('--prefetch', type=int, default=None,
+                            help="Blob downloads in flight (default: PPTP_ZIP_PREFETCH)")
+
+    def handle(self, *args, **options):
+        form = ImageBundleForm({'batch': options['batch'] or '', 'products': options['products'] or ''})
+        if not form.is_valid():
+            raise CommandError('; '.join(' '.join(errors) for errors in form.errors.values()))
+
+        entries = bundle_entries(form.get_products())
+        written = 0
+        with open(options['output'], 'wb') as output:
+            for chunk in stream_zip(entries, get_image_storage(), options['prefetch'] or get_prefetch()):
+                output.write(chunk)
+                written += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}"))
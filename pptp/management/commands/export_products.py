@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from pptp.exports import DEFAULT_CHUNK_SIZE, FORMATS, export_lines, export_queryset
+from pptp.forms.products import ExportFilterForm
+
+
+class Command(BaseCommand):
+    help = "Stream products with image counts and blob names as CSV or JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+        parser.add_argument('--batch', help="Only export products in this source_batch")
+        parser.add_argument('--since', help="First creation date to include (YYYY-MM-DD)")
+        parser.add_argument('--until', help="Last creation date to include (YYYY-MM-DD)")
+        parser.add_argument('--output', '-o', help="Write to this file instead of stdout")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        form = ExportFilterForm({
+            key: options[key] or '' for key in ('format', 'batch', 'since', 'until')
+        })
+        if not form.is_valid():
+            raise CommandError('; '.join(
+                f"{field}: {' '.join(errors)}" for field, errors in form.errors.items()
+            ))
+        filters = form.cleaned_data
+        queryset = export_queryset(filters['batch'], filters['since'], filters['until'])
+        lines = export_lines(queryset, filters['format'], chunk_size=options['chunk_size'])
+
+        count = -1 if filters['format'] == 'csv' else 0
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                for line in lines:
+                    output.write(line)
+                    count += 1
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+                count += 1
+
+        self.stderr.write(f"Exported {count} products.")
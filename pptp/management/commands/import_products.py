@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from pptp.imports import DEFAULT_CHUNK_SIZE, DEFAULT_UPLOAD_THREADS, ProductImporter, read_manifest
+
+
+class Command(BaseCommand):
+    help = "Import products and their photos from a CSV or JSONL manifest; safe to re-run after an interruption"
+
+    def add_arguments(self, parser):
+        parser.add_argument('manifest', help="Path to a .csv or .jsonl manifest")
+        parser.add_argument('--images-dir', help="Directory the image paths are relative to (default: the manifest's)")
+        parser.add_argument('--source', help="Name identifying this import when resuming (default: manifest file name)")
+        parser.add_argument('--created-by', help="Collector email for rows without a created_by column")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--upload-threads', type=int, default=DEFAULT_UPLOAD_THREADS)
+
+    def handle(self, *args, **options):
+        manifest = Path(options['manifest'])
+        importer = ProductImporter(
+            source=options['source'] or manifest.stem,
+            images_dir=options['images_dir'] or manifest.parent,
+            created_by=options['created_by'],
+            chunk_size=options['chunk_size'],
+            upload_threads=options['upload_threads'],
+        )
+
+        def progress(importer):
+            self.stdout.write(
+                f"{importer.created} created, {importer.skipped} already imported, {len(importer.errors)} errors"
+            )
+
+        importer.run(read_manifest(manifest), progress=progress)
+
+        for number, error in importer.errors:
+            self.stderr.write(f"line {number}: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {importer.created} products ({importer.skipped} skipped, {len(importer.errors)} errors). "
+            "Run compute_image_hashes and decode_barcodes to process the new photos."
+        ))
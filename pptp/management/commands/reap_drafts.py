@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from pptp.drafts import DEFAULT_CHUNK_SIZE, reap_drafts
+
+
+class Command(BaseCommand):
+    help = "Delete abandoned submission drafts and their photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            help="Only drafts untouched for this many days (default: PPTP_DRAFT_MAX_AGE_DAYS)")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--with-photos', action='store_true',
+                            help="Also delete unnamed drafts that have photos (they are kept by default)")
+        parser.add_argument('--dry-run', action='store_true', help="Count abandoned drafts without deleting them")
+
+    def handle(self, *args, **options):
+        products, blobs, failed = reap_drafts(
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            max_age=timedelta(days=options['older_than_days']) if options['older_than_days'] is not None else None,
+            with_photos=options['with_photos'],
+        )
+        for name in failed:
+            self.stderr.write(f"Could not delete blob {name}")
+        action = "Found" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{action} {products} abandoned drafts with {blobs} photos."))
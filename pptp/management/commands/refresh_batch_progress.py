@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from pptp.progress import refresh_progress
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-batch progress summary from the Product table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', help="Only rebuild this source batch ('' for products without one)")
+
+    def handle(self, *args, **options):
+        cells = refresh_progress(options['batch'])
+        total = sum(cell.product_count for cell in cells)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(cells)} progress rows covering {total} products."))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from pptp.models import Product
+from pptp.models.products import count_images, image_counter_sources
+
+
+class Command(BaseCommand):
+    help = "Recount the per-product image counters and fix any that have drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', help="Only check products in this source batch")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Report drifted products without fixing them")
+
+    def handle(self, *args, **options):
+        products = Product.objects.all()
+        if options['batch']:
+            products = products.filter(source_batch=options['batch'])
+
+        sources = image_counter_sources()
+        expected = {f'expected_{field}': count_images(model, **filters) for field, (model, filters) in sources.items()}
+        drift = Q()
+        for field in sources:
+            drift |= ~Q(**{field: F(f'expected_{field}')})
+
+        checked = drifted = 0
+        last_pk = 0
+        chunk_size = options['chunk_size']
+        while True:
+            # Walk the table by primary key so each query only touches one chunk
+            pks = list(products.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            checked += len(pks)
+
+            bad = list(
+                Product.objects.filter(pk__in=pks).annotate(**expected).filter(drift)
+                .values('pk', *sources, *expected)
+            )
+            drifted += len(bad)
+            for row in bad:
+                changes = ', '.join(
+                    f"{field} {row[field]} -> {row[f'expected_{field}']}"
+                    for field in sources if row[field] != row[f'expected_{field}']
+                )
+                self.stdout.write(f"Product {row['pk']}: {changes}")
+            if bad and not options['dry_run']:
+                Product.objects.filter(pk__in=[row['pk'] for row in bad]).refresh_image_counters()
+
+        action = "found" if options['dry_run'] else "repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} products, {action} {drifted} with drifted counters."))
@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from pptp.storage.instrumentation import profiler
+
+
+class Command(BaseCommand):
+    help = "Show image storage call counts, bytes transferred and latency histograms"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help="Print the raw snapshot as JSON")
+        parser.add_argument('--histogram', action='store_true', help="Include per-bucket latency counts")
+        parser.add_argument('--reset', action='store_true', help="Clear the collected statistics afterwards")
+
+    def handle(self, *args, **options):
+        snapshot = profiler.snapshot()
+
+        if options['json']:
+            self.stdout.write(json.dumps(snapshot, indent=2))
+        elif not snapshot:
+            self.stdout.write("No storage calls recorded yet.")
+        else:
+            self.stdout.write(
+                f"{'operation':<10} {'calls':>10} {'errors':>8} {'bytes':>14} {'total ms':>12} {'mean ms':>10}"
+            )
+            for operation, stats in snapshot.items():
+                self.stdout.write(
+                    f"{operation:<10} {stats['count']:>10} {stats['errors']:>8} {stats['bytes']:>14} "
+                    f"{stats['total_ms']:>12.1f} {stats['mean_ms']:>10.2f}"
+                )
+                if options['histogram']:
+                    buckets = ', '.join(
+                        f"<={label}ms: {count}" for label, count in stats['histogram'].items() if count
+                    )
+                    self.stdout.write(f"{'':<10} {buckets}")
+
+        if options['reset']:
+            profiler.reset()
+            self.stdout.write(self.style.SUCCESS("Storage statistics reset."))
@@ -1,3 +1,6 @@
+from .storage.instrumentation import collect_request_stats
+
+
 class CSRFDebugMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -5,3 +8,21 @@ class CSRFDebugMiddleware:
     def __call__(self, request):
         response = self.get_response(request)
         return response
+
+
+class StorageProfilingMiddleware:
+    """
+    Attach a per-request breakdown of image storage calls to
+    ``request.storage_stats`` and report it in a Server-Timing header.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_request_stats() as stats:
+            request.storage_stats = stats
+            response = self.get_response(request)
+
+        if stats.operations:
+            response['Server-Timing'] = stats.server_timing()
+        return response
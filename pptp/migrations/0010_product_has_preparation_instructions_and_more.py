@@ -2,7 +2,6 @@
 
 from django.db import migrations, models
 import pptp.models.products
-import pptp.storage.azure
 
 
 class Migration(migrations.Migration):
@@ -34,7 +33,7 @@ class Migration(migrations.Migration):
                 blank=True,
                 help_text="Image file",
                 null=True,
-                storage=pptp.storage.azure.AzureBlobStorage(),
+                storage=pptp.models.products.get_image_storage,
                 upload_to=pptp.models.products.get_upload_path,
             ),
         ),
@@ -45,7 +44,7 @@ class Migration(migrations.Migration):
                 blank=True,
                 help_text="Image file",
                 null=True,
-                storage=pptp.storage.azure.AzureBlobStorage(),
+                storage=pptp.models.products.get_image_storage,
                 upload_to=pptp.models.products.get_upload_path,
             ),
         ),
@@ -56,7 +55,7 @@ class Migration(migrations.Migration):
                 blank=True,
                 help_text="Image file",
                 null=True,
-                storage=pptp.storage.azure.AzureBlobStorage(),
+                storage=pptp.models.products.get_image_storage,
                 upload_to=pptp.models.products.get_upload_path,
             ),
         ),
@@ -67,7 +66,7 @@ class Migration(migrations.Migration):
                 blank=True,
                 help_text="Image file",
                 null=True,
-                storage=pptp.storage.azure.AzureBlobStorage(),
+                storage=pptp.models.products.get_image_storage,
                 upload_to=pptp.models.products.get_upload_path,
             ),
         ),
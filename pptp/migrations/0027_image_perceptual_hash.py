@@ -0,0 +1,113 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0026_alter_product_source_batch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='barcode',
+            name='phash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, help_text='64-bit difference hash of the image', null=True),
+        ),
+        migrations.AddField(
+            model_name='barcode',
+            name='phash_0',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='barcode',
+            name='phash_1',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='barcode',
+            name='phash_2',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='barcode',
+            name='phash_3',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='phash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, help_text='64-bit difference hash of the image', null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='phash_0',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='phash_1',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='phash_2',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='phash_3',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='nutritionfacts',
+            name='phash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, help_text='64-bit difference hash of the image', null=True),
+        ),
+        migrations.AddField(
+            model_name='nutritionfacts',
+            name='phash_0',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='nutritionfacts',
+            name='phash_1',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='nutritionfacts',
+            name='phash_2',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='nutritionfacts',
+            name='phash_3',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='phash',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, help_text='64-bit difference hash of the image', null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='phash_0',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='phash_1',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='phash_2',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='phash_3',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
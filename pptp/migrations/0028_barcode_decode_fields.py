@@ -0,0 +1,28 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0027_image_perceptual_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='barcode',
+            name='decode_confidence',
+            field=models.FloatField(blank=True, editable=False, help_text='Confidence of the automatic barcode decode (0-1)', null=True),
+        ),
+        migrations.AddField(
+            model_name='barcode',
+            name='decode_ms',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Time spent decoding the barcode image, in milliseconds', null=True),
+        ),
+        migrations.AddField(
+            model_name='barcode',
+            name='decoded_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When automatic decoding was last attempted', null=True),
+        ),
+    ]
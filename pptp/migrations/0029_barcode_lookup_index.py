@@ -0,0 +1,40 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+from pptp.barcodes import normalize_gtin
+
+
+def backfill_normalized_barcodes(apps, schema_editor):
+    for model_name, source in (('Product', 'manual_barcode'), ('Barcode', 'barcode_number')):
+        model = apps.get_model('pptp', model_name)
+        batch = []
+        for obj in model.objects.exclude(**{source: ''}).only('pk', source).iterator(chunk_size=2000):
+            obj.normalized_barcode = normalize_gtin(getattr(obj, source))
+            if obj.normalized_barcode:
+                batch.append(obj)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ['normalized_barcode'])
+                batch = []
+        model.objects.bulk_update(batch, ['normalized_barcode'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0028_barcode_decode_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='barcode',
+            name='normalized_barcode',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='barcode_number as a GTIN-14, blank if it is not a valid GTIN', max_length=14),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='normalized_barcode',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='manual_barcode as a GTIN-14, blank if it is not a valid GTIN', max_length=14),
+        ),
+        migrations.RunPython(backfill_normalized_barcodes, migrations.RunPython.noop),
+    ]
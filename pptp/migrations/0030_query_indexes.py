@@ -0,0 +1,44 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:41
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the tables against writes
+    atomic = False
+
+    dependencies = [
+        ('pptp', '0029_barcode_lookup_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='barcode',
+            index=models.Index(condition=models.Q(('is_uploaded', False)), fields=['product'], name='barcode_pending_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='ingredients',
+            index=models.Index(condition=models.Q(('is_uploaded', False)), fields=['product'], name='ingredients_pending_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='nutritionfacts',
+            index=models.Index(condition=models.Q(('is_uploaded', False)), fields=['product'], name='nutrition_pending_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['created_by', '-created_at'], name='product_created_by_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('submission_complete', False)), fields=['created_by', '-created_at'], name='product_incomplete_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='productimage',
+            index=models.Index(fields=['product', 'image_type'], name='productimage_type_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='productimage',
+            index=models.Index(condition=models.Q(('is_uploaded', False)), fields=['product'], name='productimage_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0031_product_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='import_ref',
+            field=models.CharField(blank=True, editable=False, help_text='Source and row of a bulk import, used to resume interrupted imports', max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:52
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_image_counters(apps, schema_editor):
+    Product = apps.get_model('pptp', 'Product')
+    sources = {
+        'barcode_count': ('Barcode', {}),
+        'nutrition_count': ('NutritionFacts', {}),
+        'ingredients_count': ('Ingredients', {}),
+    }
+    for image_type in ('front', 'back', 'side', 'other'):
+        sources[f'{image_type}_image_count'] = ('ProductImage', {'image_type': image_type})
+
+    updates = {}
+    for field, (model_name, filters) in sources.items():
+        counts = (
+            apps.get_model('pptp', model_name).objects.filter(product=OuterRef('pk'), **filters)
+            .order_by().values('product').annotate(count=Count('pk')).values('count')
+        )
+        updates[field] = Coalesce(Subquery(counts), 0)
+    Product.objects.update(**updates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0032_product_import_ref'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='back_image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='barcode_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='front_image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='ingredients_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='nutrition_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='other_image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='side_image_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_image_counters, migrations.RunPython.noop),
+    ]
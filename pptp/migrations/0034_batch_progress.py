@@ -0,0 +1,56 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:55
+
+from django.db import migrations, models
+from django.db.models import Count
+
+PROGRESS_FIELDS = [
+    'source_batch', 'storage_condition', 'primary_package_material',
+    'submission_complete', 'needs_manual_verification',
+]
+
+
+def build_progress(apps, schema_editor):
+    Product = apps.get_model('pptp', 'Product')
+    BatchProgress = apps.get_model('pptp', 'BatchProgress')
+    rows = Product.objects.order_by().values(*PROGRESS_FIELDS).annotate(product_count=Count('pk'))
+    cells = {}
+    for row in rows:
+        # NULL and '' batches share one cell
+        key = tuple(row[field] or '' if field == 'source_batch' else row[field] for field in PROGRESS_FIELDS)
+        cells[key] = cells.get(key, 0) + row['product_count']
+    BatchProgress.objects.bulk_create([
+        BatchProgress(**dict(zip(PROGRESS_FIELDS, key)), product_count=count)
+        for key, count in cells.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0033_product_image_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_batch', models.CharField(blank=True, choices=[('2025_snapcan', 'SNAP-CAN 2025'), ('2026_baked_goods', '2026 Baked Goods Collection'), ('2026_snack_foods', '2026 Snack Foods Collection'), ('tds', 'Total Diet Study'), ('2025_supp_food', '2025 Supplemented Food Collection'), ('2025_frozen_entrees', '2025 Frozen Entrees Collection')], max_length=50)),
+                ('storage_condition', models.CharField(choices=[('shelf_stable', 'Shelf Stable'), ('fridge', 'Fridge'), ('freezer', 'Freezer')], max_length=12)),
+                ('primary_package_material', models.CharField(choices=[('glass', 'Glass'), ('metal', 'Metal'), ('paper', 'Paper/paperboard'), ('plastic_pet', 'Plastic - PET - 1'), ('plastic_hdpe', 'Plastic - HDPE - 2'), ('plastic_pvc', 'Plastic - PVC - 3'), ('plastic_ldpe', 'Plastic - LDPE - 4'), ('plastic_pp', 'Plastic - PP - 5'), ('plastic_ps', 'Plastic - PS - 6'), ('plastic_other', 'Plastic - OTHER - 7'), ('plastic_unknown', 'Plastic - Unknown'), ('other', 'Other')], max_length=15)),
+                ('submission_complete', models.BooleanField()),
+                ('needs_manual_verification', models.BooleanField()),
+                ('product_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'batch progress',
+                'verbose_name_plural': 'batch progress',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='batchprogress',
+            constraint=models.UniqueConstraint(fields=('source_batch', 'storage_condition', 'primary_package_material', 'submission_complete', 'needs_manual_verification'), name='unique_batch_progress_cell'),
+        ),
+        migrations.RunPython(build_progress, migrations.RunPython.noop),
+    ]
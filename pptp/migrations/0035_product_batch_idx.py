@@ -0,0 +1,20 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('pptp', '0034_batch_progress'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['source_batch', 'submission_complete', '-created_at'], name='product_batch_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.9 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_flagged_products(apps, schema_editor):
+    Product = apps.get_model('pptp', 'Product')
+    ReviewTask = apps.get_model('pptp', 'ReviewTask')
+    flagged = Product.objects.filter(needs_manual_verification=True, submission_complete=True).order_by('pk')
+    ReviewTask.objects.bulk_create(
+        (ReviewTask(product_id=pk) for pk in flagged.values_list('pk', flat=True).iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0035_product_batch_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('outcome', models.CharField(blank=True, choices=[('verified', 'Verified'), ('returned', 'Returned to collector')], max_length=10)),
+                ('notes', models.TextField(blank=True)),
+                ('claimed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_tasks', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_tasks', to='pptp.product')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('completed_at__isnull', True)), fields=['id'], name='review_open_idx'), models.Index(fields=['claimed_by', 'lease_expires_at'], name='review_claimed_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reviewtask',
+            constraint=models.UniqueConstraint(condition=models.Q(('completed_at__isnull', True)), fields=('product',), name='one_open_review_per_product'),
+        ),
+        migrations.RunPython(queue_flagged_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,162 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:02
+
+import django.db.models.deletion
+import pptp.models.products
+from django.db import migrations, models
+
+# Old table -> (kind, or the column holding it; barcode columns or blanks)
+SOURCES = [
+    ('pptp_barcode', "'barcode'", "barcode_number, normalized_barcode, decode_confidence, decode_ms, decoded_at"),
+    ('pptp_nutritionfacts', "'nutrition'", "'', '', NULL, NULL, NULL"),
+    ('pptp_ingredients', "'ingredients'", "'', '', NULL, NULL, NULL"),
+    ('pptp_productimage', "image_type", "'', '', NULL, NULL, NULL"),
+]
+
+COMMON = "product_id, created_at, notes, image, device_filename, is_uploaded, phash, phash_0, phash_1, phash_2, phash_3"
+
+BARCODE_COLUMNS = "barcode_number, normalized_barcode, decode_confidence, decode_ms, decoded_at"
+
+# Old table -> (its own columns, the pptp_photo columns they come from, kinds)
+TARGETS = [
+    ('pptp_barcode', BARCODE_COLUMNS, BARCODE_COLUMNS, ['barcode']),
+    ('pptp_nutritionfacts', '', '', ['nutrition']),
+    ('pptp_ingredients', '', '', ['ingredients']),
+    ('pptp_productimage', 'image_type', 'kind', ['front', 'back', 'side', 'other']),
+]
+
+
+def copy_photos(apps, schema_editor):
+    """Move every photo into pptp_photo in one INSERT ... SELECT, oldest first"""
+    selects = ' UNION ALL '.join(
+        f"SELECT {COMMON}, {kind} AS kind, {barcode_columns} FROM {table}"
+        for table, kind, barcode_columns in SOURCES
+    )
+    schema_editor.execute(
+        f"INSERT INTO pptp_photo ({COMMON}, kind, barcode_number, normalized_barcode, "
+        f"decode_confidence, decode_ms, decoded_at) "
+        f"SELECT * FROM ({selects}) AS photos ORDER BY created_at"
+    )
+
+
+def copy_photos_back(apps, schema_editor):
+    """Reverse of copy_photos; the old tables get fresh ids as well"""
+    for table, columns, sources, kinds in TARGETS:
+        columns = ', '.join(filter(None, [COMMON, columns]))
+        sources = ', '.join(filter(None, [COMMON, sources]))
+        schema_editor.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {sources} FROM pptp_photo "
+            f"WHERE kind = ANY(%s) ORDER BY id",
+            [kinds],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0036_review_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Photo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('notes', models.TextField(blank=True, help_text='Any additional notes')),
+                ('image', pptp.models.products.AzureImageField(blank=True, help_text='Image file', null=True, storage=pptp.models.products.get_image_storage, upload_to=pptp.models.products.get_upload_path)),
+                ('device_filename', models.CharField(blank=True, help_text='Original filename from device camera', max_length=255, null=True)),
+                ('is_uploaded', models.BooleanField(default=True, help_text='Whether the image has been uploaded to the server')),
+                ('phash', models.BigIntegerField(blank=True, db_index=True, editable=False, help_text='64-bit difference hash of the image', null=True)),
+                ('phash_0', models.IntegerField(blank=True, db_index=True, editable=False, null=True)),
+                ('phash_1', models.IntegerField(blank=True, db_index=True, editable=False, null=True)),
+                ('phash_2', models.IntegerField(blank=True, db_index=True, editable=False, null=True)),
+                ('phash_3', models.IntegerField(blank=True, db_index=True, editable=False, null=True)),
+                ('kind', models.CharField(choices=[('barcode', 'Barcode'), ('nutrition', 'Nutrition Facts'), ('ingredients', 'Ingredients'), ('front', 'Front'), ('back', 'Back'), ('side', 'Side'), ('other', 'Other')], help_text='What the photo shows', max_length=12)),
+                ('barcode_number', models.CharField(blank=True, help_text='Barcode number if automatically detected', max_length=50)),
+                ('normalized_barcode', models.CharField(blank=True, db_index=True, default='', editable=False, help_text='barcode_number as a GTIN-14, blank if it is not a valid GTIN', max_length=14)),
+                ('decode_confidence', models.FloatField(blank=True, editable=False, help_text='Confidence of the automatic barcode decode (0-1)', null=True)),
+                ('decode_ms', models.PositiveIntegerField(blank=True, editable=False, help_text='Time spent decoding the barcode image, in milliseconds', null=True)),
+                ('decoded_at', models.DateTimeField(blank=True, editable=False, help_text='When automatic decoding was last attempted', null=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='photos', to='pptp.product')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(fields=['product', 'kind'], name='photo_product_kind_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(condition=models.Q(('is_uploaded', False)), fields=['product'], name='photo_pending_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='photo',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('image__isnull', False), ('is_uploaded', True)), models.Q(('device_filename__isnull', False), ('is_uploaded', False)), _connector='OR'), name='photo_image_or_device_filename_required'),
+        ),
+        migrations.AddConstraint(
+            model_name='photo',
+            constraint=models.CheckConstraint(check=models.Q(('kind__in', ['barcode', 'nutrition', 'ingredients', 'front', 'back', 'side', 'other'])), name='photo_kind_valid'),
+        ),
+        # Photos get new ids in pptp_photo (numbered oldest first across the
+        # four old tables), so ids cached by clients before this migration no
+        # longer point at the same photo. See "Migrations that renumber
+        # photos" in the README.
+        migrations.RunPython(copy_photos, copy_photos_back),
+        migrations.DeleteModel(
+            name='Barcode',
+        ),
+        migrations.DeleteModel(
+            name='Ingredients',
+        ),
+        migrations.DeleteModel(
+            name='NutritionFacts',
+        ),
+        migrations.DeleteModel(
+            name='ProductImage',
+        ),
+        migrations.CreateModel(
+            name='Barcode',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('pptp.photo',),
+        ),
+        migrations.CreateModel(
+            name='Ingredients',
+            fields=[
+            ],
+            options={
+                'verbose_name_plural': 'Ingredients',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('pptp.photo',),
+        ),
+        migrations.CreateModel(
+            name='NutritionFacts',
+            fields=[
+            ],
+            options={
+                'verbose_name_plural': 'Nutrition Facts',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('pptp.photo',),
+        ),
+        migrations.CreateModel(
+            name='ProductImage',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('pptp.photo',),
+        ),
+    ]
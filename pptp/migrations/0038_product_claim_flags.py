@@ -0,0 +1,29 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:07
+
+import django.db.models.expressions
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Adding a stored generated column rewrites the whole product table
+    # under an ACCESS EXCLUSIVE lock: reads and writes wait until every row
+    # is filled in. Run it in a maintenance window (see README, Deployment).
+    # Only the index build afterwards is concurrent.
+    atomic = False
+
+    dependencies = [
+        ('pptp', '0037_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='claim_flags',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Case(models.When(has_supplemental_caution_id=True, then=models.Value(1)), default=models.Value(0)), '+', models.Case(models.When(has_nutrient_content_claim=True, then=models.Value(2)), default=models.Value(0))), '+', models.Case(models.When(has_nutrient_function_claim=True, then=models.Value(4)), default=models.Value(0))), '+', models.Case(models.When(has_disease_risk_reduction_claim=True, then=models.Value(8)), default=models.Value(0))), '+', models.Case(models.When(has_probiotic_claim=True, then=models.Value(16)), default=models.Value(0))), '+', models.Case(models.When(has_therapeutic_claim=True, then=models.Value(32)), default=models.Value(0))), '+', models.Case(models.When(has_function_claim=True, then=models.Value(64)), default=models.Value(0))), '+', models.Case(models.When(has_general_health_claim=True, then=models.Value(128)), default=models.Value(0))), '+', models.Case(models.When(has_quantitative_nutrient_declaration=True, then=models.Value(256)), default=models.Value(0))), '+', models.Case(models.When(has_implied_nonspecific_claim=True, then=models.Value(512)), default=models.Value(0))), '+', models.Case(models.When(has_logos_icons=True, then=models.Value(1024)), default=models.Value(0))), '+', models.Case(models.When(has_third_party_label=True, then=models.Value(2048)), default=models.Value(0))), '+', models.Case(models.When(is_variety_pack=True, then=models.Value(4096)), default=models.Value(0))), '+', models.Case(models.When(is_individually_packaged=True, then=models.Value(8192)), default=models.Value(0))), '+', models.Case(models.When(has_preparation_instructions=True, then=models.Value(16384)), default=models.Value(0))), '+', models.Case(models.When(has_front_of_pack_label=True, then=models.Value(32768)), default=models.Value(0))), '+', models.Case(models.When(has_multiple_nutrition_facts=True, then=models.Value(65536)), default=models.Value(0))), '+', models.Case(models.When(has_multiple_barcodes=True, then=models.Value(131072)), default=models.Value(0))), '+', models.Case(models.When(has_multiple_ingredients=True, then=models.Value(262144)), default=models.Value(0))), '+', models.Case(models.When(has_multiple_side_images=True, then=models.Value(524288)), default=models.Value(0))), '+', models.Case(models.When(has_multiple_other_images=True, then=models.Value(1048576)), default=models.Value(0))), output_field=models.IntegerField()),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('claim_flags__gt', 0)), fields=['claim_flags'], name='product_claim_flags_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:08
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the index without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('pptp', '0038_product_claim_flags'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['updated_at'], name='product_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+from pptp.units import UNIT_FACTORS, normalize_package_size
+
+CHUNK_SIZE = 2000
+
+
+def backfill_package_quantity(apps, schema_editor):
+    Product = apps.get_model('pptp', 'Product')
+    products = (
+        Product.objects.filter(package_size_unit__in=list(UNIT_FACTORS))
+        .exclude(package_size=0)
+        .only('pk', 'package_size', 'package_size_unit')
+    )
+    batch = []
+    for product in products.iterator(chunk_size=CHUNK_SIZE):
+        product.package_quantity, product.package_dimension = normalize_package_size(
+            product.package_size, product.package_size_unit
+        )
+        batch.append(product)
+        if len(batch) >= CHUNK_SIZE:
+            Product.objects.bulk_update(batch, ['package_quantity', 'package_dimension'])
+            batch = []
+    Product.objects.bulk_update(batch, ['package_quantity', 'package_dimension'])
+
+
+class Migration(migrations.Migration):
+    # Each backfill chunk commits on its own and the index is built without
+    # locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('pptp', '0039_product_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='package_dimension',
+            field=models.CharField(blank=True, choices=[('mass', 'Mass (g)'), ('volume', 'Volume (mL)')], default='', editable=False, max_length=6),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='package_quantity',
+            field=models.DecimalField(blank=True, decimal_places=5, editable=False, help_text='package_size in grams or millilitres, empty if the unit cannot be converted', max_digits=15, null=True),
+        ),
+        migrations.RunPython(backfill_package_quantity, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['package_dimension', 'package_quantity'], name='product_package_size_idx'),
+        ),
+    ]
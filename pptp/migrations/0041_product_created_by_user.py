@@ -0,0 +1,96 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+CHUNK_SIZE = 5000
+
+
+def check_offline_ids(apps, schema_editor):
+    """
+    unique_offline_id_per_user moves from the created_by string to the user.
+    Emails differing only in case link to the same user, so offline ids the
+    old constraint allowed twice would make AddConstraint fail after the
+    backfill and index changes of this non-atomic migration. Refuse to start.
+    """
+    Product = apps.get_model('pptp', 'Product')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    clashes = list(
+        Product.objects.filter(is_offline=True, offline_id__isnull=False)
+        .filter(models.Exists(User.objects.filter(email__iexact=models.OuterRef('created_by'))))
+        .values(email=Lower('created_by'), offline=models.F('offline_id'))
+        .annotate(count=models.Count('pk'))
+        .filter(count__gt=1)
+        .order_by('email', 'offline')[:20]
+    )
+    if clashes:
+        listed = ', '.join(f"{row['email']} {row['offline']}" for row in clashes)
+        raise RuntimeError(
+            "Offline submissions saved twice under emails differing only in case would "
+            f"violate unique_offline_id_per_user; merge or delete them first: {listed}"
+        )
+
+
+def link_users(apps, schema_editor):
+    """Point each product at the user whose email is in created_by, one pk range at a time"""
+    Product = apps.get_model('pptp', 'Product')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    owner = User.objects.filter(email__iexact=models.OuterRef('created_by')).values('pk')[:1]
+    last = Product.objects.aggregate(last=models.Max('pk'))['last'] or 0
+    for start in range(0, last + 1, CHUNK_SIZE):
+        Product.objects.filter(
+            pk__gte=start, pk__lt=start + CHUNK_SIZE, created_by_user__isnull=True, created_by__isnull=False,
+        ).exclude(created_by='').update(created_by_user=models.Subquery(owner))
+
+
+class Migration(migrations.Migration):
+    # Each backfill chunk commits on its own and the indexes are built
+    # without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('pptp', '0040_product_package_quantity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_offline_ids, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='product',
+            name='created_by_user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='created_by',
+            field=models.CharField(blank=True, help_text="Collector's email when the product was created, kept for exports", max_length=255, null=True),
+        ),
+        migrations.RunPython(link_users, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(fields=['created_by_user', '-created_at'], name='product_owner_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='product',
+            index=models.Index(condition=models.Q(('submission_complete', False)), fields=['created_by_user', '-created_at'], name='product_owner_incomplete_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='product',
+            name='product_created_by_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='product',
+            name='product_incomplete_idx',
+        ),
+        migrations.RemoveConstraint(
+            model_name='product',
+            name='unique_offline_id_per_user',
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_offline', True)), fields=('created_by_user', 'offline_id'), name='unique_offline_id_per_user'),
+        ),
+    ]
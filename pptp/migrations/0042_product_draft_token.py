@@ -0,0 +1,18 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0041_product_created_by_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='draft_token',
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.9 on 2026-10-19 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pptp', '0042_product_draft_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
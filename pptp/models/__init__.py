@@ -1,3 +1,5 @@
-from .products import Product, Barcode, NutritionFacts, Ingredients, ProductImage
+from .products import Product, Photo, Barcode, NutritionFacts, Ingredients, ProductImage
+from .progress import BatchProgress
+from .review import ReviewTask
 
-__all__ = ['Product', 'Barcode', 'NutritionFacts', 'Ingredients', 'ProductImage']
\ No newline at end of file
+__all__ = ['Product', 'Photo', 'Barcode', 'NutritionFacts', 'Ingredients', 'ProductImage', 'BatchProgress', 'ReviewTask']
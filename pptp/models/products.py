@@ -1,8 +1,21 @@
+import operator
+import os
+from decimal import Decimal
+from functools import cache, reduce
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.files.storage import storages
 from django.db import models
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.fields.related_descriptors import create_reverse_many_to_one_manager
+from django.db.models.functions import Coalesce, Now
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
-from ..storage.azure import AzureBlobStorage, AzureBlobStorageError
+from ..barcodes import normalize_gtin
+from ..storage.azure import AzureBlobStorageError, AzureBlobStorageUnavailable
+from ..units import DIMENSION_CHOICES, UNIT_FACTORS, normalize_package_size
 
 
 User = get_user_model()
@@ -47,22 +60,193 @@ BATCH_CHOICES = [
 ]
 
 
+# Label claim checkboxes, mostly relevant to supplemented foods
+CLAIM_FIELDS = [
+    'has_supplemental_caution_id',
+    'has_nutrient_content_claim',
+    'has_nutrient_function_claim',
+    'has_disease_risk_reduction_claim',
+    'has_probiotic_claim',
+    'has_therapeutic_claim',
+    'has_function_claim',
+    'has_general_health_claim',
+    'has_quantitative_nutrient_declaration',
+    'has_implied_nonspecific_claim',
+    'has_logos_icons',
+    'has_third_party_label',
+]
+
+# Readable labels for reports and filters
+CLAIM_CHOICES = [(field, field.removeprefix('has_').replace('_', ' ').capitalize()) for field in CLAIM_FIELDS]
+
+# Boolean label flags packed into Product.claim_flags, bit n for FLAG_FIELDS[n].
+# Bit positions are stored in the column, so only ever append to this list.
+FLAG_FIELDS = CLAIM_FIELDS + [
+    'is_variety_pack',
+    'is_individually_packaged',
+    'has_preparation_instructions',
+    'has_front_of_pack_label',
+    'has_multiple_nutrition_facts',
+    'has_multiple_barcodes',
+    'has_multiple_ingredients',
+    'has_multiple_side_images',
+    'has_multiple_other_images',
+]
+FLAG_BITS = {field: 1 << bit for bit, field in enumerate(FLAG_FIELDS)}
+
+
+def flag_mask(fields):
+    """Bitmask of ``fields`` in Product.claim_flags"""
+    try:
+        return sum(FLAG_BITS[field] for field in set(fields))
+    except KeyError as e:
+        raise ValueError(f"{e.args[0]} is not a flag field") from None
+
+
 def get_upload_path(instance, filename):
-    model_name = instance.__class__.__name__.lower()
-    return f"{model_name}/{filename}"
+    return f"{instance.upload_folder}/{filename}"
+
+
+def get_image_storage():
+    """Storage for product photos, configured as STORAGES["images"]"""
+    return storages['images']
+
+
+IMAGE_TYPE_CHOICES = [
+    ('front', _('Front')),
+    ('back', _('Back')),
+    ('side', _('Side')),
+    ('other', _('Other')),
+]
+
+# Every photo has one kind. The values match the ``image_type`` the upload
+# page posts, and the product image kinds are IMAGE_TYPE_CHOICES.
+KIND_CHOICES = [
+    ('barcode', _('Barcode')),
+    ('nutrition', _('Nutrition Facts')),
+    ('ingredients', _('Ingredients')),
+] + IMAGE_TYPE_CHOICES
+
+PRODUCT_IMAGE_KINDS = [kind for kind, _label in IMAGE_TYPE_CHOICES]
+
+# kind -> Product counter column
+KIND_COUNTERS = {
+    'barcode': 'barcode_count',
+    'nutrition': 'nutrition_count',
+    'ingredients': 'ingredients_count',
+    **{kind: f'{kind}_image_count' for kind in PRODUCT_IMAGE_KINDS},
+}
+
+# kind -> blob folder, as used before photos shared one table
+KIND_FOLDERS = {
+    'barcode': 'barcode',
+    'nutrition': 'nutritionfacts',
+    'ingredients': 'ingredients',
+    **{kind: 'productimage' for kind in PRODUCT_IMAGE_KINDS},
+}
+
+
+def count_images(model, **filters):
+    """Correlated COUNT of ``model`` rows for the outer product"""
+    counts = (
+        model.objects.filter(product=OuterRef('pk'), **filters)
+        .order_by()
+        .values('product')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class ProductQuerySet(models.QuerySet):
+    def refresh_image_counters(self):
+        """
+        Recompute the image counter columns from the photo table in one
+        UPDATE. Used after bulk inserts and by ``manage.py repair_image_counters``.
+        """
+        return self.update(**{
+            field: count_images(model, **filters)
+            for field, (model, filters) in image_counter_sources().items()
+        })
+
+    def touch_images(self):
+        """Record a photo change on these products without touching the counters"""
+        return self.update(image_version=F('image_version') + 1, updated_at=Now())
+
+    def with_photos(self):
+        return self.filter(
+            models.Q(front_image_count__gt=0)
+            | models.Q(back_image_count__gt=0)
+            | models.Q(side_image_count__gt=0)
+            | models.Q(other_image_count__gt=0)
+        )
+
+    def with_flags(self, any_of=(), all_of=(), none_of=()):
+        """
+        Filter on FLAG_FIELDS through the claim_flags bitmask: at least one
+        of ``any_of``, every one of ``all_of`` and none of ``none_of`` set.
+        A btree cannot answer the bitwise tests themselves. ``all_of`` adds
+        ``claim_flags >= mask``, a range product_claim_flags_idx can serve;
+        ``any_of`` only limits the scan to that partial index's rows (some
+        flag set), and ``none_of`` is checked row by row.
+        """
+        queryset = self
+        if any_of:
+            mask = flag_mask(any_of)
+            queryset = queryset.alias(any_flags=F('claim_flags').bitand(mask)).filter(
+                claim_flags__gt=0, any_flags__gt=0
+            )
+        if all_of:
+            mask = flag_mask(all_of)
+            queryset = queryset.alias(all_flags=F('claim_flags').bitand(mask)).filter(
+                claim_flags__gte=mask, all_flags=mask
+            )
+        if none_of:
+            mask = flag_mask(none_of)
+            queryset = queryset.alias(no_flags=F('claim_flags').bitand(mask)).filter(no_flags=0)
+        return queryset
+
+    def with_package_size(self, minimum=None, maximum=None, unit='G'):
+        """
+        Products whose package size lies within the inclusive bounds, given
+        in ``unit``. Sizes in any unit of the same dimension match, so 1 KG
+        falls between 200 G and 1000 G. Served by product_package_size_idx.
+        """
+        if unit not in UNIT_FACTORS:
+            raise ValueError(f"Cannot compare package sizes in {unit}")
+        dimension, factor = UNIT_FACTORS[unit]
+        queryset = self.filter(package_dimension=dimension)
+        # Via str so a float bound like 0.2 means 0.2, not its binary expansion
+        if minimum is not None:
+            queryset = queryset.filter(package_quantity__gte=Decimal(str(minimum)) * factor)
+        if maximum is not None:
+            queryset = queryset.filter(package_quantity__lte=Decimal(str(maximum)) * factor)
+        return queryset
 
 
 class Product(models.Model):
     """
     Main product model to store product information and metadata
     """
+    objects = ProductQuerySet.as_manager()
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     created_by = models.CharField(
         max_length=255,
         blank=True,
         null=True,
-        help_text=_("Username from request headers")
+        help_text=_("Collector's email when the product was created, kept for exports")
+    )
+    # Ownership; the composite indexes below lead with this column, so it
+    # needs no index of its own
+    created_by_user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name='products',
     )
     submission_complete = models.BooleanField(default=False)
 
@@ -76,6 +260,22 @@ class Product(models.Model):
         null=True,
         help_text=_("Unique identifier for offline submissions")
     )
+    # Set by the page that starts a new submission, so the first upload and
+    # the first save of that page share one row instead of creating two
+    draft_token = models.UUIDField(
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+    )
+    import_ref = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        unique=True,
+        editable=False,
+        help_text=_("Source and row of a bulk import, used to resume interrupted imports")
+    )
 
     notes = models.TextField(blank=True, default='')
     manual_barcode = models.CharField(
@@ -84,6 +284,14 @@ class Product(models.Model):
         default='',
         help_text=_("barcode number entered by user")
     )
+    normalized_barcode = models.CharField(
+        max_length=14,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=True,
+        help_text=_("manual_barcode as a GTIN-14, blank if it is not a valid GTIN")
+    )
     
     product_name = models.CharField(
         max_length=255,
@@ -102,6 +310,21 @@ class Product(models.Model):
         default="OTH",
         help_text=_("Unit for the total package size")
     )
+    package_quantity = models.DecimalField(
+        max_digits=15,
+        decimal_places=5,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("package_size in grams or millilitres, empty if the unit cannot be converted")
+    )
+    package_dimension = models.CharField(
+        choices=DIMENSION_CHOICES,
+        max_length=6,
+        blank=True,
+        default='',
+        editable=False,
+    )
 
     storage_condition = models.CharField(
         choices=STORAGE_CHOICES,
@@ -195,18 +418,130 @@ class Product(models.Model):
     has_logos_icons = models.BooleanField(default=False)
     has_third_party_label = models.BooleanField(default=False)
 
+    # Image counters, kept up to date by pptp/signals.py
+    barcode_count = models.PositiveIntegerField(default=0, editable=False)
+    nutrition_count = models.PositiveIntegerField(default=0, editable=False)
+    ingredients_count = models.PositiveIntegerField(default=0, editable=False)
+    front_image_count = models.PositiveIntegerField(default=0, editable=False)
+    back_image_count = models.PositiveIntegerField(default=0, editable=False)
+    side_image_count = models.PositiveIntegerField(default=0, editable=False)
+    other_image_count = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped with updated_at by every photo change, so the validation
+    # endpoint's ETag changes even when no counter does; see touch_images()
+    image_version = models.PositiveIntegerField(default=0, editable=False)
+
+    # FLAG_FIELDS as one integer, maintained by the database; see with_flags()
+    claim_flags = models.GeneratedField(
+        expression=reduce(operator.add, [
+            Case(When(**{field: True}, then=Value(bit)), default=Value(0))
+            for field, bit in FLAG_BITS.items()
+        ]),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+
+    # Full-text document for pptp/search.py, maintained by the database
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('product_name', weight='A', config='english')
+            + SearchVector('manual_barcode', 'normalized_barcode', weight='A', config='simple')
+            + SearchVector('notes', weight='C', config='english')
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
-                fields=['created_by', 'offline_id'],
+                fields=['created_by_user', 'offline_id'],
                 name='unique_offline_id_per_user',
                 condition=models.Q(is_offline=True)
             )
         ]
-    
+        indexes = [
+            # Dashboards and listings: one collector's products, newest first
+            models.Index(fields=['created_by_user', '-created_at'], name='product_owner_idx'),
+            models.Index(
+                fields=['created_by_user', '-created_at'],
+                name='product_owner_incomplete_idx',
+                condition=models.Q(submission_complete=False)
+            ),
+            # Admin and export filters by batch and status
+            models.Index(fields=['source_batch', 'submission_complete', '-created_at'], name='product_batch_idx'),
+            # Size-range filters within one dimension
+            models.Index(fields=['package_dimension', 'package_quantity'], name='product_package_size_idx'),
+            # Latest change, for incremental snapshots and the analytics cache key
+            models.Index(fields=['updated_at'], name='product_updated_idx'),
+            GinIndex(fields=['search_vector'], name='product_search_idx'),
+            GinIndex(fields=['product_name'], opclasses=['gin_trgm_ops'], name='product_name_trgm_idx'),
+            # Most products carry no flags, so only index the ones that do
+            models.Index(fields=['claim_flags'], name='product_claim_flags_idx', condition=models.Q(claim_flags__gt=0)),
+        ]
+
+    # Computed from other fields on every save, see populate_derived_fields()
+    DERIVED_FIELDS = ['normalized_barcode', 'package_quantity', 'package_dimension']
+    COUNTER_FIELDS = [
+        'barcode_count', 'nutrition_count', 'ingredients_count',
+        'front_image_count', 'back_image_count', 'side_image_count', 'other_image_count',
+    ]
+
     def __str__(self):
         return f"{self.product_name} (Product {self.id})"
 
+    # One kind of photo each, kept for code written against the old tables.
+    # Prefetch ``photos`` and use photos_by_kind() to load them all at once.
+    @property
+    def barcodes(self):
+        return photo_manager(Barcode)(self)
+
+    @property
+    def nutrition_facts(self):
+        return photo_manager(NutritionFacts)(self)
+
+    @property
+    def ingredients(self):
+        return photo_manager(Ingredients)(self)
+
+    @property
+    def product_images(self):
+        return photo_manager(ProductImage)(self)
+
+    def photos_by_kind(self):
+        """``{kind: [photo, ...]}`` for every kind, from one query (or the prefetch cache)"""
+        grouped = {kind: [] for kind, _label in KIND_CHOICES}
+        for photo in self.photos.all():
+            grouped[photo.kind].append(photo)
+        return grouped
+
+    @property
+    def product_image_count(self):
+        return self.front_image_count + self.back_image_count + self.side_image_count + self.other_image_count
+
+    def populate_derived_fields(self):
+        """Recompute denormalised columns; bulk_create callers must call this"""
+        normalized = normalize_gtin(self.manual_barcode)
+        if normalized != self.normalized_barcode:
+            # Remember the old key so its cached lookup can be invalidated
+            self._previous_normalized_barcode = self.normalized_barcode
+        self.normalized_barcode = normalized
+        self.package_quantity, self.package_dimension = normalize_package_size(
+            self.package_size, self.package_size_unit
+        )
+
+    def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | set(self.DERIVED_FIELDS)
+        elif not self._state.adding and not kwargs.get('force_insert'):
+            # Counters are only changed with F() updates; never write back stale copies
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated
+                and field.name not in [*self.COUNTER_FIELDS, 'image_version']
+            ]
+        super().save(*args, **kwargs)
+
 
 class AzureImageField(models.ImageField):
     def save_form_data(self, instance, data):
@@ -220,6 +555,18 @@ class AzureImageField(models.ImageField):
             else:
                 raise ValidationError(_("Unable to save image: Azure storage error - {}").format(str(e)))
 
+    def pre_save(self, model_instance, add):
+        try:
+            return super().pre_save(model_instance, add)
+        except AzureBlobStorageUnavailable:
+            # Storage is failing fast; keep the record and let the device
+            # re-upload the file later instead of blocking the request.
+            file = getattr(model_instance, self.attname)
+            model_instance.device_filename = os.path.basename(file.name) if file and file.name else None
+            model_instance.is_uploaded = False
+            setattr(model_instance, self.attname, None)
+            return None
+
 
 class BaseImageModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -230,7 +577,7 @@ class BaseImageModel(models.Model):
     image = AzureImageField(
         upload_to=get_upload_path,
         help_text=_("Image file"),
-        storage=AzureBlobStorage(),
+        storage=get_image_storage,
         null=True,
         blank=True
     )
@@ -244,24 +591,85 @@ class BaseImageModel(models.Model):
         default=True,
         help_text=_("Whether the image has been uploaded to the server")
     )
+    # Perceptual hash for near-duplicate detection, see pptp/duplicates.py
+    phash = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text=_("64-bit difference hash of the image")
+    )
+    phash_0 = models.IntegerField(null=True, blank=True, editable=False, db_index=True)
+    phash_1 = models.IntegerField(null=True, blank=True, editable=False, db_index=True)
+    phash_2 = models.IntegerField(null=True, blank=True, editable=False, db_index=True)
+    phash_3 = models.IntegerField(null=True, blank=True, editable=False, db_index=True)
 
     class Meta:
         abstract = True
 
 
-class Barcode(BaseImageModel):
-    """Store barcode images"""
+class PhotoManager(models.Manager):
+    """Limits the proxy models below to their own kinds of photo"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.model.kinds is not None:
+            queryset = queryset.filter(kind__in=self.model.kinds)
+        return queryset
+
+
+class Photo(BaseImageModel):
+    """Every product photo, whatever it shows; ``kind`` says which"""
+    # Kinds this class covers (None: all) and the kind new instances get
+    kinds = None
+    default_kind = None
+
     product = models.ForeignKey(
         'Product',
         on_delete=models.CASCADE,
-        related_name='barcodes'
+        related_name='photos'
+    )
+    kind = models.CharField(
+        max_length=12,
+        choices=KIND_CHOICES,
+        help_text=_("What the photo shows")
     )
+
+    # Barcode photos only
     barcode_number = models.CharField(
         max_length=50,
         blank=True,
         help_text=_("Barcode number if automatically detected")
     )
-    
+    normalized_barcode = models.CharField(
+        max_length=14,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=True,
+        help_text=_("barcode_number as a GTIN-14, blank if it is not a valid GTIN")
+    )
+    decode_confidence = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Confidence of the automatic barcode decode (0-1)")
+    )
+    decode_ms = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("Time spent decoding the barcode image, in milliseconds")
+    )
+    decoded_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_("When automatic decoding was last attempted")
+    )
+
+    objects = PhotoManager()
+
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -269,78 +677,122 @@ class Barcode(BaseImageModel):
                     models.Q(image__isnull=False, is_uploaded=True) |
                     models.Q(device_filename__isnull=False, is_uploaded=False)
                 ),
-                name='barcode_image_or_device_filename_required'
-            )
+                name='photo_image_or_device_filename_required'
+            ),
+            models.CheckConstraint(
+                check=models.Q(kind__in=[kind for kind, _label in KIND_CHOICES]),
+                name='photo_kind_valid'
+            ),
         ]
+        indexes = [
+            # A product's whole photo set, or one kind of it
+            models.Index(fields=['product', 'kind'], name='photo_product_kind_idx'),
+            # Images still waiting on a device re-upload
+            models.Index(
+                fields=['product'],
+                name='photo_pending_idx',
+                condition=models.Q(is_uploaded=False)
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} photo {self.pk} of product {self.product_id}"
+
+    @property
+    def counter_field(self):
+        """Product column counting photos of this kind"""
+        return KIND_COUNTERS[self.kind]
+
+    @property
+    def upload_folder(self):
+        return KIND_FOLDERS.get(self.kind, 'photo')
+
+    # ProductImage used to store the kind as image_type
+    @property
+    def image_type(self):
+        return self.kind
+
+    @image_type.setter
+    def image_type(self, value):
+        self.kind = value
+
+    def get_image_type_display(self):
+        return self.get_kind_display()
+
+    def save(self, *args, **kwargs):
+        if not self.kind and self.default_kind:
+            self.kind = self.default_kind
+        normalized = normalize_gtin(self.barcode_number) if self.kind == 'barcode' else ''
+        if normalized != self.normalized_barcode:
+            self._previous_normalized_barcode = self.normalized_barcode
+        self.normalized_barcode = normalized
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'normalized_barcode'}
+        super().save(*args, **kwargs)
+
+
+class Barcode(Photo):
+    """Barcode photos"""
+    kinds = ['barcode']
+    default_kind = 'barcode'
 
+    class Meta:
+        proxy = True
+
+
+class NutritionFacts(Photo):
+    """Nutrition facts table photos"""
+    kinds = ['nutrition']
+    default_kind = 'nutrition'
 
-class NutritionFacts(BaseImageModel):
-    """Store nutrition facts table images"""
-    product = models.ForeignKey(
-        'Product',
-        on_delete=models.CASCADE,
-        related_name='nutrition_facts'
-    )
-    
     class Meta:
+        proxy = True
         verbose_name_plural = "Nutrition Facts"
-        constraints = [
-            models.CheckConstraint(
-                check=(
-                    models.Q(image__isnull=False, is_uploaded=True) |
-                    models.Q(device_filename__isnull=False, is_uploaded=False)
-                ),
-                name='nutrition_image_or_device_filename_required'
-            )
-        ]
 
 
-class Ingredients(BaseImageModel):
-    """Store ingredients list images"""
-    product = models.ForeignKey(
-        'Product',
-        on_delete=models.CASCADE,
-        related_name='ingredients'
-    )
-    
+class Ingredients(Photo):
+    """Ingredients list photos"""
+    kinds = ['ingredients']
+    default_kind = 'ingredients'
+
     class Meta:
+        proxy = True
         verbose_name_plural = "Ingredients"
-        constraints = [
-            models.CheckConstraint(
-                check=(
-                    models.Q(image__isnull=False, is_uploaded=True) |
-                    models.Q(device_filename__isnull=False, is_uploaded=False)
-                ),
-                name='ingredients_image_or_device_filename_required'
-            )
-        ]
 
 
-class ProductImage(BaseImageModel):
-    """Store additional product images (front, sides, etc.)"""
-    product = models.ForeignKey(
-        'Product',
-        on_delete=models.CASCADE,
-        related_name='product_images'
-    )
-    image_type = models.CharField(
-        max_length=50,
-        choices=[
-            ('front', _('Front')),
-            ('back', _('Back')),
-            ('side', _('Side')),
-            ('other', _('Other')),
-        ],
-        help_text=_("Type of product image")
-    )
+class ProductImage(Photo):
+    """Front, back, side and other package photos; set ``image_type``"""
+    kinds = PRODUCT_IMAGE_KINDS
 
     class Meta:
-        constraints = [
-            models.CheckConstraint(
-                check=(
-                    models.Q(image__isnull=False, is_uploaded=True) |
-                    models.Q(device_filename__isnull=False, is_uploaded=False)
-                ),
-                name='product_image_or_device_filename_required'
-            )
-        ]
+        proxy = True
+
+
+@cache
+def photo_manager(model):
+    """
+    Related manager class for one photo proxy, like the reverse managers of
+    the old per-kind tables: it is limited to the proxy's kinds and
+    ``create()``/``get_or_create()`` fill in the product and default kind.
+    """
+    base = create_reverse_many_to_one_manager(model._default_manager.__class__, Photo._meta.get_field('product').remote_field)
+
+    class KindRelatedManager(base):
+        def __init__(self, instance):
+            super().__init__(instance)
+            self.model = model
+
+        def get_queryset(self):
+            # A ``photos`` prefetch holds every kind, so never answer from it
+            return self._apply_rel_filters(super(base, self).get_queryset())
+
+    return KindRelatedManager
+
+
+# Senders of photo save/delete signals: saving through a proxy reports the proxy class
+PHOTO_MODELS = [Photo, Barcode, NutritionFacts, Ingredients, ProductImage]
+
+
+def image_counter_sources():
+    """Product counter column -> (photo model, filters) it counts"""
+    return {counter: (Photo, {'kind': kind}) for kind, counter in KIND_COUNTERS.items()}
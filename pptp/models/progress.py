@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .products import BATCH_CHOICES, PACKAGING_CHOICES, STORAGE_CHOICES
+
+
+class BatchProgress(models.Model):
+    """
+    Number of products in each (batch, storage, packaging, status) cell.
+
+    Maintained by pptp/progress.py: signals apply +1/-1 deltas as products
+    change and ``manage.py refresh_batch_progress`` rebuilds it from Product.
+    """
+    source_batch = models.CharField(choices=BATCH_CHOICES, max_length=50, blank=True)
+    storage_condition = models.CharField(choices=STORAGE_CHOICES, max_length=12)
+    primary_package_material = models.CharField(choices=PACKAGING_CHOICES, max_length=15)
+    submission_complete = models.BooleanField()
+    needs_manual_verification = models.BooleanField()
+    product_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("batch progress")
+        verbose_name_plural = _("batch progress")
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'source_batch', 'storage_condition', 'primary_package_material',
+                    'submission_complete', 'needs_manual_verification',
+                ],
+                name='unique_batch_progress_cell',
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.source_batch or '-'}: {self.product_count}"
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .products import Product
+
+
+class ReviewTask(models.Model):
+    """
+    One manual verification of a flagged product. Tasks are only ever
+    appended and then closed; pptp/review.py hands them out to reviewers
+    under time-limited leases.
+    """
+    VERIFIED = 'verified'
+    RETURNED = 'returned'
+    OUTCOME_CHOICES = [
+        (VERIFIED, _("Verified")),
+        (RETURNED, _("Returned to collector")),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='review_tasks')
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='review_tasks',
+    )
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    outcome = models.CharField(choices=OUTCOME_CHOICES, max_length=10, blank=True)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product'],
+                name='one_open_review_per_product',
+                condition=models.Q(completed_at__isnull=True),
+            )
+        ]
+        indexes = [
+            # The queue itself: open tasks, oldest first
+            models.Index(fields=['id'], name='review_open_idx', condition=models.Q(completed_at__isnull=True)),
+            models.Index(fields=['claimed_by', 'lease_expires_at'], name='review_claimed_idx'),
+        ]
+
+    def __str__(self):
+        return f"Review {self.pk} of product {self.product_id}"
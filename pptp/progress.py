@@ -0,0 +1,143 @@
+"""
+Collection progress per source batch, served from the BatchProgress table.
+
+Every product falls in exactly one BatchProgress cell, keyed by
+``PROGRESS_FIELDS``. Saving or deleting a product moves it between cells
+with two single-row ``F()`` updates, so the table stays exact without ever
+scanning Product. The updates run in their own short transaction once the
+change commits: every new draft lands in the same cell, and holding that
+row lock for the rest of a request (an upload, say) would serialise
+collectors. Cells are always updated in key order so concurrent moves
+cannot deadlock. Bulk operations that skip signals (``bulk_create``,
+``QuerySet.update``) must call :func:`record_products` or be followed by
+:func:`refresh_progress`, which is also the repair path should a process
+die between a commit and its deltas.
+"""
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Now
+
+from .models import Product
+from .models.products import BATCH_CHOICES, PACKAGING_CHOICES, STORAGE_CHOICES
+from .models.progress import BatchProgress
+
+PROGRESS_FIELDS = [
+    'source_batch',
+    'storage_condition',
+    'primary_package_material',
+    'submission_complete',
+    'needs_manual_verification',
+]
+
+
+def progress_key(values):
+    """Cell key for a product, from an instance or a ``values()`` dict"""
+    get = values.get if isinstance(values, dict) else lambda name: getattr(values, name)
+    key = tuple(get(name) for name in PROGRESS_FIELDS)
+    # Products without a batch are counted under ''
+    return (key[0] or '',) + key[1:]
+
+
+def apply_delta(key, delta):
+    cell = dict(zip(PROGRESS_FIELDS, key))
+    cells = BatchProgress.objects.filter(**cell)
+    if not cells.update(product_count=F('product_count') + delta, updated_at=Now()):
+        BatchProgress.objects.get_or_create(**cell)
+        cells.update(product_count=F('product_count') + delta, updated_at=Now())
+
+
+def apply_deltas(deltas):
+    # Row locks are held until the transaction ends; taking them in key order
+    # keeps two saves moving products in opposite directions from deadlocking
+    with transaction.atomic():
+        for key in sorted(deltas, key=repr):
+            if deltas[key]:
+                apply_delta(key, deltas[key])
+
+
+def apply_on_commit(deltas):
+    transaction.on_commit(lambda: apply_deltas(deltas))
+
+
+def record_change(old_key, new_key):
+    if old_key == new_key:
+        return
+    deltas = {}
+    if old_key is not None:
+        deltas[old_key] = -1
+    if new_key is not None:
+        deltas[new_key] = 1
+    apply_on_commit(deltas)
+
+
+def record_products(products):
+    """Count newly bulk-created products"""
+    apply_on_commit(Counter(progress_key(product) for product in products))
+
+
+def refresh_progress(source_batch=None):
+    """Rebuild BatchProgress from Product, for one batch or all of them"""
+    products = Product.objects.all()
+    cells = BatchProgress.objects.all()
+    if source_batch:
+        products = products.filter(source_batch=source_batch)
+    elif source_batch is not None:
+        products = products.filter(Q(source_batch__isnull=True) | Q(source_batch=''))
+    if source_batch is not None:
+        cells = cells.filter(source_batch=source_batch)
+
+    with transaction.atomic():
+        # Block deltas until the rebuild commits. Deltas are applied after
+        # their product commits, so one still on its way when the counts
+        # below are read is counted twice; run this when collection is quiet.
+        with connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {BatchProgress._meta.db_table} IN EXCLUSIVE MODE')
+        counts = Counter()
+        for row in products.order_by().values(*PROGRESS_FIELDS).annotate(product_count=Count('pk')):
+            counts[progress_key(row)] += row['product_count']
+        cells.delete()
+        return BatchProgress.objects.bulk_create([
+            BatchProgress(**dict(zip(PROGRESS_FIELDS, key)), product_count=count)
+            for key, count in counts.items()
+        ])
+
+
+def batch_summaries():
+    """One summary dict per batch with products, in BATCH_CHOICES order"""
+    storage_labels = dict(STORAGE_CHOICES)
+    packaging_labels = dict(PACKAGING_CHOICES)
+    summaries = {}
+    for cell in BatchProgress.objects.filter(product_count__gt=0):
+        summary = summaries.setdefault(cell.source_batch, {
+            'source_batch': cell.source_batch,
+            'total': 0,
+            'complete': 0,
+            'needs_verification': 0,
+            'storage': Counter(),
+            'packaging': Counter(),
+            'updated_at': cell.updated_at,
+        })
+        summary['total'] += cell.product_count
+        if cell.submission_complete:
+            summary['complete'] += cell.product_count
+        if cell.needs_manual_verification:
+            summary['needs_verification'] += cell.product_count
+        summary['storage'][storage_labels.get(cell.storage_condition, cell.storage_condition)] += cell.product_count
+        summary['packaging'][
+            packaging_labels.get(cell.primary_package_material, cell.primary_package_material)
+        ] += cell.product_count
+        summary['updated_at'] = max(summary['updated_at'], cell.updated_at)
+
+    batch_labels = dict(BATCH_CHOICES)
+    order = {batch: index for index, batch in enumerate(batch_labels)}
+    result = []
+    for batch, summary in sorted(summaries.items(), key=lambda item: (order.get(item[0], len(order)), item[0])):
+        summary['label'] = batch_labels.get(batch, batch or '-')
+        summary['in_progress'] = summary['total'] - summary['complete']
+        summary['percent_complete'] = round(100 * summary['complete'] / summary['total'])
+        summary['storage'] = summary['storage'].most_common()
+        summary['packaging'] = summary['packaging'].most_common()
+        result.append(summary)
+    return result
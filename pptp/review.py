@@ -0,0 +1,116 @@
+"""
+Work queue for products flagged ``needs_manual_verification``.
+
+A ReviewTask is appended when a flagged product is submitted. Reviewers
+claim the oldest open tasks in small batches; a claim is a lease that
+expires after ``PPTP_REVIEW_LEASE_SECONDS`` so abandoned work goes back to
+the queue. On PostgreSQL claims use ``SELECT ... FOR UPDATE SKIP LOCKED``,
+so concurrent reviewers each take different rows without waiting on one
+another. Databases without SKIP LOCKED (SQLite) fall back to claiming rows
+one at a time with a conditional UPDATE; the loser of a race just moves on
+to the next row.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models.review import ReviewTask
+
+DEFAULT_LEASE_SECONDS = 15 * 60
+CLAIM_BATCH_SIZE = 5
+
+
+class LeaseExpired(Exception):
+    pass
+
+
+def get_lease():
+    return timedelta(seconds=getattr(settings, 'PPTP_REVIEW_LEASE_SECONDS', DEFAULT_LEASE_SECONDS))
+
+
+def open_tasks():
+    return ReviewTask.objects.filter(completed_at__isnull=True)
+
+
+def available_tasks(now):
+    return open_tasks().filter(Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now))
+
+
+def held_tasks(user, now=None):
+    return open_tasks().filter(claimed_by=user, lease_expires_at__gt=now or timezone.now())
+
+
+def enqueue(*product_ids):
+    """Add a task for each product that has no open one"""
+    ReviewTask.objects.bulk_create(
+        [ReviewTask(product_id=product_id) for product_id in product_ids],
+        ignore_conflicts=True,
+    )
+
+
+def claim_next(user, limit=CLAIM_BATCH_SIZE):
+    """Lease up to ``limit`` more tasks to ``user``; returns the newly claimed pks"""
+    now = timezone.now()
+    limit -= held_tasks(user, now).count()
+    if limit <= 0:
+        return []
+    lease = {'claimed_by': user, 'lease_expires_at': now + get_lease()}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            pks = list(
+                available_tasks(now).order_by('pk')
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)[:limit]
+            )
+            ReviewTask.objects.filter(pk__in=pks).update(**lease)
+        return pks
+
+    claimed = []
+    # Over-fetch candidates since other reviewers may win some of them
+    for pk in available_tasks(now).order_by('pk').values_list('pk', flat=True)[:limit * 4]:
+        if available_tasks(now).filter(pk=pk).update(**lease):
+            claimed.append(pk)
+            if len(claimed) == limit:
+                break
+    return claimed
+
+
+def renew(task_id, user):
+    """Extend ``user``'s lease on a task; False if it was lost"""
+    now = timezone.now()
+    return bool(held_tasks(user, now).filter(pk=task_id).update(lease_expires_at=now + get_lease()))
+
+
+def release(task_id, user):
+    """Give a claimed task back to the queue"""
+    return bool(held_tasks(user).filter(pk=task_id).update(claimed_by=None, lease_expires_at=None))
+
+
+def complete(task_id, user, outcome, notes=''):
+    """
+    Close a task ``user`` holds. A verified product loses its flag; a
+    returned one goes back to its collector and is queued again once it
+    is resubmitted.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        task = held_tasks(user, now).select_related('product').select_for_update().filter(pk=task_id).first()
+        if task is None:
+            raise LeaseExpired("This review is no longer assigned to you, claim it again from the queue")
+        task.completed_at = now
+        task.outcome = outcome
+        task.notes = notes
+        task.save(update_fields=['completed_at', 'outcome', 'notes'])
+
+        product = task.product
+        if outcome == ReviewTask.VERIFIED:
+            product.needs_manual_verification = False
+            product.save(update_fields=['needs_manual_verification', 'updated_at'])
+        else:
+            product.submission_complete = False
+            product.save(update_fields=['submission_complete', 'updated_at'])
+    return task
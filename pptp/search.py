@@ -0,0 +1,78 @@
+"""
+Product search over names, notes and barcodes.
+
+On PostgreSQL this uses the generated ``Product.search_vector`` column (GIN
+indexed) for ranked, prefix-matching full-text search, plus a trigram index
+on ``product_name`` so misspelt names still match. A query that is a valid
+GTIN goes straight to the normalised barcode indexes instead, which also
+covers numbers decoded from barcode photos.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Greatest
+
+from .barcodes import normalize_gtin
+from .models import Barcode
+
+MIN_QUERY_LENGTH = 2
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+
+
+def prefix_tsquery(text):
+    """'choc chip' -> 'choc:* & chip:*', safe to pass as a raw tsquery"""
+    tokens = _token_re.findall(text.lower())
+    return ' & '.join(f'{token}:*' for token in tokens)
+
+
+def search_products(queryset, text):
+    """
+    Filter ``queryset`` to products matching ``text``, best matches first.
+    The result is annotated with ``rank``.
+    """
+    text = (text or '').strip()
+    if len(text) < MIN_QUERY_LENGTH:
+        return queryset.none()
+
+    normalized = normalize_gtin(text)
+    if normalized:
+        return queryset.filter(
+            Q(normalized_barcode=normalized)
+            | Q(pk__in=Barcode.objects.filter(normalized_barcode=normalized).values('product_id'))
+        ).annotate(rank=Value(1.0, output_field=FloatField())).order_by('-created_at', '-pk')
+
+    if connection.vendor != 'postgresql':
+        return fallback_search(queryset, text)
+
+    raw = prefix_tsquery(text)
+    if not raw:
+        return queryset.none()
+    query = SearchQuery(raw, search_type='raw', config='english') | SearchQuery(
+        raw, search_type='raw', config='simple'
+    )
+    return (
+        queryset.annotate(
+            text_rank=SearchRank(F('search_vector'), query),
+            name_similarity=TrigramWordSimilarity(text, 'product_name'),
+        )
+        .filter(Q(search_vector=query) | Q(product_name__trigram_word_similar=text))
+        .annotate(rank=Greatest('text_rank', 'name_similarity'))
+        .order_by('-rank', '-created_at', '-pk')
+    )
+
+
+def fallback_search(queryset, text):
+    """Unranked substring search for databases without the PostgreSQL indexes"""
+    condition = Q()
+    for token in _token_re.findall(text):
+        condition &= (
+            Q(product_name__icontains=token)
+            | Q(notes__icontains=token)
+            | Q(manual_barcode__icontains=token)
+        )
+    return queryset.filter(condition).annotate(
+        rank=Value(0.0, output_field=FloatField())
+    ).order_by('-created_at', '-pk')
@@ -0,0 +1,145 @@
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from .barcode_index import invalidate_lookup
+from .barcodes import decode_stored_barcode
+from .duplicates import compute_image_hash
+from .models.products import KIND_COUNTERS, PHOTO_MODELS, Barcode, Photo, Product
+from .progress import PROGRESS_FIELDS, progress_key, record_change
+from .review import enqueue
+from .tasks import run_in_background
+
+
+def schedule_image_hash(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and 'image' not in update_fields:
+        return
+    if instance.is_uploaded and instance.image and instance.phash is None:
+        run_in_background(compute_image_hash, sender, instance.pk)
+
+
+for photo_model in PHOTO_MODELS:
+    post_save.connect(schedule_image_hash, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_phash')
+
+
+def schedule_barcode_decode(sender, instance, created, update_fields=None, **kwargs):
+    if instance.kind != 'barcode' or (update_fields and 'image' not in update_fields):
+        return
+    if instance.is_uploaded and instance.image and instance.decoded_at is None:
+        run_in_background(decode_stored_barcode, instance.pk)
+
+
+for photo_model in PHOTO_MODELS:
+    post_save.connect(schedule_barcode_decode, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_decode')
+
+
+def invalidate_product_barcodes(sender, instance, **kwargs):
+    # Cached lookups embed the product's name, batch and status, so any
+    # change invalidates every code that points at it.
+    codes = {instance.normalized_barcode, getattr(instance, '_previous_normalized_barcode', '')}
+    if kwargs.get('signal') is post_save:
+        codes.update(
+            Barcode.objects.filter(product=instance)
+            .exclude(normalized_barcode='')
+            .values_list('normalized_barcode', flat=True)
+        )
+    invalidate_lookup(*codes)
+
+
+def invalidate_barcode(sender, instance, **kwargs):
+    if instance.kind != 'barcode':
+        return
+    invalidate_lookup(instance.normalized_barcode, getattr(instance, '_previous_normalized_barcode', ''))
+
+
+post_save.connect(invalidate_product_barcodes, sender=Product, dispatch_uid='product_barcode_lookup')
+post_delete.connect(invalidate_product_barcodes, sender=Product, dispatch_uid='product_barcode_lookup_delete')
+for photo_model in PHOTO_MODELS:
+    post_save.connect(invalidate_barcode, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_lookup')
+    post_delete.connect(invalidate_barcode, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_lookup_delete')
+
+
+def remember_photo_kind(sender, instance, **kwargs):
+    # The kind a photo is counted under, to move the count if it is edited
+    if instance.pk and 'kind' not in instance.get_deferred_fields():
+        instance._counted_kind = instance.kind
+
+
+def load_photo_kind(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or hasattr(instance, '_counted_kind'):
+        return
+    instance._counted_kind = Photo.objects.filter(pk=instance.pk).values_list('kind', flat=True).first()
+
+
+def count_image_created(sender, instance, created, **kwargs):
+    products = Product.objects.filter(pk=instance.product_id)
+    counts = {}
+    if created:
+        counts[instance.counter_field] = F(instance.counter_field) + 1
+    elif getattr(instance, '_counted_kind', None) not in (None, instance.kind):
+        # Edited into another kind, e.g. a front photo that shows the back
+        old_field = KIND_COUNTERS[instance._counted_kind]
+        counts[old_field] = Greatest(F(old_field) - 1, 0)
+        counts[instance.counter_field] = F(instance.counter_field) + 1
+    instance._counted_kind = instance.kind
+    if counts:
+        products.update(**counts, image_version=F('image_version') + 1, updated_at=Now())
+    else:
+        products.touch_images()
+
+
+def count_image_deleted(sender, instance, **kwargs):
+    Product.objects.filter(pk=instance.product_id).update(
+        # Never go negative if a row was already missing from the count
+        **{instance.counter_field: Greatest(F(instance.counter_field) - 1, 0)},
+        image_version=F('image_version') + 1,
+        updated_at=Now(),
+    )
+
+
+for photo_model in PHOTO_MODELS:
+    post_init.connect(remember_photo_kind, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_kind_init')
+    pre_save.connect(load_photo_kind, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_kind_load')
+    post_save.connect(count_image_created, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_count')
+    post_delete.connect(count_image_deleted, sender=photo_model, dispatch_uid=f'{photo_model.__name__}_uncount')
+
+
+def remember_progress_key(sender, instance, **kwargs):
+    # Deferred fields would cost a query each; pre_save loads them if needed
+    if instance.pk and not instance.get_deferred_fields().intersection(PROGRESS_FIELDS):
+        instance._progress_key = progress_key(instance)
+
+
+def load_progress_key(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or hasattr(instance, '_progress_key'):
+        return
+    stored = Product.objects.filter(pk=instance.pk).values(*PROGRESS_FIELDS).first()
+    instance._progress_key = progress_key(stored) if stored else None
+
+
+def update_progress(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = progress_key(instance)
+    record_change(None if created else instance._progress_key, new_key)
+    instance._progress_key = new_key
+
+
+def remove_progress(sender, instance, **kwargs):
+    record_change(getattr(instance, '_progress_key', None) or progress_key(instance), None)
+
+
+post_init.connect(remember_progress_key, sender=Product, dispatch_uid='product_progress_init')
+pre_save.connect(load_progress_key, sender=Product, dispatch_uid='product_progress_load')
+post_save.connect(update_progress, sender=Product, dispatch_uid='product_progress')
+post_delete.connect(remove_progress, sender=Product, dispatch_uid='product_progress_delete')
+
+
+def queue_for_review(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and not {'needs_manual_verification', 'submission_complete'} & set(update_fields)):
+        return
+    if instance.needs_manual_verification and instance.submission_complete:
+        enqueue(instance.pk)
+
+
+post_save.connect(queue_for_review, sender=Product, dispatch_uid='product_review_queue')
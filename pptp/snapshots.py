@@ -0,0 +1,190 @@
+"""
+Columnar Parquet snapshots of each collection batch for analysts.
+
+Snapshots are a Hive-partitioned dataset, one directory per batch::
+
+    <root>/source_batch=2025_supp_food/part-20250101T120000000000.parquet
+    <root>/source_batch=2025_supp_food/_manifest.json
+
+Each export chunk becomes one row group. Choice fields are dictionary
+encoded and the boolean claim flags are Arrow/Parquet booleans, which are
+stored bit-packed. Incremental runs append a new part file holding only the
+products updated since the last run; readers keep the newest row per
+product, which :func:`read_snapshot` does for you. Deleted products only
+disappear on a full rebuild.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+
+from .exports import DEFAULT_CHUNK_SIZE, IMAGE_RELATIONS, PRODUCT_FIELDS, export_queryset, export_rows
+from .models import Product
+from .models.products import CLAIM_FIELDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional analytics dependency
+    pa = pc = pq = None
+
+
+MANIFEST_NAME = '_manifest.json'
+# Re-read this much before the previous watermark so rows saved by
+# transactions that committed late are not missed; duplicates are dropped on read.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+SNAPSHOT_FIELDS = [field for field in PRODUCT_FIELDS if field != 'source_batch'] + CLAIM_FIELDS
+
+
+def require_pyarrow():
+    if pa is None:
+        raise ImproperlyConfigured("Parquet snapshots need pyarrow, install it with 'pip install pyarrow'")
+
+
+def arrow_type(field):
+    if field.choices:
+        return pa.dictionary(pa.int8(), pa.string())
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, (models.AutoField, models.BigIntegerField)):
+        return pa.int64()
+    if isinstance(field, models.IntegerField):
+        return pa.int32()
+    return pa.string()
+
+
+def snapshot_schema():
+    require_pyarrow()
+    columns = [
+        (name, arrow_type(Product._meta.get_field(name)))
+        for name in SNAPSHOT_FIELDS
+    ]
+    columns.append(('decoded_barcodes', pa.list_(pa.string())))
+    for prefix, _ in IMAGE_RELATIONS:
+        columns += [(f'{prefix}_count', pa.int32()), (f'{prefix}_blobs', pa.list_(pa.string()))]
+    return pa.schema(columns)
+
+
+def get_snapshot_root():
+    return Path(getattr(settings, 'PPTP_SNAPSHOT_ROOT', Path(settings.MEDIA_ROOT) / 'snapshots'))
+
+
+def batch_directory(root, batch):
+    return Path(root) / f'source_batch={batch}'
+
+
+def read_manifest(directory):
+    path = Path(directory) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def write_manifest(directory, manifest):
+    path = Path(directory) / MANIFEST_NAME
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(manifest, indent=2))
+    os.replace(temporary, path)
+
+
+def write_part(path, rows, schema, chunk_size):
+    """Write ``rows`` to one Parquet file, a row group per chunk. Returns (rows, max updated_at)"""
+    written = 0
+    max_updated_at = None
+    writer = None
+    chunk = []
+    try:
+        for row in rows:
+            chunk.append(row)
+            if max_updated_at is None or row['updated_at'] > max_updated_at:
+                max_updated_at = row['updated_at']
+            if len(chunk) >= chunk_size:
+                writer = writer or pq.ParquetWriter(path, schema, compression='zstd')
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema), row_group_size=len(chunk))
+                written += len(chunk)
+                chunk = []
+        if chunk or writer is None:
+            writer = writer or pq.ParquetWriter(path, schema, compression='zstd')
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema), row_group_size=max(len(chunk), 1))
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written, max_updated_at
+
+
+def build_snapshot(batch, root=None, full=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write a snapshot part for ``batch``. Incremental unless ``full`` or there
+    is no previous snapshot. Returns the updated manifest.
+    """
+    require_pyarrow()
+    directory = batch_directory(root or get_snapshot_root(), batch)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = None if full else read_manifest(directory)
+
+    updated_after = None
+    if manifest and manifest.get('max_updated_at'):
+        updated_after = datetime.fromisoformat(manifest['max_updated_at']) - WATERMARK_OVERLAP
+
+    started_at = timezone.now()
+    name = f'part-{started_at:%Y%m%dT%H%M%S%f}.parquet'
+    queryset = export_queryset(source_batch=batch, updated_after=updated_after, fields=SNAPSHOT_FIELDS)
+    rows = export_rows(queryset, chunk_size=chunk_size, fields=SNAPSHOT_FIELDS)
+
+    temporary = directory / f'.{name}.tmp'
+    written, max_updated_at = write_part(temporary, rows, snapshot_schema(), chunk_size)
+
+    if manifest is None:
+        # Full rebuild: drop the old parts once the new one is complete
+        for old in directory.glob('part-*.parquet'):
+            old.unlink()
+        manifest = {'batch': batch, 'files': [], 'max_updated_at': None}
+
+    if written:
+        os.replace(temporary, directory / name)
+        manifest['files'].append({'name': name, 'rows': written, 'incremental': updated_after is not None})
+        if max_updated_at and (
+            manifest['max_updated_at'] is None
+            or max_updated_at > datetime.fromisoformat(manifest['max_updated_at'])
+        ):
+            manifest['max_updated_at'] = max_updated_at.isoformat()
+    else:
+        temporary.unlink()
+
+    manifest['snapshot_at'] = started_at.isoformat()
+    write_manifest(directory, manifest)
+    return manifest
+
+
+def latest_rows(table):
+    """Keep only the newest row for each product id"""
+    table = table.sort_by([('id', 'ascending'), ('updated_at', 'descending')])
+    if table.num_rows < 2:
+        return table
+    ids = table['id']
+    changed = pc.not_equal(ids.slice(1), ids.slice(0, table.num_rows - 1))
+    keep = pa.concat_arrays([pa.array([True])] + changed.chunks)
+    return table.filter(keep)
+
+
+def read_snapshot(batch=None, root=None, columns=None):
+    """Load one batch (or every batch) as a pyarrow Table, one row per product"""
+    require_pyarrow()
+    root = Path(root or get_snapshot_root())
+    filters = [('source_batch', '=', batch)] if batch else None
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ['id', 'updated_at']))
+    table = pq.read_table(root, columns=columns, filters=filters, partitioning='hive')
+    return latest_rows(table)
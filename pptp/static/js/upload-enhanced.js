@@ -18,7 +18,6 @@ document.addEventListener('DOMContentLoaded', function() {
     uploadResults: []
   };
 
-  const deleteImageUrl = document.getElementById('delete-image-url')?.value;
   const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value;
 
   class FileUploader {
@@ -87,6 +86,9 @@ document.addEventListener('DOMContentLoaded', function() {
           console.log(`Upload completed: ${item.formPrefix}, status: ${xhr.status}`, response);
           
           if (xhr.status >= 200 && xhr.status < 300 && response.success) {
+            if (response.edit_url) {
+              adoptDraft(response);
+            }
             this.results.push({
               file: item.file,
               formPrefix: item.formPrefix,
@@ -190,6 +192,25 @@ document.addEventListener('DOMContentLoaded', function() {
 
   setupFormSubmission();
 
+  setupBarcodeLookup();
+
+  setupAutosave();
+
+  // The first upload of a new submission creates its product; later requests
+  // and reloads use that product's URLs
+  function adoptDraft(response) {
+    document.getElementById('ajax-upload-url').value = response.upload_url;
+    document.getElementById('ajax-validate-url').value = response.validate_url;
+    document.getElementById('delete-image-url').value = response.delete_url;
+    document.getElementById('product-id').value = response.product_id;
+    document.getElementById('autosave-url').value = response.autosave_url;
+    const form = document.getElementById('combinedUploadForm');
+    if (form) {
+      form.action = response.edit_url;
+    }
+    window.history.replaceState(null, '', response.edit_url);
+  }
+
   function setupDeleteButtons() {
     document.querySelectorAll('.delete-image-btn').forEach(btn => {
       btn.addEventListener('click', handleDeleteImage);
@@ -209,6 +230,7 @@ document.addEventListener('DOMContentLoaded', function() {
       return;
     }
 
+    const deleteImageUrl = document.getElementById('delete-image-url')?.value;
     if (!deleteImageUrl || !csrfToken) {
       showToast('Delete functionality not available', 'error');
       return;
@@ -702,6 +724,181 @@ document.addEventListener('DOMContentLoaded', function() {
     }
   }
 
+  function setupBarcodeLookup() {
+    const lookupUrl = document.getElementById('barcode-lookup-url')?.value;
+    const barcodeInput = document.querySelector('input[name="manual_barcode"]');
+    const resultDiv = document.getElementById('barcodeLookupResult');
+    const batchSelect = document.querySelector('select[name="source_batch"]');
+    const productId = document.getElementById('product-id')?.value;
+
+    if (!lookupUrl || !barcodeInput || !resultDiv) {
+      return;
+    }
+
+    let timer = null;
+    let controller = null;
+
+    function renderMatches(data) {
+      resultDiv.innerHTML = '';
+      if (!data.matches || data.matches.length === 0) {
+        return;
+      }
+
+      const alert = document.createElement('div');
+      alert.className = 'alert alert-warning small py-2 mb-0';
+      alert.textContent = batchSelect?.value
+        ? 'Already collected in this batch: '
+        : 'Already collected: ';
+
+      data.matches.forEach((match, index) => {
+        const link = document.createElement('a');
+        link.href = match.url;
+        link.textContent = match.product_name || `Product ${match.id}`;
+        if (index > 0) {
+          alert.appendChild(document.createTextNode(', '));
+        }
+        alert.appendChild(link);
+        if (!match.submission_complete) {
+          alert.appendChild(document.createTextNode(' (draft)'));
+        }
+      });
+      resultDiv.appendChild(alert);
+    }
+
+    function lookup() {
+      const code = barcodeInput.value.trim();
+      if (controller) {
+        controller.abort();
+      }
+      // Only complete codes can be valid GTINs, so skip the partial ones
+      if (![8, 12, 13, 14].includes(code.replace(/[\s-]/g, '').length)) {
+        resultDiv.innerHTML = '';
+        return;
+      }
+
+      const params = new URLSearchParams({ code: code });
+      if (batchSelect?.value) {
+        params.append('batch', batchSelect.value);
+      }
+      if (productId) {
+        params.append('exclude', productId);
+      }
+
+      controller = new AbortController();
+      fetch(`${lookupUrl}?${params}`, { signal: controller.signal })
+        .then(response => {
+          if (!response.ok) {
+            throw new Error(`Server error: ${response.status}`);
+          }
+          return response.json();
+        })
+        .then(renderMatches)
+        .catch(error => {
+          if (error.name !== 'AbortError') {
+            console.error('Barcode lookup error:', error);
+          }
+        });
+    }
+
+    function scheduleLookup() {
+      clearTimeout(timer);
+      timer = setTimeout(lookup, 250);
+    }
+
+    barcodeInput.addEventListener('input', scheduleLookup);
+    batchSelect?.addEventListener('change', scheduleLookup);
+    lookup();
+  }
+
+  // Changed fields are PATCHed on their own once typing pauses, so keeping
+  // the product up to date never re-renders the page
+  function setupAutosave() {
+    const form = document.getElementById('combinedUploadForm');
+    const fieldsScript = document.getElementById('autosave-fields');
+    const status = document.getElementById('autosave-status');
+    if (!form || !fieldsScript || !csrfToken) {
+      return;
+    }
+
+    const fields = new Set(JSON.parse(fieldsScript.textContent));
+    let changes = {};
+    let timer = null;
+    // One request at a time, so a new draft is only created once
+    let saving = Promise.resolve();
+
+    function fieldValue(input) {
+      return input.type === 'checkbox' ? input.checked : input.value;
+    }
+
+    function showFieldErrors(data) {
+      (data.saved || []).forEach(name => {
+        const input = form.elements[name];
+        input?.classList.remove('is-invalid');
+        input?.removeAttribute('title');
+      });
+      Object.entries(data.errors || {}).forEach(([name, errors]) => {
+        const input = form.elements[name];
+        input?.classList.add('is-invalid');
+        input?.setAttribute('title', errors.join(' '));
+      });
+    }
+
+    function send() {
+      const url = document.getElementById('autosave-url')?.value;
+      const body = changes;
+      changes = {};
+      if (!url || Object.keys(body).length === 0) {
+        return Promise.resolve();
+      }
+      status.textContent = 'Saving...';
+      return fetch(url, {
+        method: 'PATCH',
+        headers: {
+          'X-CSRFToken': csrfToken,
+          'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(body)
+      })
+      .then(response => {
+        if (!response.ok) {
+          throw new Error(`Server error: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then(data => {
+        if (data.edit_url) {
+          adoptDraft(data);
+        }
+        showFieldErrors(data);
+        status.textContent = data.success ? 'All changes saved' : 'Some changes could not be saved';
+      })
+      .catch(error => {
+        console.error('Autosave error:', error);
+        // Keep the failed values unless they have been edited again since
+        changes = Object.assign(body, changes);
+        status.textContent = 'Changes not saved';
+      });
+    }
+
+    function scheduleSave(e) {
+      const name = e.target.name;
+      if (!fields.has(name)) {
+        return;
+      }
+      changes[name] = fieldValue(e.target);
+      status.textContent = '';
+      clearTimeout(timer);
+      timer = setTimeout(() => {
+        saving = saving.then(send);
+      }, 800);
+    }
+
+    form.addEventListener('input', scheduleSave);
+    form.addEventListener('change', scheduleSave);
+    // A full submit carries every field anyway
+    form.addEventListener('submit', () => clearTimeout(timer));
+  }
+
   function initializeFormValidation() {
     console.log('Initializing form validation');
     const form = document.getElementById('combinedUploadForm');
@@ -790,14 +987,8 @@ document.addEventListener('DOMContentLoaded', function() {
           submitButton.disabled = true;
           submitButton.innerHTML = '<i class="bi bi-hourglass-split me-1"></i> Validating...';
           
-          fetch(validateUrl, {
-            method: 'POST',
-            headers: {
-              'X-CSRFToken': csrfTokenValue,
-              'Content-Type': 'application/x-www-form-urlencoded'
-            },
-            body: new URLSearchParams(new FormData(form))
-          })
+          // A GET, so an unchanged product is answered with 304 from its ETag
+          fetch(validateUrl, { headers: { 'Accept': 'application/json' } })
           .then(response => {
             console.log('Validation response status:', response.status);
             if (!response.ok) {
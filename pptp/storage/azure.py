@@ -5,17 +5,35 @@ from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import (
     ResourceNotFoundError,
     ClientAuthenticationError,
+    HttpResponseError,
     AzureError
 )
 import os
 from urllib.parse import urljoin
 from django.core.exceptions import SuspiciousOperation
+from .instrumentation import profiler
+from .resilience import CircuitOpenError, get_policy
 
 
 class AzureBlobStorageError(Exception):
     pass
 
 
+class AzureBlobStorageUnavailable(AzureBlobStorageError):
+    """Storage is failing fast because the circuit breaker is open"""
+    pass
+
+
+def is_transient_error(error):
+    """Timeouts, connection failures, throttling and 5xx are worth retrying"""
+    if isinstance(error, (ResourceNotFoundError, ClientAuthenticationError)):
+        return False
+    if isinstance(error, HttpResponseError):
+        status = getattr(error, 'status_code', None)
+        return status is None or status == 429 or status >= 500
+    return isinstance(error, AzureError)
+
+
 @deconstructible
 class AzureBlobStorage(Storage):
     def __init__(self):
@@ -49,9 +67,16 @@ class AzureBlobStorage(Storage):
             self.sas_token = required_settings['AZURE_SAS_TOKEN']
             self.container = required_settings['AZURE_CONTAINER']
 
+            self.policy = get_policy((self.account_url, self.container))
+
+            # Retries are handled by our policy, so switch off the SDK's own
+            # (up to 10 attempts with long backoff by default).
             self.client = BlobServiceClient(
                 account_url=self.account_url,
-                credential=self.sas_token
+                credential=self.sas_token,
+                retry_total=0,
+                connection_timeout=self.policy.timeout_for('connect'),
+                read_timeout=max(self.policy.timeouts.values()),
             )
             self.container_client = self.client.get_container_client(self.container)
 
@@ -71,22 +96,45 @@ class AzureBlobStorage(Storage):
             self.container == other.container
         )
 
+    def _call(self, operation, func, size=None):
+        with profiler.measure(operation, expected=ResourceNotFoundError) as measurement:
+            try:
+                result = self.policy.call(operation, func, is_transient_error)
+            except CircuitOpenError:
+                raise AzureBlobStorageUnavailable("Azure storage is unavailable, try again later")
+            if size is None and isinstance(result, bytes):
+                size = len(result)
+            measurement['bytes'] = size or 0
+            return result
+
+    def _timeouts(self, operation):
+        return {
+            'connection_timeout': self.policy.timeout_for('connect'),
+            'read_timeout': self.policy.timeout_for(operation),
+        }
+
     def _save(self, name, content):
-        try:
+        def upload():
             blob_client = self.container_client.get_blob_client(name)
             content.seek(0)
-            blob_client.upload_blob(content, overwrite=True)
+            blob_client.upload_blob(content, overwrite=True, **self._timeouts('save'))
             return name
+
+        try:
+            return self._call('save', upload, size=getattr(content, 'size', None))
         except ClientAuthenticationError:
             raise AzureBlobStorageError("Azure authentication token has expired")
         except AzureError as e:
             raise AzureBlobStorageError(f"Failed to save file to Azure: {str(e)}")
 
     def _open(self, name, mode="rb"):
-        try:
+        def download():
             blob_client = self.container_client.get_blob_client(name)
-            stream = blob_client.download_blob()
+            stream = blob_client.download_blob(**self._timeouts('open'))
             return stream.readall()
+
+        try:
+            return self._call('open', download)
         except ResourceNotFoundError:
             return None
         except ClientAuthenticationError:
@@ -95,9 +143,12 @@ class AzureBlobStorage(Storage):
             raise AzureBlobStorageError(f"Failed to open file from Azure: {str(e)}")
 
     def delete(self, name):
-        try:
+        def delete_blob():
             blob_client = self.container_client.get_blob_client(name)
-            blob_client.delete_blob()
+            blob_client.delete_blob(**self._timeouts('delete'))
+
+        try:
+            self._call('delete', delete_blob)
         except ResourceNotFoundError:
             pass
         except ClientAuthenticationError:
@@ -106,10 +157,13 @@ class AzureBlobStorage(Storage):
             raise AzureBlobStorageError(f"Failed to delete file from Azure: {str(e)}")
 
     def exists(self, name):
-        try:
+        def get_properties():
             blob_client = self.container_client.get_blob_client(name)
-            blob_client.get_blob_properties()
+            blob_client.get_blob_properties(**self._timeouts('exists'))
             return True
+
+        try:
+            return self._call('exists', get_properties)
         except ResourceNotFoundError:
             return False
         except ClientAuthenticationError:
@@ -119,7 +173,8 @@ class AzureBlobStorage(Storage):
 
     def url(self, name):
         try:
-            return self.container_client.get_blob_client(name).url
+            with profiler.measure('url'):
+                return self.container_client.get_blob_client(name).url
         except ClientAuthenticationError:
             raise AzureBlobStorageError("Azure authentication token has expired")
         except AzureError as e:
@@ -0,0 +1,237 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+OPERATIONS = ('save', 'open', 'delete', 'exists', 'url')
+
+# Upper bounds in milliseconds; the last bucket catches everything slower.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+CACHE_PREFIX = 'pptp:storage_stats'
+FLUSH_INTERVAL = 5
+
+_request_stats = contextvars.ContextVar('storage_request_stats', default=None)
+
+
+def bucket_index(elapsed_ms):
+    for index, bound in enumerate(BUCKETS_MS):
+        if elapsed_ms <= bound:
+            return index
+    return len(BUCKETS_MS) - 1
+
+
+def bucket_label(index):
+    bound = BUCKETS_MS[index]
+    return '+Inf' if bound == float('inf') else str(bound)
+
+
+class OperationStats:
+    """Counters and latency histogram for one storage operation"""
+    __slots__ = ('count', 'errors', 'bytes', 'total_us', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_us = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def add(self, elapsed, nbytes, error):
+        elapsed_ms = elapsed * 1000
+        self.count += 1
+        self.errors += int(error)
+        self.bytes += nbytes
+        self.total_us += int(elapsed * 1_000_000)
+        self.buckets[bucket_index(elapsed_ms)] += 1
+
+    def fields(self):
+        values = {
+            'count': self.count,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'total_us': self.total_us,
+        }
+        for index, value in enumerate(self.buckets):
+            values[f'bucket_{index}'] = value
+        return values
+
+    def as_dict(self):
+        return stats_dict(self.fields())
+
+
+def stats_dict(fields):
+    count = fields.get('count', 0)
+    total_ms = fields.get('total_us', 0) / 1000
+    return {
+        'count': count,
+        'errors': fields.get('errors', 0),
+        'bytes': fields.get('bytes', 0),
+        'total_ms': round(total_ms, 3),
+        'mean_ms': round(total_ms / count, 3) if count else 0,
+        'histogram': {
+            bucket_label(index): fields.get(f'bucket_{index}', 0)
+            for index in range(len(BUCKETS_MS))
+        },
+    }
+
+
+class RequestStorageStats:
+    """Storage calls made while handling a single request"""
+
+    def __init__(self):
+        self.operations = {}
+
+    def add(self, operation, elapsed, nbytes, error):
+        self.operations.setdefault(operation, OperationStats()).add(elapsed, nbytes, error)
+
+    @property
+    def total_ms(self):
+        return sum(stats.total_us for stats in self.operations.values()) / 1000
+
+    def as_dict(self):
+        return {operation: stats.as_dict() for operation, stats in self.operations.items()}
+
+    def server_timing(self):
+        return ', '.join(
+            f'storage-{operation};dur={stats.total_us / 1000:.1f};desc="{stats.count} calls"'
+            for operation, stats in self.operations.items()
+        )
+
+
+class StorageProfiler:
+    """
+    Process-wide recorder for storage calls.
+
+    Deltas are pushed into the Django cache with atomic increments so that
+    every worker process contributes to the same totals, which is what the
+    metrics endpoint and ``manage.py storage_stats`` read back.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._last_flush = time.monotonic()
+
+    @contextmanager
+    def measure(self, operation, expected=()):
+        """
+        Time the block and count it against ``operation``. Set
+        ``measurement['bytes']`` inside the block to record the payload size.
+        Exceptions listed in ``expected`` (e.g. "not found") are not errors.
+        """
+        measurement = {'bytes': 0}
+        error = False
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except expected:
+            raise
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.record(operation, time.perf_counter() - start, measurement['bytes'], error)
+
+    def record(self, operation, elapsed, nbytes=0, error=False):
+        with self._lock:
+            self._pending.setdefault(operation, OperationStats()).add(elapsed, nbytes, error)
+            due = time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+
+        request_stats = _request_stats.get()
+        if request_stats is not None:
+            request_stats.add(operation, elapsed, nbytes, error)
+
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        for operation, stats in pending.items():
+            for field, value in stats.fields().items():
+                if not value:
+                    continue
+                key = f'{CACHE_PREFIX}:{operation}:{field}'
+                cache.add(key, 0, timeout=None)
+                try:
+                    cache.incr(key, value)
+                except ValueError:
+                    # Evicted between add() and incr(); losing one delta is fine.
+                    pass
+
+    def snapshot(self):
+        self.flush()
+        keys = [
+            f'{CACHE_PREFIX}:{operation}:{field}'
+            for operation in OPERATIONS
+            for field in OperationStats().fields()
+        ]
+        values = cache.get_many(keys)
+        snapshot = {}
+        for operation in OPERATIONS:
+            prefix = f'{CACHE_PREFIX}:{operation}:'
+            fields = {key[len(prefix):]: value for key, value in values.items() if key.startswith(prefix)}
+            if fields:
+                snapshot[operation] = stats_dict(fields)
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._pending = {}
+        cache.delete_many([
+            f'{CACHE_PREFIX}:{operation}:{field}'
+            for operation in OPERATIONS
+            for field in OperationStats().fields()
+        ])
+
+
+profiler = StorageProfiler()
+
+
+@contextmanager
+def collect_request_stats():
+    """Collect storage calls made in this context into a RequestStorageStats"""
+    stats = RequestStorageStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def prometheus_text(snapshot):
+    lines = [
+        '# HELP pptp_storage_operation_seconds Latency of image storage operations',
+        '# TYPE pptp_storage_operation_seconds histogram',
+    ]
+    for operation, stats in snapshot.items():
+        cumulative = 0
+        for label, value in stats['histogram'].items():
+            cumulative += value
+            le = label if label == '+Inf' else str(float(label) / 1000)
+            lines.append(f'pptp_storage_operation_seconds_bucket{{operation="{operation}",le="{le}"}} {cumulative}')
+        lines.append(f'pptp_storage_operation_seconds_sum{{operation="{operation}"}} {stats["total_ms"] / 1000}')
+        lines.append(f'pptp_storage_operation_seconds_count{{operation="{operation}"}} {stats["count"]}')
+    lines += [
+        '# HELP pptp_storage_operation_errors_total Failed image storage operations',
+        '# TYPE pptp_storage_operation_errors_total counter',
+    ]
+    lines += [
+        f'pptp_storage_operation_errors_total{{operation="{operation}"}} {stats["errors"]}'
+        for operation, stats in snapshot.items()
+    ]
+    lines += [
+        '# HELP pptp_storage_bytes_total Bytes moved by image storage operations',
+        '# TYPE pptp_storage_bytes_total counter',
+    ]
+    lines += [
+        f'pptp_storage_bytes_total{{operation="{operation}"}} {stats["bytes"]}'
+        for operation, stats in snapshot.items()
+    ]
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,212 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import quote
+
+from azure.core.exceptions import ResourceNotFoundError, ServiceRequestError, ServiceResponseError
+from django.conf import settings
+from django.utils.deconstruct import deconstructible
+
+from .azure import AzureBlobStorage
+from .resilience import get_policy
+
+
+class MemoryBlobBackend:
+    """Blobs kept in a process-wide dict, one namespace per container"""
+    _containers = {}
+    _lock = threading.Lock()
+
+    def __init__(self, container):
+        with self._lock:
+            self.blobs = self._containers.setdefault(container, {})
+
+    def read(self, name):
+        return self.blobs.get(name)
+
+    def write(self, name, data):
+        with self._lock:
+            self.blobs[name] = data
+
+    def delete(self, name):
+        with self._lock:
+            return self.blobs.pop(name, None) is not None
+
+    def exists(self, name):
+        return name in self.blobs
+
+    @classmethod
+    def clear(cls, container=None):
+        with cls._lock:
+            for key, blobs in cls._containers.items():
+                if container is None or key == container:
+                    blobs.clear()
+
+
+class FileSystemBlobBackend:
+    """Blobs stored as plain files below ``location``"""
+
+    def __init__(self, location):
+        self.location = os.path.abspath(location)
+
+    def _path(self, name):
+        path = os.path.abspath(os.path.join(self.location, name))
+        if not path.startswith(self.location + os.sep):
+            raise ValueError(f"Blob name escapes the storage location: {name}")
+        return path
+
+    def read(self, name):
+        try:
+            with open(self._path(name), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, name, data):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, name):
+        try:
+            os.remove(self._path(name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def exists(self, name):
+        return os.path.isfile(self._path(name))
+
+
+class EmulatedDownload:
+    def __init__(self, data):
+        self.data = data
+
+    def readall(self):
+        return self.data
+
+
+class EmulatedBlobClient:
+    """Implements the subset of ``azure.storage.blob.BlobClient`` we call"""
+
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    @property
+    def url(self):
+        return f"{self.container.base_url}{quote(self.name)}"
+
+    def upload_blob(self, data, overwrite=False, **kwargs):
+        self.container.simulate('save', kwargs)
+        payload = data.read() if hasattr(data, 'read') else data
+        if isinstance(payload, str):
+            payload = payload.encode()
+        self.container.backend.write(self.name, bytes(payload))
+
+    def download_blob(self, **kwargs):
+        self.container.simulate('open', kwargs)
+        data = self.container.backend.read(self.name)
+        if data is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return EmulatedDownload(data)
+
+    def delete_blob(self, **kwargs):
+        self.container.simulate('delete', kwargs)
+        if not self.container.backend.delete(self.name):
+            raise ResourceNotFoundError("The specified blob does not exist.")
+
+    def get_blob_properties(self, **kwargs):
+        self.container.simulate('exists', kwargs)
+        data = self.container.backend.read(self.name)
+        if data is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return {'name': self.name, 'size': len(data)}
+
+
+class EmulatedContainerClient:
+    """
+    Stand-in for ``ContainerClient`` with injectable latency and failures.
+
+    Each call sleeps for ``latency`` plus up to ``jitter`` seconds. When that
+    exceeds the read timeout the storage passed in, the call sleeps for the
+    timeout and fails like a real socket timeout would. Independently, a call
+    fails with a transient error with probability ``failure_rate``.
+    """
+
+    def __init__(self, backend, base_url, latency=0, jitter=0, failure_rate=0,
+                 failing_operations=None, seed=None):
+        self.backend = backend
+        self.base_url = base_url
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failing_operations = set(failing_operations or ['save', 'open', 'delete', 'exists'])
+        self.random = random.Random(seed)
+
+    def get_blob_client(self, name):
+        return EmulatedBlobClient(self, name)
+
+    def simulate(self, operation, kwargs):
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        timeout = kwargs.get('read_timeout')
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise ServiceResponseError(f"Emulated read timeout after {timeout}s during {operation}")
+        if delay:
+            time.sleep(delay)
+        if operation in self.failing_operations and self.random.random() < self.failure_rate:
+            raise ServiceRequestError(f"Emulated storage failure during {operation}")
+
+
+class EmulatedBlobStorage(AzureBlobStorage):
+    """
+    Runs the real ``AzureBlobStorage`` code paths (error mapping, retries,
+    circuit breaker) against a local backend instead of the Azure SDK client.
+    """
+
+    def __init__(self, backend, account_url, container='media', base_url=None, latency=0,
+                 jitter=0, failure_rate=0, failing_operations=None, seed=None):
+        self.account_url = account_url
+        self.sas_token = ''
+        self.container = container
+        self.policy = get_policy((self.account_url, self.container))
+        self.container_client = EmulatedContainerClient(
+            backend,
+            base_url or f"{settings.MEDIA_URL.rstrip('/')}/{container}/",
+            latency=latency,
+            jitter=jitter,
+            failure_rate=failure_rate,
+            failing_operations=failing_operations,
+            seed=seed,
+        )
+        self.client = None
+
+
+@deconstructible
+class InMemoryBlobStorage(EmulatedBlobStorage):
+    def __init__(self, container='media', **options):
+        super().__init__(
+            MemoryBlobBackend(container),
+            account_url='memory://',
+            container=container,
+            **options
+        )
+
+
+@deconstructible
+class LocalBlobStorage(EmulatedBlobStorage):
+    def __init__(self, location=None, container='media', **options):
+        if location is None:
+            # Under MEDIA_ROOT so the dev server's media route can serve the files.
+            location = os.path.join(settings.MEDIA_ROOT, 'blobs')
+            options.setdefault('base_url', f"{settings.MEDIA_URL.rstrip('/')}/blobs/{container}/")
+        super().__init__(
+            FileSystemBlobBackend(os.path.join(location, container)),
+            account_url=f"file://{os.path.abspath(location)}",
+            container=container,
+            **options
+        )
@@ -0,0 +1,228 @@
+import random
+import threading
+import time
+
+from django.conf import settings
+
+
+DEFAULT_TIMEOUTS = {
+    'connect': 5,
+    'save': 60,
+    'open': 30,
+    'delete': 10,
+    'exists': 5,
+}
+
+DEFAULT_RETRY = {
+    'max_attempts': 3,
+    'base_delay': 0.2,
+    'max_delay': 2.0,
+    # Uploads always use overwrite=True and rewind the content, so repeating
+    # them is as safe as repeating a read.
+    'idempotent_operations': ['save', 'open', 'delete', 'exists'],
+}
+
+DEFAULT_CIRCUIT_BREAKER = {
+    'failure_threshold': 5,
+    'reset_timeout': 30,
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised without touching the network while the circuit is open."""
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, applied only to idempotent operations
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.2, max_delay=2.0, idempotent_operations=()):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idempotent_operations = set(idempotent_operations)
+
+    def attempts_for(self, operation):
+        if operation in self.idempotent_operations:
+            return self.max_attempts
+        return 1
+
+    def backoff(self, attempt):
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open breaker.
+
+    After ``failure_threshold`` consecutive transient failures the circuit opens
+    and every call fails fast for ``reset_timeout`` seconds. The first call after
+    that is let through as a probe; success closes the circuit, failure re-opens it.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self.open_count = 0
+        self.open_seconds = 0.0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        with self._lock:
+            state = self._current_state()
+            if state == self.OPEN:
+                raise CircuitOpenError("Storage circuit is open")
+            if state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError("Storage circuit is open")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self._state == self.OPEN:
+                self.open_seconds += self.clock() - self._opened_at
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            now = self.clock()
+            if self._state == self.OPEN:
+                if not self._probe_in_flight:
+                    # A call that started before the circuit opened; it must not
+                    # push the probe back.
+                    return
+                # Failed probe: account for the time spent open and start over.
+                self.open_seconds += now - self._opened_at
+                self._opened_at = now
+                self._probe_in_flight = False
+                return
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = now
+                self.open_count += 1
+
+    def total_open_seconds(self):
+        with self._lock:
+            total = self.open_seconds
+            if self._state == self.OPEN:
+                total += self.clock() - self._opened_at
+            return total
+
+
+class ResiliencePolicy:
+    """
+    Combines per-operation timeouts, retries and a circuit breaker, and keeps
+    counters so we can see how often each of them kicks in.
+    """
+
+    def __init__(self, timeouts=None, retry=None, circuit_breaker=None, sleep=time.sleep):
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.retry = RetryPolicy(**{**DEFAULT_RETRY, **(retry or {})})
+        self.breaker = CircuitBreaker(**{**DEFAULT_CIRCUIT_BREAKER, **(circuit_breaker or {})})
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.retries = {}
+        self.failures = {}
+        self.short_circuited = {}
+
+    def timeout_for(self, operation):
+        return self.timeouts.get(operation, self.timeouts['connect'])
+
+    def _incr(self, counter, operation):
+        with self._lock:
+            counter[operation] = counter.get(operation, 0) + 1
+
+    def call(self, operation, func, is_transient):
+        """
+        Run ``func`` under the policy. ``is_transient(exc)`` decides whether an
+        exception counts against the breaker and may be retried; anything else
+        is re-raised straight away.
+        """
+        self._incr(self.calls, operation)
+        attempts = self.retry.attempts_for(operation)
+
+        for attempt in range(1, attempts + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                self._incr(self.short_circuited, operation)
+                raise
+
+            try:
+                result = func()
+            except Exception as e:
+                if not is_transient(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                self._incr(self.failures, operation)
+                if attempt >= attempts:
+                    raise
+                self._incr(self.retries, operation)
+                self.sleep(self.retry.backoff(attempt))
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'circuit_state': self.breaker.state,
+                'circuit_open_count': self.breaker.open_count,
+                'circuit_open_seconds': round(self.breaker.total_open_seconds(), 3),
+                'calls': dict(self.calls),
+                'retries': dict(self.retries),
+                'failures': dict(self.failures),
+                'short_circuited': dict(self.short_circuited),
+            }
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def get_policy(key):
+    """
+    Return the shared policy for a storage account/container.
+
+    Every image model builds its own storage instance, so the breaker state
+    has to live at module level for all of them to trip together.
+    """
+    with _policies_lock:
+        if key not in _policies:
+            _policies[key] = ResiliencePolicy(
+                timeouts=getattr(settings, 'AZURE_STORAGE_TIMEOUTS', None),
+                retry=getattr(settings, 'AZURE_STORAGE_RETRY', None),
+                circuit_breaker=getattr(settings, 'AZURE_STORAGE_CIRCUIT_BREAKER', None),
+            )
+        return _policies[key]
+
+
+def all_policy_stats():
+    with _policies_lock:
+        return {key: policy.stats() for key, policy in _policies.items()}
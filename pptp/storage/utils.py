@@ -0,0 +1,12 @@
+def read_blob(storage, name):
+    """
+    Return the contents of ``name`` as bytes, or None if it does not exist.
+
+    ``AzureBlobStorage.open`` hands back the downloaded bytes directly while
+    Django's own storages return a File, so accept either.
+    """
+    data = storage.open(name)
+    if data is None or isinstance(data, bytes):
+        return data
+    with data:
+        return data.read()
@@ -0,0 +1,63 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_process_pool = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'PPTP_BACKGROUND_WORKERS', 2),
+                thread_name_prefix='pptp-background',
+            )
+        return _executor
+
+
+def get_process_pool():
+    """
+    Process pool for CPU-bound work such as barcode decoding. Uses spawn so
+    children don't inherit the web worker's threads and DB connections.
+    """
+    global _process_pool
+    with _executor_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'PPTP_PROCESS_POOL_WORKERS', 1),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _process_pool
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, '__name__', func))
+    finally:
+        close_old_connections()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Run ``func`` on a worker thread once the current transaction commits, so
+    the task sees the rows that scheduled it and a rollback cancels it.
+
+    With PPTP_BACKGROUND_TASKS_INLINE (used by the tests) the task runs in the
+    calling thread right after commit instead.
+    """
+    if getattr(settings, 'PPTP_BACKGROUND_TASKS_INLINE', False):
+        transaction.on_commit(lambda: func(*args, **kwargs))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run, func, args, kwargs))
@@ -0,0 +1,64 @@
+import io
+
+import pytest
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from pptp.models import Barcode, Product
+from pptp.models.products import get_image_storage
+from pptp.pagination import EstimatedCountPaginator
+from pptp.storage.local import MemoryBlobBackend
+from pptp.thumbnails import thumbnail_name
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def barcode():
+    MemoryBlobBackend.clear()
+    output = io.BytesIO()
+    Image.new('RGB', (1200, 800), 'white').save(output, format='JPEG')
+    product = Product.objects.create(product_name='Granola', source_batch='tds', manual_barcode='036000291452')
+    yield Barcode.objects.create(
+        product=product,
+        image=get_image_storage().save('barcode/large.jpg', ContentFile(output.getvalue())),
+    )
+    MemoryBlobBackend.clear()
+
+
+def test_changelist_filters_and_searches(admin_client, barcode):
+    Product.objects.create(product_name='Rye Bread', source_batch='2025_snapcan')
+    url = reverse('admin:pptp_product_changelist')
+
+    response = admin_client.get(url, {'source_batch__exact': 'tds'})
+    assert list(response.context['cl'].result_list) == [barcode.product]
+    assert response.context['cl'].result_list[0].get_deferred_fields() >= {'notes', 'package_size'}
+
+    # Any formatting of the GTIN finds the product
+    response = admin_client.get(url, {'q': '0 36000 29145 2'})
+    assert list(response.context['cl'].result_list) == [barcode.product]
+
+
+def test_estimated_paginator_skips_count_for_large_results(barcode):
+    paginator = EstimatedCountPaginator(Product.objects.order_by('pk'), 50)
+    assert paginator.count == 1
+
+    paginator = EstimatedCountPaginator(Product.objects.order_by('pk'), 50)
+    paginator.exact_threshold = 0
+    with CaptureQueriesContext(connection) as queries:
+        paginator.count
+    assert [query['sql'].split()[0] for query in queries] == ['EXPLAIN']
+
+
+def test_thumbnail_is_small_and_stored(admin_client, barcode):
+    response = admin_client.get(reverse('admin:pptp_product_thumbnail', args=[barcode.pk]))
+    assert response['Content-Type'] == 'image/jpeg'
+    with Image.open(io.BytesIO(response.content)) as image:
+        assert max(image.size) == 160
+    assert get_image_storage().exists(thumbnail_name(barcode.image.name))
+
+    change = admin_client.get(reverse('admin:pptp_product_change', args=[barcode.product.pk]))
+    assert b'loading="lazy"' in change.content
@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pptp.models import Product
+
+np = pytest.importorskip('numpy')
+
+from pptp.analytics import build_report, get_report  # noqa: E402
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def products():
+    cache.clear()
+    Product.objects.create(
+        product_name='Energy Drink', source_batch='2025_supp_food', primary_package_material='metal',
+        has_general_health_claim=True, has_supplemental_caution_id=True,
+    )
+    Product.objects.create(
+        product_name='Protein Bar', source_batch='2025_supp_food', primary_package_material='plastic_pp',
+        has_general_health_claim=True,
+    )
+    Product.objects.create(product_name='Frozen Peas', storage_condition='freezer', primary_package_material='plastic_ldpe')
+    yield
+    cache.clear()
+
+
+def test_cooccurrence_and_crosstab(products):
+    report = build_report()
+    assert report['total'] == 3
+
+    fields = report['claims']['fields']
+    matrix = np.array(report['claims']['cooccurrence'])
+    health, caution = fields.index('has_general_health_claim'), fields.index('has_supplemental_caution_id')
+    assert matrix[health, health] == 2
+    assert matrix[health, caution] == matrix[caution, health] == 1
+    assert matrix.sum() == 2 + 1 + 1 + 1
+
+    packaging = report['packaging']
+    batches = {batch['label']: np.array(batch['counts']) for batch in packaging['batches']}
+    assert set(batches) == {'2025 Supplemented Food Collection', '-'}
+    freezer, ldpe = packaging['storage'].index('Freezer'), packaging['materials'].index('Plastic - LDPE - 4')
+    assert batches['-'][freezer, ldpe] == 1
+    assert batches['2025 Supplemented Food Collection'].sum() == 2
+
+
+def test_report_is_cached_until_products_change(products):
+    get_report()
+    with CaptureQueriesContext(connection) as queries:
+        assert get_report()['total'] == 3
+    # Only the version lookups, not the report query
+    assert len(queries) == 2
+
+    Product.objects.create(product_name='Rye Bread', source_batch='tds')
+    assert get_report()['total'] == 4
+
+
+def test_report_view_is_staff_only(client, admin_user, django_user_model, products):
+    url = reverse('products:analytics_report')
+    client.force_login(django_user_model.objects.create_user(email='collector@example.com', password='x'))
+    assert client.get(url).status_code == 302
+
+    client.force_login(admin_user)
+    assert client.get(url, {'format': 'json'}).json()['total'] == 3
+    assert b'Claim co-occurrence' in client.get(url).content
@@ -0,0 +1,69 @@
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pptp.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product(user):
+    return Product.objects.create(product_name='Oat Milk', created_by_user=user, created_by=user.email)
+
+
+def patch(client, url, changes):
+    return client.patch(url, json.dumps(changes), content_type='application/json')
+
+
+def test_autosave_writes_only_the_changed_fields(client, user, product):
+    client.force_login(user)
+    url = reverse('products:autosave_product', args=[product.pk])
+    with CaptureQueriesContext(connection) as queries:
+        response = patch(client, url, {'package_size': '1.5', 'package_size_unit': 'L', 'is_variety_pack': True})
+    data = response.json()
+    assert data['success'] is True
+    assert data['saved'] == ['is_variety_pack', 'package_size', 'package_size_unit']
+    assert data['valid'] is False
+    assert 'At least one barcode image is required' in data['validation_errors']
+
+    updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "pptp_product"')]
+    assert len(updates) == 1
+    assert '"product_name"' not in updates[0]
+
+    product.refresh_from_db()
+    assert (product.package_size, product.package_quantity, product.is_variety_pack) == (
+        Decimal('1.5'), Decimal('1500'), True,
+    )
+
+
+def test_invalid_fields_are_reported_and_not_saved(client, user, product):
+    client.force_login(user)
+    url = reverse('products:autosave_product', args=[product.pk])
+    data = patch(client, url, {'product_name': 'Milk', 'storage_condition': 'attic', 'notes': 'Dented', 'pk': 1}).json()
+    assert data['success'] is False
+    assert data['saved'] == ['notes']
+    assert set(data['errors']) == {'product_name', 'storage_condition', 'pk'}
+
+    product.refresh_from_db()
+    assert (product.product_name, product.storage_condition, product.notes) == ('Oat Milk', 'shelf_stable', 'Dented')
+
+    assert client.patch(url, 'not json', content_type='application/json').status_code == 400
+    assert client.post(url).status_code == 405
+
+
+def test_draft_autosave_creates_the_draft_once(client, user):
+    client.force_login(user)
+    url = reverse('products:autosave_draft', args=[uuid.uuid4()])
+    data = patch(client, url, {'product_name': 'Oat Milk'}).json()
+    product = Product.objects.get()
+    assert product.product_name == 'Oat Milk'
+    assert data['autosave_url'] == reverse('products:autosave_product', args=[product.pk])
+
+    patch(client, url, {'notes': 'Dented'})
+    assert Product.objects.get().notes == 'Dented'
@@ -0,0 +1,164 @@
+import io
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image, ImageDraw
+
+from pptp.barcodes import (
+    FIRST_DIGIT_PARITY,
+    G_RUNS,
+    L_RUNS,
+    decode_image_bytes,
+    gtin_check_digit,
+    normalize_gtin,
+)
+from pptp.barcode_index import MAX_MATCHES, cache_key
+from pptp.models import Barcode, Product
+
+
+@pytest.fixture(autouse=True)
+def lookups():
+    # Tests roll back, so the on-commit invalidation never runs
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def ean13_modules(number):
+    parity = {digit: pattern for pattern, digit in FIRST_DIGIT_PARITY.items()}[int(number[0])]
+    modules = [1, 0, 1]
+    for index, char in enumerate(number[1:7]):
+        runs = (L_RUNS if parity[index] == 'L' else G_RUNS)[int(char)]
+        for position, width in enumerate(runs):
+            modules += [position % 2] * width
+    modules += [0, 1, 0, 1, 0]
+    for char in number[7:]:
+        for position, width in enumerate(L_RUNS[int(char)]):
+            modules += [1 - position % 2] * width
+    modules += [1, 0, 1]
+    return modules
+
+
+def render_barcode(number, module_px=3, rotate=0):
+    modules = ean13_modules(number)
+    quiet = 12 * module_px
+    image = Image.new('L', (len(modules) * module_px + quiet * 2, 120), 255)
+    draw = ImageDraw.Draw(image)
+    for index, bar in enumerate(modules):
+        if bar:
+            x = quiet + index * module_px
+            draw.rectangle([x, 10, x + module_px - 1, 110], fill=0)
+    image = image.rotate(rotate, expand=True, fillcolor=255)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_check_digit():
+    assert gtin_check_digit('400638133393') == '1'
+    assert gtin_check_digit('03600029145') == '2'
+
+
+def test_upc_a_and_ean13_normalise_to_the_same_key():
+    assert normalize_gtin('036000291452') == normalize_gtin('0036000291452') == '00036000291452'
+    assert normalize_gtin(' 4006381333931 ') == '04006381333931'
+    assert normalize_gtin('036000291453') == ''
+    assert normalize_gtin('03600029') == ''
+    assert normalize_gtin('') == ''
+
+
+@pytest.mark.parametrize('rotate', [0, 90, 180])
+def test_decodes_rendered_ean13(rotate):
+    result, elapsed_ms = decode_image_bytes(render_barcode('4006381333931', rotate=rotate))
+    assert result.number == '4006381333931'
+    assert result.symbology == 'EAN13'
+    assert result.confidence > 0.5
+    assert elapsed_ms >= 0
+
+
+def test_upc_a_is_reported_with_twelve_digits():
+    result, _ = decode_image_bytes(render_barcode('0036000291452'))
+    assert result.number == '036000291452'
+    assert result.symbology == 'UPCA'
+
+
+def test_blank_image_is_not_decoded():
+    buffer = io.BytesIO()
+    Image.new('L', (200, 100), 255).save(buffer, format='PNG')
+    assert decode_image_bytes(buffer.getvalue())[0] is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_uploaded_barcode_is_decoded_in_background():
+    product = Product.objects.create(product_name='Test Product')
+    barcode = Barcode.objects.create(
+        product=product,
+        image=SimpleUploadedFile('barcode.png', render_barcode('4006381333931'), content_type='image/png'),
+    )
+    barcode.refresh_from_db()
+    assert barcode.barcode_number == '4006381333931'
+    assert barcode.decoded_at is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_decode_barcodes_command_keeps_manual_numbers():
+    product = Product.objects.create(product_name='Test Product')
+    barcode = Barcode.objects.create(
+        product=product,
+        barcode_number='123',
+        image=SimpleUploadedFile('barcode.png', render_barcode('4006381333931'), content_type='image/png'),
+    )
+
+    call_command('decode_barcodes', '--all', '--workers=1', stdout=StringIO())
+
+    barcode.refresh_from_db()
+    assert barcode.barcode_number == '123'
+    assert barcode.decode_confidence > 0.5
+
+
+@pytest.mark.django_db
+def test_barcode_lookup_matches_typed_and_decoded_numbers(client, user, django_capture_on_commit_callbacks):
+    typed = Product.objects.create(product_name='Typed', manual_barcode='036000291452', source_batch='tds')
+    photographed = Product.objects.create(product_name='Photographed', source_batch='tds')
+    Product.objects.create(product_name='Other batch', manual_barcode='036000291452', source_batch='2025_snapcan')
+    url = reverse('products:barcode_lookup')
+    client.force_login(user)
+
+    response = client.get(url, {'code': '0036000291452', 'batch': 'tds', 'exclude': typed.pk})
+    assert response.json() == {'code': '00036000291452', 'valid': True, 'matches': []}
+
+    # Cached empty result is dropped once a matching barcode is committed
+    with django_capture_on_commit_callbacks() as callbacks:
+        barcode = Barcode(product=photographed, barcode_number='0036000291452', image='barcode/a.png')
+        barcode.save()
+        assert cache.get(cache_key('00036000291452')) is not None
+    for callback in callbacks:
+        callback()
+    response = client.get(url, {'code': '0036000291452', 'batch': 'tds'})
+    matches = {match['product_name']: match['matched_on'] for match in response.json()['matches']}
+    assert matches == {'Typed': ['manual_barcode'], 'Photographed': ['barcode_photo']}
+
+    assert client.get(url, {'code': '03600029'}).json()['valid'] is False
+
+
+@pytest.mark.django_db
+def test_barcode_lookup_filters_by_batch_before_truncating(client, user):
+    wanted = Product.objects.create(product_name='Oldest', manual_barcode='036000291452', source_batch='tds')
+    Product.objects.bulk_create([
+        Product(product_name=f'Can {index}', manual_barcode='036000291452', normalized_barcode='00036000291452',
+                source_batch='2025_snapcan')
+        for index in range(MAX_MATCHES + 5)
+    ])
+    client.force_login(user)
+    url = reverse('products:barcode_lookup')
+
+    matches = client.get(url, {'code': '036000291452'}).json()['matches']
+    assert len(matches) == MAX_MATCHES
+    assert 'created_by' not in matches[0]
+
+    matches = client.get(url, {'code': '036000291452', 'batch': 'tds'}).json()['matches']
+    assert [match['id'] for match in matches] == [wanted.pk]
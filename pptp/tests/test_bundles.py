@@ -0,0 +1,75 @@
+import csv
+import io
+import zipfile
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from pptp.bundles import bundle_entries, stream_zip
+from pptp.models import Barcode, Product, ProductImage
+from pptp.models.products import get_image_storage
+from pptp.storage.local import MemoryBlobBackend
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def batch_products():
+    MemoryBlobBackend.clear()
+    storage = get_image_storage()
+    product = Product.objects.create(product_name='Protein Bar', source_batch='2025_supp_food')
+    other = Product.objects.create(product_name='Frozen Lasagna', source_batch='2025_frozen_entrees')
+    Barcode.objects.create(product=product, image=storage.save('barcode/a.jpg', ContentFile(b'barcode-bytes')))
+    ProductImage.objects.create(
+        product=product, image_type='front', image=storage.save('productimage/f.jpg', ContentFile(b'front-bytes'))
+    )
+    # Row whose blob has gone missing from storage
+    ProductImage.objects.create(product=product, image_type='back', image='productimage/gone.jpg')
+    ProductImage.objects.create(
+        product=other, image_type='front', image=storage.save('productimage/o.jpg', ContentFile(b'other'))
+    )
+    yield product
+    MemoryBlobBackend.clear()
+
+
+def read_zip(data):
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    manifest = list(csv.DictReader(io.StringIO(archive.read('manifest.csv').decode())))
+    return archive, manifest
+
+
+def test_zip_is_streamed_entry_by_entry(batch_products):
+    entries = bundle_entries(Product.objects.filter(source_batch='2025_supp_food'))
+    chunks = list(stream_zip(entries, get_image_storage(), prefetch=2))
+    # One chunk per stored photo, then the manifest and central directory
+    assert len(chunks) == 3
+
+    archive, manifest = read_zip(b''.join(chunks))
+    pk = batch_products.pk
+    barcode = Barcode.objects.get(product=batch_products)
+    assert archive.read(f'{pk}/barcode/{barcode.pk}_a.jpg') == b'barcode-bytes'
+    assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist()[:-1])
+    assert [row['status'] for row in manifest] == ['ok', 'ok', 'missing']
+    assert len(archive.namelist()) == 3
+
+
+def test_export_images_endpoint(client, admin_user, batch_products):
+    client.force_login(admin_user)
+    url = reverse('products:export_images')
+
+    response = client.get(url, {'products': str(batch_products.pk)})
+    assert response['Content-Type'] == 'application/zip'
+    archive, manifest = read_zip(b''.join(response.streaming_content))
+    assert {row['product_name'] for row in manifest} == {'Protein Bar'}
+
+    assert client.get(url).status_code == 400
+
+
+def test_export_images_command(tmp_path, batch_products):
+    output = tmp_path / 'bundle.zip'
+    call_command('export_images', str(output), '--batch=2025_frozen_entrees', stdout=StringIO())
+    archive, manifest = read_zip(output.read_bytes())
+    assert [row['status'] for row in manifest] == ['ok']
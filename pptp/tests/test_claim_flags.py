@@ -0,0 +1,54 @@
+import pytest
+
+from pptp.forms.products import ProductFilterForm
+from pptp.models import Product
+from pptp.models.products import FLAG_BITS, flag_mask
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def products():
+    return {
+        'probiotic': Product.objects.create(product_name='Probiotic Yogurt', has_probiotic_claim=True),
+        'cautioned': Product.objects.create(
+            product_name='Energy Drink', has_general_health_claim=True, has_supplemental_caution_id=True,
+        ),
+        'both': Product.objects.create(
+            product_name='Protein Bar', has_probiotic_claim=True, has_general_health_claim=True,
+            has_multiple_barcodes=True,
+        ),
+        'plain': Product.objects.create(product_name='Rye Bread'),
+    }
+
+
+def names(queryset):
+    return sorted(queryset.values_list('product_name', flat=True))
+
+
+def test_bitmask_follows_the_flag_columns(products):
+    both = Product.objects.get(pk=products['both'].pk)
+    assert both.claim_flags == flag_mask(['has_probiotic_claim', 'has_general_health_claim', 'has_multiple_barcodes'])
+    assert Product.objects.get(pk=products['plain'].pk).claim_flags == 0
+
+    Product.objects.filter(pk=both.pk).update(has_probiotic_claim=False)
+    both.refresh_from_db()
+    assert both.claim_flags & FLAG_BITS['has_probiotic_claim'] == 0
+
+    with pytest.raises(ValueError):
+        flag_mask(['is_offline'])
+
+
+def test_any_all_and_none_of(products):
+    health = ['has_probiotic_claim', 'has_general_health_claim']
+    assert names(Product.objects.with_flags(any_of=health)) == ['Energy Drink', 'Probiotic Yogurt', 'Protein Bar']
+    assert names(Product.objects.with_flags(all_of=health)) == ['Protein Bar']
+    assert names(Product.objects.with_flags(any_of=health, none_of=['has_supplemental_caution_id'])) == [
+        'Probiotic Yogurt', 'Protein Bar',
+    ]
+    assert names(Product.objects.with_flags(none_of=health)) == ['Rye Bread']
+
+
+def test_filter_form_uses_the_bitmask(products):
+    form = ProductFilterForm({'any_claims': ['has_general_health_claim'], 'flags': ['has_multiple_barcodes']})
+    assert names(form.filter(Product.objects.all())) == ['Protein Bar']
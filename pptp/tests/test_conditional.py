@@ -0,0 +1,83 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pptp.duplicates import compute_image_hash
+from pptp.models import NutritionFacts, Photo, Product
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product(user):
+    return Product.objects.create(product_name='Oat Milk', created_by_user=user, created_by=user.email)
+
+
+def revalidate(client, url, etag):
+    return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+def test_unchanged_product_is_not_modified(client, user, product):
+    client.force_login(user)
+    url = reverse('products:validate_product', args=[product.pk])
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'no-cache' in response['Cache-Control']
+    assert response['Last-Modified']
+    etag = response['ETag']
+
+    with CaptureQueriesContext(connection) as queries:
+        response = revalidate(client, url, etag)
+    assert response.status_code == 304
+    # Session, user and the product's version; no context is built
+    assert len([query for query in queries if 'SAVEPOINT' not in query['sql']]) == 3
+
+    client.patch(
+        reverse('products:autosave_product', args=[product.pk]),
+        json.dumps({'notes': 'Dented'}), content_type='application/json',
+    )
+    response = revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+def test_edit_page_is_never_answered_with_304(client, user, product):
+    # Its CSRF token, language and messages are not covered by the product's version
+    client.force_login(user)
+    url = reverse('products:combined_upload_edit', args=[product.pk])
+    etag = client.get(reverse('products:validate_product', args=[product.pk]))['ETag']
+    response = revalidate(client, url, etag)
+    assert response.status_code == 200
+    assert not response.has_header('ETag')
+
+
+def test_photo_changes_move_the_etag(client, user, product):
+    client.force_login(user)
+    url = reverse('products:validate_product', args=[product.pk])
+    etags = [client.get(url)['ETag']]
+
+    photo = NutritionFacts.objects.create(product=product, image='nutritionfacts/a.png')
+    etags.append(client.get(url)['ETag'])
+    # Saves that leave the counters alone still count
+    Photo.objects.filter(pk=photo.pk).get().save(update_fields=['notes'])
+    etags.append(client.get(url)['ETag'])
+    photo.delete()
+    etags.append(client.get(url)['ETag'])
+    assert len(set(etags)) == 4
+
+    product.refresh_from_db()
+    assert product.image_version == 3
+    # Full saves never write back a stale version
+    Product.objects.get(pk=product.pk).save()
+    product.refresh_from_db()
+    assert product.image_version == 3
+
+
+def test_missing_image_hash_does_not_touch_the_product(product):
+    photo = NutritionFacts.objects.create(product=product, image='')
+    version = Product.objects.values_list('image_version', flat=True).get(pk=product.pk)
+    assert compute_image_hash(Photo, photo.pk) is None
+    assert Product.objects.values_list('image_version', flat=True).get(pk=product.pk) == version
@@ -0,0 +1,156 @@
+import io
+import uuid
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from pptp import drafts
+from pptp.drafts import reap_drafts
+from pptp.models import BatchProgress, Photo, Product
+from pptp.models.products import get_image_storage
+from pptp.storage.azure import AzureBlobStorageError
+from pptp.storage.local import MemoryBlobBackend
+from pptp.views import products as product_views
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def blobs():
+    MemoryBlobBackend.clear()
+    yield
+    MemoryBlobBackend.clear()
+
+
+def png(name='front.png'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def upload(client, token):
+    return client.post(
+        reverse('products:ajax_upload_draft', args=[token]), {'file': png(), 'image_type': 'front'}
+    ).json()
+
+
+def age(product, days):
+    Product.objects.filter(pk=product.pk).update(updated_at=timezone.now() - timedelta(days=days))
+
+
+def test_new_submission_page_creates_nothing(client, user):
+    client.force_login(user)
+    response = client.get(reverse('products:combined_upload_new'))
+    assert response.status_code == 200
+    assert response.context['draft_token']
+    assert not Product.objects.exists()
+
+
+def test_first_upload_creates_the_draft_and_later_ones_reuse_it(client, user):
+    client.force_login(user)
+    token = uuid.uuid4()
+    first = upload(client, token)
+    product = Product.objects.get()
+    assert first['success'] is True
+    assert first['product_id'] == product.pk
+    assert first['edit_url'] == reverse('products:combined_upload_edit', args=[product.pk])
+    assert (product.draft_token, product.created_by_user) == (token, user)
+
+    assert upload(client, token)['product_id'] == product.pk
+    assert Photo.objects.filter(product=product).count() == 2
+
+    # Saving the form adopts the draft instead of creating another product
+    response = client.post(reverse('products:combined_upload_new'), {
+        'draft_token': str(token),
+        'product_name': 'Oat Milk',
+        'package_size': '1',
+        'package_size_unit': 'L',
+        'storage_condition': 'fridge',
+        'primary_package_material': 'paper',
+        'source_batch': 'tds',
+    })
+    assert response.status_code == 302
+    assert Product.objects.get().product_name == 'Oat Milk'
+
+
+def test_failed_first_upload_leaves_no_draft(client, user, monkeypatch):
+    client.force_login(user)
+
+    # Fails after the rows are written, e.g. while building the photo's URL
+    def store_upload(request, product):
+        Photo.objects.create(product=product, kind='front', image=request.FILES['file'])
+        raise AzureBlobStorageError("Failed to generate a URL")
+    monkeypatch.setattr(product_views, 'store_upload', store_upload)
+
+    data = upload(client, uuid.uuid4())
+    assert data['success'] is False
+    assert not Product.objects.exists()
+
+
+def test_reaper_deletes_old_empty_drafts_and_their_blobs(client, user, django_capture_on_commit_callbacks):
+    client.force_login(user)
+    with django_capture_on_commit_callbacks(execute=True):
+        upload(client, uuid.uuid4())
+        abandoned = Product.objects.get()
+        name = Photo.objects.get(product=abandoned).image.name
+        named = Product.objects.create(product_name='Oat Milk')
+        recent = Product.objects.create(product_name='')
+    for product in (abandoned, named):
+        age(product, 30)
+    storage = get_image_storage()
+    assert storage.exists(name)
+
+    assert reap_drafts(dry_run=True, with_photos=True) == (1, 1, [])
+    assert Product.objects.count() == 3
+
+    out = StringIO()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('reap_drafts', '--chunk-size=1', '--with-photos', stdout=out)
+    assert 'Deleted 1 abandoned drafts with 1 photos.' in out.getvalue()
+    assert set(Product.objects.values_list('pk', flat=True)) == {named.pk, recent.pk}
+    assert not Photo.objects.exists()
+    assert not storage.exists(name)
+    assert sum(BatchProgress.objects.values_list('product_count', flat=True)) == 2
+
+    age(recent, 3)
+    call_command('reap_drafts', '--older-than-days=2', stdout=StringIO())
+    assert list(Product.objects.values_list('pk', flat=True)) == [named.pk]
+
+
+def test_reaper_spares_a_draft_touched_before_the_delete(client, user, monkeypatch):
+    client.force_login(user)
+    upload(client, uuid.uuid4())
+    draft = Product.objects.get()
+    name = Photo.objects.get(product=draft).image.name
+    age(draft, 30)
+
+    # A collector uploads between the reaper's scan and its delete
+    def atomic():
+        age(draft, 0)
+        return transaction.atomic()
+    monkeypatch.setattr(drafts, 'transaction', SimpleNamespace(atomic=atomic))
+
+    assert reap_drafts(with_photos=True) == (0, 0, [])
+    assert Product.objects.filter(pk=draft.pk).exists()
+    assert get_image_storage().exists(name)
+
+
+def test_reaper_keeps_unnamed_drafts_with_photos(client, user):
+    client.force_login(user)
+    upload(client, uuid.uuid4())
+    photographed = Product.objects.get()
+    empty = Product.objects.create(product_name='')
+    for product in (photographed, empty):
+        age(product, 30)
+
+    assert reap_drafts() == (1, 0, [])
+    assert list(Product.objects.values_list('pk', flat=True)) == [photographed.pk]
+    assert Photo.objects.filter(product=photographed).exists()
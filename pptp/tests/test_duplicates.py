@@ -0,0 +1,78 @@
+import io
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from PIL import Image
+
+from pptp.duplicates import HashIndex, candidate_filter, find_duplicates_for_product, hamming, split_hash
+from pptp.models import Barcode, Product, ProductImage
+
+
+def make_photo(name, shade=0, size=(64, 48)):
+    image = Image.new('L', size)
+    image.putdata([(x * 4 + y * 2 + shade) % 256 for y in range(size[1]) for x in range(size[0])])
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def test_hash_index_finds_hashes_within_distance():
+    index = HashIndex()
+    base = 0x0123456789ABCDEF
+    index.add('same', base)
+    index.add('close', base ^ 0b101)
+    index.add('far', ~base)
+
+    assert [key for _, key in index.query(base, 6)] == ['same', 'close']
+    assert hamming(base, base ^ 0b101) == 2
+
+
+def test_candidate_filter_covers_all_chunks():
+    query = candidate_filter([0xFFFF], max_distance=4)
+    assert len(query.children) == 4
+    assert split_hash(0xFFFF) == (0xFFFF, 0, 0, 0)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_duplicate_photos_across_products_are_found(client, user):
+    first = Product.objects.create(product_name='Honey Nut Cheerios', source_batch='tds')
+    second = Product.objects.create(product_name='Honey Nut Cheerios Again', source_batch='tds')
+    other = Product.objects.create(product_name='Diet Coke Cherry', source_batch='tds')
+
+    ProductImage.objects.create(product=first, image=make_photo('front.png'), image_type='front')
+    duplicate = ProductImage.objects.create(product=second, image=make_photo('front2.png', shade=1), image_type='front')
+    Barcode.objects.create(product=other, image=make_photo('barcode.png', size=(48, 64)))
+
+    duplicate.refresh_from_db()
+    assert duplicate.phash is not None
+
+    matches = find_duplicates_for_product(second)
+    assert list(matches) == [duplicate]
+    assert [match.product for _, match in matches[duplicate]] == [first]
+
+    out = StringIO()
+    call_command('duplicate_images_report', batch='tds', stdout=out, stderr=StringIO())
+    rows = out.getvalue().strip().splitlines()
+    assert len(rows) == 2
+
+    client.force_login(user)
+    response = client.get(reverse('products:combined_upload_edit', kwargs={'pk': second.pk}))
+    assert 'Possible Duplicate Photos' in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_hash_command_works_through_the_backlog_in_windows(settings):
+    settings.PPTP_BACKGROUND_TASKS_INLINE = False
+    product = Product.objects.create(product_name='Honey Nut Cheerios', source_batch='tds')
+    ProductImage.objects.bulk_create([
+        ProductImage(product=product, image=make_photo(f'front{index}.png', shade=index), kind='front')
+        for index in range(6)
+    ])
+
+    out = StringIO()
+    call_command('compute_image_hashes', '--workers=1', stdout=out)
+    assert 'Hashed 6 images.' in out.getvalue()
+    assert not ProductImage.objects.filter(phash__isnull=True).exists()
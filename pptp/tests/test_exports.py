@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from pptp.exports import export_queryset, export_rows
+from pptp.models import Barcode, Product, ProductImage
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def products():
+    first = Product.objects.create(product_name='First Product', source_batch='tds')
+    second = Product.objects.create(product_name='Second Product', source_batch='2025_snapcan')
+    Barcode.objects.create(product=first, barcode_number='4006381333931', image='barcode/first.png')
+    ProductImage.objects.create(product=first, image_type='front', image='productimage/front.png')
+    ProductImage.objects.create(product=second, image_type='back', image='productimage/back.png')
+    return first, second
+
+
+def test_rows_are_prefetched_per_chunk(products):
+    with CaptureQueriesContext(connection) as queries:
+        rows = list(export_rows(export_queryset(), chunk_size=1))
+    # One streamed product query, plus one query per image table for each chunk
+    assert len(queries) == 1 + 2
+    assert rows[0]['barcode_blobs'] == ['barcode/first.png']
+    assert rows[0]['decoded_barcodes'] == ['4006381333931']
+    assert rows[1]['product_image_count'] == 1
+
+
+def test_export_command_writes_csv(products):
+    out = io.StringIO()
+    call_command('export_products', '--batch=tds', stdout=out, stderr=io.StringIO())
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row['product_name'] for row in rows] == ['First Product']
+    assert rows[0]['product_image_blobs'] == 'productimage/front.png'
+    assert rows[0]['barcode_count'] == '1'
+
+
+def test_export_endpoint_streams_jsonl(client, admin_user, products):
+    client.force_login(admin_user)
+    url = reverse('products:export_products')
+    tomorrow = (timezone.now() + timedelta(days=1)).date()
+
+    response = client.get(url, {'format': 'jsonl', 'until': tomorrow.isoformat()})
+    assert response.streaming
+    lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+    assert [line['product_name'] for line in lines] == ['First Product', 'Second Product']
+
+    response = client.get(url, {'since': tomorrow.isoformat()})
+    assert b''.join(response.streaming_content).decode().count('\n') == 1
+    assert client.get(url, {'since': '2025-02-01', 'until': '2025-01-01'}).status_code == 400
+
+
+def test_date_filters_are_half_open_datetime_ranges(products):
+    first, second = products
+    day = timezone.localdate()
+    midnight = timezone.make_aware(datetime.combine(day, time.min))
+    Product.objects.filter(pk=first.pk).update(created_at=midnight - timedelta(microseconds=1))
+    Product.objects.filter(pk=second.pk).update(created_at=midnight)
+
+    queryset = export_queryset(since=day.isoformat(), until=day)
+    assert [product.pk for product in queryset] == [second.pk]
+    assert list(export_queryset(until=day - timedelta(days=1))) == [first]
+    # The created_at column is compared directly, not cast to a date
+    assert '::date' not in str(queryset.query)
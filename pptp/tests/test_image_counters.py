@@ -0,0 +1,66 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from pptp.models import Barcode, Product, ProductImage
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product():
+    return Product.objects.create(product_name='Granola', source_batch='2025_snapcan')
+
+
+def test_counters_follow_image_rows(product):
+    barcode = Barcode.objects.create(product=product, image='barcode/a.png')
+    Barcode.objects.create(product=product, image='barcode/b.png')
+    ProductImage.objects.create(product=product, image='productimage/front.png', image_type='front')
+
+    product.refresh_from_db()
+    assert (product.barcode_count, product.front_image_count, product.back_image_count) == (2, 1, 0)
+    assert Product.objects.with_photos().get() == product
+
+    barcode.delete()
+    product.refresh_from_db()
+    assert product.barcode_count == 1
+
+
+def test_changing_a_photos_kind_moves_its_count(product):
+    image = ProductImage.objects.create(product=product, image='productimage/front.png', image_type='front')
+    image.image_type = 'back'
+    image.save()
+    # Loaded with the kind deferred, the old kind is read before saving
+    image = ProductImage.objects.defer('kind').get(pk=image.pk)
+    image.image_type = 'side'
+    image.save()
+
+    product.refresh_from_db()
+    assert (product.front_image_count, product.back_image_count, product.side_image_count) == (0, 0, 1)
+
+
+def test_saving_a_stale_product_keeps_counters(product):
+    stale = Product.objects.get(pk=product.pk)
+    Barcode.objects.create(product=product, image='barcode/a.png')
+
+    stale.product_name = 'Maple Granola'
+    stale.save()
+
+    product.refresh_from_db()
+    assert product.product_name == 'Maple Granola'
+    assert product.barcode_count == 1
+
+
+def test_repair_command_fixes_drift(product):
+    Barcode.objects.create(product=product, image='barcode/a.png')
+    Product.objects.filter(pk=product.pk).update(barcode_count=5, other_image_count=2)
+
+    out = StringIO()
+    call_command('repair_image_counters', '--dry-run', stdout=out)
+    assert 'barcode_count 5 -> 1' in out.getvalue()
+    assert Product.objects.get().barcode_count == 5
+
+    call_command('repair_image_counters', stdout=StringIO())
+    product.refresh_from_db()
+    assert (product.barcode_count, product.other_image_count) == (1, 0)
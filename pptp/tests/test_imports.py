@@ -0,0 +1,97 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from pptp.models import Product, ProductImage
+from pptp.models.products import get_image_storage
+from pptp.storage.local import MemoryBlobBackend
+from pptp.storage.utils import read_blob
+
+pytestmark = pytest.mark.django_db
+
+MANIFEST = """import_id,product_name,source_batch,manual_barcode,is_tds,barcode_images,front_images
+tds-1,Whole Wheat Bread,tds,036000291452,yes,tds-1/barcode.jpg,tds-1/front.jpg;tds-1/front2.jpg
+tds-2,Bread,tds,,no,,
+tds-3,Rye Bread Loaf,tds,,no,tds-3/missing.jpg,
+"""
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    MemoryBlobBackend.clear()
+    (tmp_path / 'tds-1').mkdir()
+    for name in ('barcode.jpg', 'front.jpg', 'front2.jpg'):
+        (tmp_path / 'tds-1' / name).write_bytes(name.encode())
+    path = tmp_path / 'tds.csv'
+    path.write_text(MANIFEST)
+    yield path
+    MemoryBlobBackend.clear()
+
+
+def run_import(*args):
+    out, err = StringIO(), StringIO()
+    call_command('import_products', *args, '--chunk-size=2', stdout=out, stderr=err)
+    return out.getvalue(), err.getvalue()
+
+
+def test_import_creates_products_and_uploads_photos(manifest, django_user_model):
+    collector = django_user_model.objects.create_user(email='Collector@example.com', password='x')
+    out, err = run_import(str(manifest), '--created-by=collector@example.com')
+
+    product = Product.objects.get()
+    assert product.import_ref == 'tds:tds-1'
+    assert product.is_tds is True
+    assert product.normalized_barcode == '00036000291452'
+    assert product.created_by == 'collector@example.com'
+    assert product.created_by_user == collector
+    fronts = ProductImage.objects.filter(product=product, kind='front').order_by('pk')
+    assert [read_blob(get_image_storage(), image.image.name) for image in fronts] == [b'front.jpg', b'front2.jpg']
+    assert product.barcodes.count() == 1
+    assert (product.barcode_count, product.front_image_count) == (1, 2)
+
+    assert 'line 3: product_name' in err
+    assert 'line 4: barcode_images: file not found' in err
+
+
+def test_rerunning_an_import_skips_committed_rows(manifest):
+    run_import(str(manifest))
+    out, _ = run_import(str(manifest))
+    assert 'Imported 0 products (1 skipped, 2 errors)' in out
+    assert Product.objects.count() == 1
+
+
+def test_rows_sharing_a_file_name_get_their_own_blobs(tmp_path, monkeypatch):
+    MemoryBlobBackend.clear()
+    # With some latency the parallel uploads overlap, as they do against Azure
+    monkeypatch.setattr(get_image_storage().container_client, 'latency', 0.02)
+    lines = ['import_id,product_name,source_batch,front_images']
+    for index in range(20):
+        (tmp_path / f'row-{index}').mkdir()
+        (tmp_path / f'row-{index}' / 'front.jpg').write_bytes(f'photo {index}'.encode())
+        lines.append(f'row-{index},Bread Loaf {index},tds,row-{index}/front.jpg')
+    path = tmp_path / 'tds.csv'
+    path.write_text('\n'.join(lines) + '\n')
+    run_import(str(path))
+
+    storage = get_image_storage()
+    images = ProductImage.objects.select_related('product')
+    assert len({image.image.name for image in images}) == 20
+    for image in images:
+        index = image.product.import_ref.rsplit('-', 1)[1]
+        assert read_blob(storage, image.image.name) == f'photo {index}'.encode()
+    MemoryBlobBackend.clear()
+
+
+def test_jsonl_manifest(tmp_path):
+    path = tmp_path / 'snapcan.jsonl'
+    path.write_text(json.dumps({
+        'product_name': 'Canned Black Beans',
+        'source_batch': '2025_snapcan',
+        'has_probiotic_claim': True,
+    }) + '\n')
+    run_import(str(path))
+    product = Product.objects.get()
+    assert product.import_ref == 'snapcan:1'
+    assert product.has_probiotic_claim is True
@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+import pytest
+
+from pptp.forms.products import ProductFilterForm
+from pptp.models import Product
+from pptp.units import normalize_package_size
+
+pytestmark = pytest.mark.django_db
+
+
+def test_normalize_package_size():
+    assert normalize_package_size(Decimal('1.5'), 'KG') == (Decimal('1500.0'), 'mass')
+    assert normalize_package_size(Decimal('250'), 'MG') == (Decimal('0.250'), 'mass')
+    assert normalize_package_size(Decimal('2'), 'L') == (Decimal('2000'), 'volume')
+    assert normalize_package_size(Decimal('3'), 'OTH') == (None, '')
+    assert normalize_package_size(Decimal('0'), 'G') == (None, '')
+
+
+def test_range_filters_compare_across_units():
+    Product.objects.create(product_name='Rolled Oats', package_size=1, package_size_unit='KG')
+    Product.objects.create(product_name='Trail Mix', package_size=250, package_size_unit='G')
+    Product.objects.create(product_name='Spice Jar', package_size=50, package_size_unit='G')
+    Product.objects.create(product_name='Orange Juice', package_size=1, package_size_unit='L')
+    Product.objects.create(product_name='Gift Box', package_size=4, package_size_unit='OTH')
+
+    def names(queryset):
+        return sorted(queryset.values_list('product_name', flat=True))
+
+    assert names(Product.objects.with_package_size(200, 1000, 'G')) == ['Rolled Oats', 'Trail Mix']
+    assert names(Product.objects.with_package_size(minimum=0.5, unit='L')) == ['Orange Juice']
+
+    product = Product.objects.get(product_name='Spice Jar')
+    product.package_size_unit = 'KG'
+    product.save()
+    assert names(Product.objects.with_package_size(minimum=1, unit='KG')) == ['Rolled Oats', 'Spice Jar']
+
+    form = ProductFilterForm({'size_min': '0.2', 'size_max': '0.3', 'size_unit': 'KG'})
+    assert names(form.filter(Product.objects.all())) == ['Trail Mix']
+
+
+def test_float_bounds_are_taken_at_face_value():
+    Product.objects.create(product_name='Trail Mix', package_size=200, package_size_unit='G')
+    Product.objects.create(product_name='Raisins', package_size=0.1, package_size_unit='KG')
+    assert Product.objects.get(product_name='Raisins').package_quantity == Decimal('100')
+    assert Product.objects.with_package_size(0.2, 0.2, unit='KG').get().product_name == 'Trail Mix'
+    assert Product.objects.with_package_size(maximum=0.1, unit='KG').get().product_name == 'Raisins'
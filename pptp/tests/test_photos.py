@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from pptp.models import Barcode, NutritionFacts, Photo, Product, ProductImage
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def product():
+    product = Product.objects.create(product_name='Tomato Soup')
+    Barcode.objects.create(product=product, image='barcode/a.png', barcode_number='4006381333931')
+    NutritionFacts.objects.create(product=product, image='nutritionfacts/a.png')
+    ProductImage.objects.create(product=product, image='productimage/front.png', image_type='front')
+    ProductImage.objects.create(product=product, image='productimage/back.png', image_type='back')
+    return product
+
+
+def test_proxies_share_one_table_and_filter_by_kind(product):
+    assert sorted(Photo.objects.filter(product=product).values_list('kind', flat=True)) == [
+        'back', 'barcode', 'front', 'nutrition',
+    ]
+    assert [image.image_type for image in product.product_images.order_by('pk')] == ['front', 'back']
+    assert product.barcodes.get().normalized_barcode == '04006381333931'
+    assert not product.ingredients.exists()
+
+    product.refresh_from_db()
+    assert (product.barcode_count, product.nutrition_count, product.front_image_count) == (1, 1, 1)
+
+
+def test_photo_set_loads_in_one_query(product):
+    product = Product.objects.get(pk=product.pk)
+    with CaptureQueriesContext(connection) as queries:
+        photos = product.photos_by_kind()
+    assert len(queries) == 1
+    assert [photo.kind for photo in photos['barcode']] == ['barcode']
+    assert photos['ingredients'] == []
+
+
+def test_per_kind_managers_create_photos_of_the_product(product):
+    barcode = product.barcodes.create(image='barcode/b.png', barcode_number='036000291452')
+    front, created = product.product_images.get_or_create(kind='front', defaults={'image': 'productimage/f.png'})
+    side = product.product_images.create(image_type='side', image='productimage/side.png')
+    assert (barcode.product, barcode.kind) == (product, 'barcode')
+    assert not created and front.image.name == 'productimage/front.png'
+    assert isinstance(side, ProductImage) and side.kind == 'side'
+
+    # The photos prefetch holds every kind; the per-kind managers still filter
+    product = Product.objects.prefetch_related('photos').get(pk=product.pk)
+    assert product.barcodes.count() == 2
+    assert sorted(product.product_images.values_list('kind', flat=True)) == ['back', 'front', 'side']
@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pptp.models import Barcode, Product
+from pptp.pagination import paginate
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def products(user):
+    created = [
+        Product.objects.create(
+            product_name=f'Product {index}',
+            created_by_user=user,
+            created_by=user.email,
+            source_batch='tds' if index % 2 else '2025_snapcan',
+            submission_complete=index % 3 == 0,
+        )
+        for index in range(7)
+    ]
+    for product in created[:3]:
+        Barcode.objects.create(product=product, image='barcode/a.png')
+        Barcode.objects.create(product=product, image='barcode/b.png')
+    return created
+
+
+def test_keyset_pages_cover_every_row_once(products):
+    queryset = Product.objects.all()
+    seen = []
+    page = paginate(queryset, page_size=3)
+    while True:
+        seen += [product.pk for product in page]
+        if not page.has_next:
+            break
+        page = paginate(queryset, after=page.next_cursor, page_size=3)
+    assert seen == [product.pk for product in reversed(products)]
+
+    # Walking back from the last page returns the previous page unchanged
+    previous = paginate(queryset, before=page.previous_cursor, page_size=3)
+    assert [product.pk for product in previous] == seen[3:6]
+
+
+def test_api_filters_and_counts_images_without_per_row_queries(client, user, products):
+    client.force_login(user)
+    url = reverse('products:product_list_api')
+
+    with CaptureQueriesContext(connection) as queries:
+        data = client.get(url, {'batch': 'tds', 'page_size': 2}).json()
+    assert [row['product_name'] for row in data['results']] == ['Product 5', 'Product 3']
+    assert data['previous'] is None
+    # Session, user and a single listing query, whatever the page size
+    assert len([query for query in queries if query['sql'].startswith('SELECT')]) == 3
+
+    data = client.get(url, {'batch': 'tds', 'page_size': 2, 'after': data['next']}).json()
+    assert [row['product_name'] for row in data['results']] == ['Product 1']
+    assert data['results'][0]['image_counts']['barcode'] == 2
+    assert data['next'] is None
+
+    assert client.get(url, {'after': 'not-a-cursor'}).status_code == 400
+
+
+def test_listing_page_renders(client, user, products):
+    client.force_login(user)
+    response = client.get(reverse('products:product_list'), {'status': 'complete'})
+    assert response.status_code == 200
+    assert [product.pk for product in response.context['products']] == [products[6].pk, products[3].pk, products[0].pk]
+
+
+def test_listing_follows_the_owner_not_the_email(client, user, products):
+    # Changing the account email keeps the collector's products
+    user.email = 'renamed@example.com'
+    user.save()
+    client.force_login(user)
+    response = client.get(reverse('products:product_list_api'))
+    assert len(response.json()['results']) == len(products)
+
+
+def test_opening_an_unlinked_product_only_links_its_collector(client, user, django_user_model):
+    product = Product.objects.create(product_name='Rye Bread', created_by=user.email.upper())
+    url = reverse('products:combined_upload_edit', args=[product.pk])
+
+    staff = django_user_model.objects.create_user(email='staff@example.com', password='x', is_staff=True)
+    client.force_login(staff)
+    assert client.get(url).status_code == 200
+    product.refresh_from_db()
+    assert (product.created_by_user, product.created_by) == (None, user.email.upper())
+
+    client.force_login(user)
+    client.get(url)
+    product.refresh_from_db()
+    assert product.created_by_user == user
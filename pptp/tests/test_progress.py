@@ -0,0 +1,104 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from pptp.models import BatchProgress, Product
+from pptp.progress import batch_summaries
+
+pytestmark = pytest.mark.django_db
+
+
+def cells():
+    return {
+        (cell.source_batch, cell.storage_condition, cell.submission_complete): cell.product_count
+        for cell in BatchProgress.objects.filter(product_count__gt=0)
+    }
+
+
+def test_deltas_follow_product_changes(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        frozen = Product.objects.create(
+            product_name='Lasagna', source_batch='2025_frozen_entrees', storage_condition='freezer',
+        )
+        Product.objects.create(product_name='Pot Pie', source_batch='2025_frozen_entrees', storage_condition='freezer')
+    assert cells() == {('2025_frozen_entrees', 'freezer', False): 2}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        frozen.submission_complete = True
+        frozen.save()
+        # Instances loaded with deferred fields still move between cells
+        deferred = Product.objects.only('product_name').exclude(pk=frozen.pk).get()
+        deferred.storage_condition = 'fridge'
+        deferred.save()
+    assert cells() == {
+        ('2025_frozen_entrees', 'freezer', True): 1,
+        ('2025_frozen_entrees', 'fridge', False): 1,
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        frozen.delete()
+    assert cells() == {('2025_frozen_entrees', 'fridge', False): 1}
+
+
+def test_deltas_wait_for_the_commit(django_capture_on_commit_callbacks):
+    # The shared cell is not locked for the rest of the saving transaction
+    with django_capture_on_commit_callbacks() as callbacks:
+        Product.objects.create(product_name='Rye Bread', source_batch='tds')
+        assert cells() == {}
+    for callback in callbacks:
+        callback()
+    assert cells() == {('tds', 'shelf_stable', False): 1}
+
+
+def test_opposite_moves_lock_cells_in_the_same_order(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        product = Product.objects.create(product_name='Rye Bread', source_batch='tds')
+        Product.objects.create(product_name='Oat Bread', source_batch='tds', submission_complete=True)
+
+    def cell_updates(submission_complete):
+        product.submission_complete = submission_complete
+        with CaptureQueriesContext(connection) as queries, django_capture_on_commit_callbacks(execute=True):
+            product.save()
+        return [
+            query['sql'].split(' WHERE ')[1]
+            for query in queries if query['sql'].startswith('UPDATE "pptp_batchprogress"')
+        ]
+
+    updates = cell_updates(True)
+    assert len(updates) == 2
+    assert updates == cell_updates(False)
+
+
+def test_refresh_command_rebuilds_from_products():
+    Product.objects.create(product_name='Rye Bread', source_batch='tds', submission_complete=True)
+    Product.objects.create(product_name='Unbatched')
+    Product.objects.filter(source_batch='tds').update(needs_manual_verification=True)
+    BatchProgress.objects.update(product_count=99)
+
+    call_command('refresh_batch_progress', stdout=StringIO())
+
+    summaries = {summary['source_batch']: summary for summary in batch_summaries()}
+    assert summaries['tds']['total'] == 1
+    assert summaries['tds']['needs_verification'] == 1
+    assert summaries['tds']['percent_complete'] == 100
+    assert summaries['']['total'] == 1
+
+
+def test_progress_view_reads_the_summary(client, admin_user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        Product.objects.create(
+            product_name='Protein Bar', source_batch='2025_supp_food', primary_package_material='paper',
+        )
+    client.force_login(admin_user)
+
+    response = client.get(reverse('products:batch_progress'), {'format': 'json'})
+    (batch,) = response.json()['batches']
+    assert batch['label'] == '2025 Supplemented Food Collection'
+    assert batch['packaging'] == [['Paper/paperboard', 1]]
+
+    response = client.get(reverse('products:batch_progress'))
+    assert b'Collection Progress' in response.content
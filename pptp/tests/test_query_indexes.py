@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+
+from pptp.models import Barcode, Product, ProductImage
+from pptp.pagination import encode_cursor, newer_than, older_than
+from pptp.search import search_products
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason="EXPLAIN output is PostgreSQL specific"),
+]
+
+
+def explain(queryset):
+    # Test tables are tiny, so rule out sequential scans to see which index the
+    # planner would pick once the tables are large.
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+    plan = queryset.explain()
+    with connection.cursor() as cursor:
+        cursor.execute('RESET enable_seqscan')
+    return plan
+
+
+def index_conditions(plan):
+    return [line.strip() for line in plan.splitlines() if line.strip().startswith('Index Cond:')]
+
+
+def test_dashboard_listing_uses_owner_index():
+    plan = explain(Product.objects.filter(created_by_user=1).order_by('-created_at')[:5])
+    assert 'product_owner_idx' in plan
+
+
+def test_incomplete_products_use_partial_index():
+    plan = explain(
+        Product.objects.filter(created_by_user=1, submission_complete=False)
+        .order_by('-created_at')
+    )
+    assert 'product_owner_incomplete_idx' in plan
+
+
+def test_product_images_by_type_use_composite_index():
+    plan = explain(ProductImage.objects.filter(product_id=1, kind='front'))
+    assert 'photo_product_kind_idx' in plan
+
+
+def test_pending_uploads_use_partial_index():
+    plan = explain(Barcode.objects.filter(product_id=1, is_uploaded=False))
+    assert 'photo_pending_idx' in plan
+
+
+def test_search_uses_full_text_and_trigram_indexes():
+    plan = explain(search_products(Product.objects.all(), 'chocolate'))
+    assert 'product_search_idx' in plan
+    assert 'product_name_trgm_idx' in plan
+
+
+def test_claim_filters_use_flag_index():
+    plan = explain(Product.objects.with_flags(any_of=['has_probiotic_claim'], none_of=['has_supplemental_caution_id']))
+    assert 'product_claim_flags_idx' in plan
+
+
+def test_size_ranges_use_package_size_index():
+    plan = explain(Product.objects.with_package_size(200, 1000, 'G'))
+    assert 'product_package_size_idx' in plan
+
+
+def test_cursor_pages_are_index_range_scans(user):
+    cursor = encode_cursor(Product.objects.create(product_name='Oat Milk', created_by_user=user))
+    owned = Product.objects.filter(created_by_user=user)
+
+    plan = explain(older_than(owned, cursor).order_by('-created_at', '-pk')[:51])
+    assert 'product_owner_idx' in plan
+    assert any('created_at <=' in condition for condition in index_conditions(plan))
+
+    plan = explain(newer_than(owned, cursor).order_by('created_at', 'pk')[:51])
+    assert 'product_owner_idx' in plan
+    assert any('created_at >=' in condition for condition in index_conditions(plan))
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from pptp.models import Barcode, Product, ReviewTask
+from pptp.review import LeaseExpired, claim_next, complete, held_tasks
+from pptp.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def flagged():
+    return [
+        Product.objects.create(
+            product_name=f'Mystery Snack {index}',
+            source_batch='2026_snack_foods',
+            submission_complete=True,
+            needs_manual_verification=True,
+        )
+        for index in range(4)
+    ]
+
+
+def test_flagged_submissions_are_queued_once(flagged):
+    flagged[0].notes = 'Label torn'
+    flagged[0].save()
+    Product.objects.create(product_name='Draft', needs_manual_verification=True)
+    assert ReviewTask.objects.count() == 4
+
+
+@pytest.mark.parametrize('skip_locked', [True, False])
+def test_reviewers_never_share_tasks(flagged, monkeypatch, skip_locked):
+    monkeypatch.setattr(connection.features, 'has_select_for_update_skip_locked', skip_locked)
+    alice, bob = UserFactory(), UserFactory()
+
+    first = claim_next(alice, limit=3)
+    second = claim_next(bob, limit=3)
+    assert len(first) == 3
+    assert len(second) == 1
+    assert not set(first) & set(second)
+    # Claiming again only tops up to the limit
+    assert claim_next(alice, limit=3) == []
+
+
+def test_expired_lease_returns_to_queue(flagged):
+    alice, bob = UserFactory(), UserFactory()
+    (task_id,) = claim_next(alice, limit=1)
+    ReviewTask.objects.filter(pk=task_id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+    assert task_id in claim_next(bob, limit=1)
+    with pytest.raises(LeaseExpired):
+        complete(task_id, alice, ReviewTask.VERIFIED)
+
+
+def test_outcomes_update_the_product(flagged):
+    reviewer = UserFactory()
+    verified, returned = claim_next(reviewer, limit=2)
+
+    complete(verified, reviewer, ReviewTask.VERIFIED)
+    complete(returned, reviewer, ReviewTask.RETURNED, notes='Retake the nutrition facts')
+    assert not held_tasks(reviewer).exists()
+
+    assert Product.objects.get(review_tasks=verified).needs_manual_verification is False
+    product = Product.objects.get(review_tasks=returned)
+    assert product.submission_complete is False
+
+    # Resubmitting the product queues a fresh review
+    product.submission_complete = True
+    product.save()
+    assert product.review_tasks.filter(completed_at__isnull=True).exists()
+
+
+def test_review_screen(client, flagged, django_assert_max_num_queries):
+    reviewer = UserFactory(is_staff=True)
+    client.force_login(reviewer)
+    Barcode.objects.create(product=flagged[0], image='barcode/a.png')
+
+    client.post(reverse('products:review_queue'))
+    task = held_tasks(reviewer).order_by('pk').first()
+    with django_assert_max_num_queries(12):
+        response = client.get(reverse('products:review_task', args=[task.pk]))
+    assert response.templates[0].name == 'pptp/products/review.html'
+    assert b'Mystery Snack 0' in response.content
+
+    response = client.post(reverse('products:review_task', args=[task.pk]), {'outcome': 'verified'})
+    assert response.status_code == 302
+    assert ReviewTask.objects.get(pk=task.pk).outcome == 'verified'
+
+    # Someone else's task is not reviewable
+    other = UserFactory(is_staff=True)
+    client.force_login(other)
+    response = client.get(reverse('products:review_task', args=[held_tasks(reviewer).first().pk]))
+    assert response.status_code == 302
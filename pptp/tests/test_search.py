@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from pptp.models import Barcode, Product
+from pptp.search import prefix_tsquery, search_products
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason="Search indexes are PostgreSQL specific"),
+]
+
+
+@pytest.fixture
+def products():
+    return {
+        'cookies': Product.objects.create(product_name='Chocolate Chip Cookies', notes='family size'),
+        'bar': Product.objects.create(product_name='Dark Chocolate Bar', manual_barcode='036000291452'),
+        'soup': Product.objects.create(product_name='Tomato Soup', notes='contains chocolate sprinkles'),
+        'crackers': Product.objects.create(product_name='Whole Wheat Crackers'),
+    }
+
+
+def names(queryset):
+    return [product.product_name for product in queryset]
+
+
+def test_prefix_tsquery_strips_operators():
+    assert prefix_tsquery("choc chip") == 'choc:* & chip:*'
+    assert prefix_tsquery("a | !b & (c)") == 'a:* & b:* & c:*'
+
+
+def test_name_matches_rank_above_notes(products):
+    results = names(search_products(Product.objects.all(), 'choco'))
+    assert set(results[:2]) == {'Chocolate Chip Cookies', 'Dark Chocolate Bar'}
+    assert results[2] == 'Tomato Soup'
+
+
+def test_misspelt_name_matches_by_trigram(products):
+    assert names(search_products(Product.objects.all(), 'crackerz')) == ['Whole Wheat Crackers']
+
+
+def test_barcodes_match_typed_and_decoded_numbers(products):
+    Barcode.objects.create(product=products['soup'], barcode_number='4006381333931', image='barcode/a.png')
+
+    assert names(search_products(Product.objects.all(), '0036000291452')) == ['Dark Chocolate Bar']
+    assert names(search_products(Product.objects.all(), '4006381333931')) == ['Tomato Soup']
+    # Partial numbers fall back to prefix matching on the typed barcode
+    assert names(search_products(Product.objects.all(), '0360002')) == ['Dark Chocolate Bar']
+
+
+def test_listing_search(client, user, products):
+    Product.objects.filter(pk=products['bar'].pk).update(created_by_user=user, created_by=user.email)
+    client.force_login(user)
+    response = client.get(reverse('products:product_list_api'), {'q': 'chocolate'})
+    assert [row['product_name'] for row in response.json()['results']] == ['Dark Chocolate Bar']
@@ -0,0 +1,68 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from pptp.models import Barcode, Product
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from pptp.snapshots import batch_directory, build_snapshot, read_manifest, read_snapshot  # noqa: E402
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def supp_products():
+    products = [
+        Product.objects.create(
+            product_name=f'Protein Bar {index}',
+            source_batch='2025_supp_food',
+            package_size_unit='G',
+            has_probiotic_claim=index == 1,
+        )
+        for index in range(3)
+    ]
+    Product.objects.create(product_name='Frozen Lasagna', source_batch='2025_frozen_entrees')
+    Barcode.objects.create(product=products[0], barcode_number='4006381333931', image='barcode/bar.png')
+    return products
+
+
+def test_snapshot_layout_and_types(tmp_path, supp_products):
+    build_snapshot('2025_supp_food', root=tmp_path, chunk_size=2)
+    directory = batch_directory(tmp_path, '2025_supp_food')
+    (part,) = directory.glob('part-*.parquet')
+
+    metadata = pq.ParquetFile(part).metadata
+    assert metadata.num_rows == 3
+    assert metadata.num_row_groups == 2
+
+    table = read_snapshot('2025_supp_food', root=tmp_path)
+    assert table.schema.field('package_size_unit').type == pa.dictionary(pa.int8(), pa.string())
+    assert table.schema.field('has_probiotic_claim').type == pa.bool_()
+    rows = {row['product_name']: row for row in table.to_pylist()}
+    assert rows['Protein Bar 0']['barcode_blobs'] == ['barcode/bar.png']
+    assert rows['Protein Bar 1']['has_probiotic_claim'] is True
+
+
+def test_incremental_snapshot_appends_changed_products(tmp_path, supp_products):
+    build_snapshot('2025_supp_food', root=tmp_path)
+
+    supp_products[2].product_name = 'Protein Bar Renamed'
+    supp_products[2].save()
+    manifest = build_snapshot('2025_supp_food', root=tmp_path)
+
+    assert [entry['incremental'] for entry in manifest['files']] == [False, True]
+    table = read_snapshot('2025_supp_food', root=tmp_path)
+    assert table.num_rows == 3
+    assert 'Protein Bar Renamed' in table['product_name'].to_pylist()
+
+
+def test_snapshot_command_full_rebuild(tmp_path, supp_products):
+    call_command('snapshot_batches', '2025_supp_food', '--output', str(tmp_path), stdout=StringIO())
+    call_command('snapshot_batches', '2025_supp_food', '--output', str(tmp_path), '--full', stdout=StringIO())
+
+    directory = batch_directory(tmp_path, '2025_supp_food')
+    assert len(list(directory.glob('part-*.parquet'))) == 1
+    assert len(read_manifest(directory)['files']) == 1
@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.urls import reverse
+
+from pptp.middleware import StorageProfilingMiddleware
+from pptp.models.products import get_image_storage
+from pptp.storage.instrumentation import collect_request_stats, profiler
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiler():
+    profiler.reset()
+    yield
+    profiler.reset()
+
+
+def test_storage_calls_are_recorded_per_operation():
+    storage = get_image_storage()
+
+    with collect_request_stats() as request_stats:
+        name = storage.save('barcode/profiled.gif', ContentFile(b'12345'))
+        storage.open(name)
+        storage.exists('barcode/missing.gif')
+
+    assert set(request_stats.operations) == {'exists', 'save', 'open'}
+    assert request_stats.operations['save'].bytes == 5
+    assert request_stats.operations['exists'].errors == 0
+
+    snapshot = profiler.snapshot()
+    assert snapshot['save']['count'] == 1
+    assert snapshot['open']['bytes'] == 5
+    assert sum(snapshot['exists']['histogram'].values()) == 2
+
+
+def test_storage_stats_command():
+    get_image_storage().exists('barcode/missing.gif')
+
+    out = StringIO()
+    call_command('storage_stats', stdout=out)
+    assert 'exists' in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_staff(client, admin_user, user):
+    url = reverse('products:storage_metrics')
+    client.force_login(user)
+    assert client.get(url).status_code == 302
+
+    get_image_storage().exists('barcode/missing.gif')
+    client.force_login(admin_user)
+    assert client.get(url).json()['operations']['exists']['count'] == 1
+    assert 'pptp_storage_operation_seconds_bucket' in client.get(url, {'format': 'prometheus'}).content.decode()
+
+
+def test_middleware_leaves_flushing_to_the_interval(rf, monkeypatch):
+    flushes = []
+    monkeypatch.setattr(profiler, 'flush', lambda: flushes.append(1))
+
+    def view(request):
+        get_image_storage().exists('barcode/missing.gif')
+        return HttpResponse()
+
+    response = StorageProfilingMiddleware(view)(rf.get('/'))
+    assert 'exists' in response['Server-Timing']
+    assert flushes == []
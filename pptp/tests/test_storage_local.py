@@ -0,0 +1,72 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from pptp.models import Barcode, Product
+from pptp.models.products import get_image_storage
+from pptp.storage.azure import AzureBlobStorageError, AzureBlobStorageUnavailable
+from pptp.storage.local import InMemoryBlobStorage, LocalBlobStorage, MemoryBlobBackend
+from pptp.storage.resilience import get_policy
+
+GIF = b'GIF87a\x01\x00\x01\x00\x80\x01\x00\x00\x00\x00ccc,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+
+
+@pytest.fixture(autouse=True)
+def _clear_blobs():
+    MemoryBlobBackend.clear()
+    yield
+    MemoryBlobBackend.clear()
+
+
+@pytest.mark.parametrize('storage_class', [InMemoryBlobStorage, LocalBlobStorage])
+def test_emulator_matches_azure_semantics(storage_class, tmp_path):
+    kwargs = {'location': str(tmp_path)} if storage_class is LocalBlobStorage else {}
+    storage = storage_class(container='semantics', **kwargs)
+
+    name = storage.save('barcode/photo.gif', ContentFile(GIF))
+    assert name == 'barcode/photo.gif'
+    assert storage.exists(name)
+    assert storage.open(name) == GIF
+
+    # Same name gets a numbered suffix, like get_available_name on Azure
+    assert storage.save('barcode/photo.gif', ContentFile(GIF)) == 'barcode/photo_1.gif'
+
+    storage.delete(name)
+    storage.delete(name)
+    assert not storage.exists(name)
+    assert storage.open(name) is None
+
+
+def test_injected_failures_are_mapped_like_azure_errors(settings):
+    settings.AZURE_STORAGE_RETRY = {'max_attempts': 1}
+    settings.AZURE_STORAGE_CIRCUIT_BREAKER = {'failure_threshold': 2, 'reset_timeout': 60}
+    storage = InMemoryBlobStorage(container='flaky', failure_rate=1)
+
+    with pytest.raises(AzureBlobStorageError):
+        storage.save('barcode/a.gif', ContentFile(GIF))
+    with pytest.raises(AzureBlobStorageError):
+        storage.save('barcode/a.gif', ContentFile(GIF))
+    with pytest.raises(AzureBlobStorageUnavailable):
+        storage.save('barcode/a.gif', ContentFile(GIF))
+    # save() checks for name collisions first, so that is the call cut short
+    assert get_policy(('memory://', 'flaky')).stats()['short_circuited'] == {'exists': 1}
+
+
+@pytest.mark.django_db
+def test_image_saved_offline_while_circuit_is_open(monkeypatch):
+    product = Product.objects.create(product_name='Test Product')
+    storage = get_image_storage()
+
+    def unavailable(name, content):
+        raise AzureBlobStorageUnavailable("Azure storage is unavailable, try again later")
+
+    monkeypatch.setattr(storage, '_save', unavailable)
+    barcode = Barcode.objects.create(
+        product=product,
+        image=SimpleUploadedFile('barcode.gif', GIF, content_type='image/gif'),
+    )
+
+    barcode.refresh_from_db()
+    assert barcode.is_uploaded is False
+    assert barcode.device_filename == 'barcode.gif'
+    assert not barcode.image
@@ -0,0 +1,118 @@
+import pytest
+
+from pptp.storage.resilience import CircuitBreaker, CircuitOpenError, ResiliencePolicy
+
+
+class TransientError(Exception):
+    pass
+
+
+class PermanentError(Exception):
+    pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def is_transient(error):
+    return isinstance(error, TransientError)
+
+
+def make_policy(clock=None, **breaker):
+    policy = ResiliencePolicy(
+        retry={'max_attempts': 3, 'base_delay': 0, 'max_delay': 0, 'idempotent_operations': ['open']},
+        circuit_breaker={'failure_threshold': 2, 'reset_timeout': 10, **breaker},
+        sleep=lambda seconds: None,
+    )
+    if clock:
+        policy.breaker.clock = clock
+    return policy
+
+
+def test_idempotent_operation_is_retried_until_success():
+    policy = make_policy()
+    outcomes = [TransientError(), 'data']
+
+    def func():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert policy.call('open', func, is_transient) == 'data'
+    assert policy.stats()['retries'] == {'open': 1}
+
+
+def test_non_idempotent_operation_is_not_retried():
+    policy = make_policy(failure_threshold=5)
+    calls = []
+
+    def func():
+        calls.append(1)
+        raise TransientError
+
+    with pytest.raises(TransientError):
+        policy.call('save', func, is_transient)
+    assert len(calls) == 1
+
+
+def test_permanent_errors_do_not_trip_the_breaker():
+    policy = make_policy()
+
+    def func():
+        raise PermanentError
+
+    for _ in range(5):
+        with pytest.raises(PermanentError):
+            policy.call('open', func, is_transient)
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    clock = FakeClock()
+    policy = make_policy(clock=clock)
+
+    def failing():
+        raise TransientError
+
+    with pytest.raises(TransientError):
+        policy.call('save', failing, is_transient)
+    with pytest.raises(TransientError):
+        policy.call('save', failing, is_transient)
+    assert policy.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        policy.call('save', lambda: 'never called', is_transient)
+    assert policy.stats()['short_circuited'] == {'save': 1}
+
+    clock.now = 11
+    assert policy.breaker.state == CircuitBreaker.HALF_OPEN
+    assert policy.call('save', lambda: 'ok', is_transient) == 'ok'
+    assert policy.breaker.state == CircuitBreaker.CLOSED
+    assert policy.stats()['circuit_open_seconds'] == 11
+
+
+def test_late_failures_do_not_push_the_probe_back():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Calls that were already in flight when the circuit opened fail later on
+    clock.now = 9
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.total_open_seconds() == 10
+    clock.now = 20
+    assert breaker.state == CircuitBreaker.HALF_OPEN
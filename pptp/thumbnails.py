@@ -0,0 +1,48 @@
+"""
+Small JPEG previews of product photos for the admin.
+
+Thumbnails are generated on first request and stored next to the originals
+as ``thumbnails/<size>/<original name>.jpg`` so later requests are a single
+small read instead of downloading and decoding a full-size photo.
+"""
+import io
+
+from django.core.files.base import ContentFile
+from PIL import Image, UnidentifiedImageError
+
+from .storage.utils import read_blob
+
+THUMBNAIL_SIZE = 160
+
+
+def thumbnail_name(name, size=THUMBNAIL_SIZE):
+    return f'thumbnails/{size}/{name}.jpg'
+
+
+def make_thumbnail(data, size=THUMBNAIL_SIZE):
+    """JPEG bytes of ``data`` scaled to fit in a ``size`` square, or None if it is not an image"""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            # draft() lets the JPEG decoder skip most of the full-size pixels
+            image.draft('RGB', (size, size))
+            image = image.convert('RGB')
+            image.thumbnail((size, size))
+            output = io.BytesIO()
+            image.save(output, format='JPEG', quality=80, optimize=True)
+    except (UnidentifiedImageError, OSError):
+        return None
+    return output.getvalue()
+
+
+def get_thumbnail(storage, name, size=THUMBNAIL_SIZE):
+    """Thumbnail bytes for the blob ``name``, creating and storing it if needed"""
+    cached = read_blob(storage, thumbnail_name(name, size))
+    if cached is not None:
+        return cached
+    original = read_blob(storage, name)
+    if original is None:
+        return None
+    data = make_thumbnail(original, size)
+    if data is not None:
+        storage.save(thumbnail_name(name, size), ContentFile(data))
+    return data
@@ -0,0 +1,37 @@
+"""
+Package size units.
+
+``Product.package_size`` is entered in whatever unit is printed on the
+label. For range queries it is also stored as ``package_quantity`` in a
+base unit per dimension: grams for mass, millilitres for volume. Nothing
+in this module touches Django so migrations can import it.
+"""
+from decimal import Decimal
+
+MASS = 'mass'
+VOLUME = 'volume'
+
+DIMENSION_CHOICES = [
+    (MASS, 'Mass (g)'),
+    (VOLUME, 'Volume (mL)'),
+]
+
+# package_size_unit -> (dimension, base units per unit); OTH has no conversion
+UNIT_FACTORS = {
+    'MG': (MASS, Decimal('0.001')),
+    'G': (MASS, Decimal('1')),
+    'KG': (MASS, Decimal('1000')),
+    'ML': (VOLUME, Decimal('1')),
+    'L': (VOLUME, Decimal('1000')),
+}
+
+
+def normalize_package_size(size, unit):
+    """
+    ``(quantity, dimension)`` for a size in ``unit``, or ``(None, '')`` when
+    the size is missing or the unit cannot be converted.
+    """
+    if unit not in UNIT_FACTORS or not size:
+        return None, ''
+    dimension, factor = UNIT_FACTORS[unit]
+    return Decimal(str(size)) * factor, dimension
@@ -1,19 +1,44 @@
 from django.urls import path
 from ..views.products import (
     ProductDashboardView,
+    ProductListView,
     CombinedUploadView,
     ajax_upload_image,
+    ajax_upload_draft,
+    autosave_product,
+    autosave_draft,
     validate_product_submission,
     delete_image,
+    barcode_lookup,
+    product_list_api,
 )
+from ..views.analytics import analytics_report
+from ..views.exports import export_images, export_products
+from ..views.metrics import storage_metrics
+from ..views.progress import batch_progress
+from ..views.review import release_review, review_queue, review_task
 
 app_name = 'products'
 
 urlpatterns = [
     path('', ProductDashboardView.as_view(), name='dashboard'),
+    path('list/', ProductListView.as_view(), name='product_list'),
+    path('api/products/', product_list_api, name='product_list_api'),
     path('submit/', CombinedUploadView.as_view(), name='combined_upload_new'),
     path('submit/<int:pk>/', CombinedUploadView.as_view(), name='combined_upload_edit'),
+    path('submit/draft/<uuid:token>/ajax-upload/', ajax_upload_draft, name='ajax_upload_draft'),
+    path('submit/draft/<uuid:token>/autosave/', autosave_draft, name='autosave_draft'),
     path('submit/<int:pk>/ajax-upload/', ajax_upload_image, name='ajax_upload'),
+    path('submit/<int:pk>/autosave/', autosave_product, name='autosave_product'),
     path('submit/<int:pk>/validate/', validate_product_submission, name='validate_product'),
     path('submit/<int:pk>/delete-image/', delete_image, name='delete_image'),
+    path('lookup/barcode/', barcode_lookup, name='barcode_lookup'),
+    path('export/products/', export_products, name='export_products'),
+    path('export/images/', export_images, name='export_images'),
+    path('progress/', batch_progress, name='batch_progress'),
+    path('analytics/', analytics_report, name='analytics_report'),
+    path('review/', review_queue, name='review_queue'),
+    path('review/<int:pk>/', review_task, name='review_task'),
+    path('review/<int:pk>/release/', release_review, name='release_review'),
+    path('metrics/storage/', storage_metrics, name='storage_metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,31 @@
+# views/analytics.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from ..analytics import get_report
+
+
+@require_GET
+@staff_member_required
+def analytics_report(request):
+    """
+    Claim co-occurrence and storage/packaging cross-tabs over every
+    product. ``?format=json`` returns the same data.
+    """
+    report = get_report()
+    if request.GET.get('format') == 'json':
+        return JsonResponse(report)
+    claims = report['claims']
+    packaging = report['packaging']
+    return render(request, 'pptp/products/analytics.html', {
+        'total': report['total'],
+        'claim_rows': zip(claims['labels'], claims['cooccurrence']),
+        'claim_labels': claims['labels'],
+        'materials': packaging['materials'],
+        'batches': [
+            {**batch, 'rows': zip(packaging['storage'], batch['counts'])}
+            for batch in packaging['batches']
+        ],
+    })
@@ -0,0 +1,57 @@
+# views/exports.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from ..bundles import bundle_entries, stream_zip
+from ..exports import export_lines, export_queryset
+from ..forms.products import ExportFilterForm, ImageBundleForm
+from ..models.products import get_image_storage
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+@require_GET
+@staff_member_required
+def export_products(request):
+    """
+    Stream every matching product with image counts and blob names.
+    ``?format=csv|jsonl``, ``batch``, and ``since``/``until`` (YYYY-MM-DD).
+    """
+    form = ExportFilterForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    options = form.cleaned_data
+    queryset = export_queryset(options['batch'], options['since'], options['until'])
+    export_format = options['format']
+
+    response = StreamingHttpResponse(
+        export_lines(queryset, export_format),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    filename = f"products-{options['batch'] or 'all'}-{timezone.now():%Y%m%d}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@require_GET
+@staff_member_required
+def export_images(request):
+    """
+    Stream a ZIP of the photos of a ``?batch=`` and/or ``?products=1,2,3``,
+    organised by product and image type, with a manifest.csv.
+    """
+    form = ImageBundleForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    entries = bundle_entries(form.get_products())
+    response = StreamingHttpResponse(stream_zip(entries, get_image_storage()), content_type='application/zip')
+    filename = f"photos-{form.cleaned_data['batch'] or 'selection'}-{timezone.now():%Y%m%d}.zip"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
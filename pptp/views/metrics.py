@@ -0,0 +1,28 @@
+# views/metrics.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from ..storage.instrumentation import profiler, prometheus_text
+from ..storage.resilience import all_policy_stats
+
+
+@require_GET
+@staff_member_required
+def storage_metrics(request):
+    """
+    Storage call counts, bytes and latency histograms across all workers.
+    ``?format=prometheus`` returns the Prometheus text exposition format.
+    """
+    snapshot = profiler.snapshot()
+
+    if request.GET.get('format') == 'prometheus':
+        return HttpResponse(prometheus_text(snapshot), content_type='text/plain; version=0.0.4')
+
+    return JsonResponse({
+        'operations': snapshot,
+        # Breaker state is per process, so this only reflects the worker that answered.
+        'resilience': {
+            '/'.join(key): stats for key, stats in all_policy_stats().items()
+        },
+    })
@@ -1,20 +1,36 @@
 # views/products.py
 import json
+import uuid
 from datetime import timedelta
 from django.views.generic import View, UpdateView, TemplateView
 from django.db import transaction
-from django.db.models import Count
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.http import JsonResponse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.views.decorators.http import require_POST
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST, require_http_methods
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from ..models import Product, Barcode, NutritionFacts, Ingredients, ProductImage
-from ..forms.products import ProductSetupForm, BarcodeUploadForm, NutritionFactsUploadForm, IngredientsUploadForm, ProductImageUploadForm
+from ..models import Product, Photo
+from ..models.products import KIND_CHOICES, PRODUCT_IMAGE_KINDS
+from ..barcode_index import lookup_barcode
+from ..duplicates import find_duplicates_for_product
+from ..forms.products import ProductSetupForm, BarcodeUploadForm, NutritionFactsUploadForm, IngredientsUploadForm, ProductImageUploadForm, ProductFilterForm
+from ..pagination import InvalidCursor, KeysetPage, get_page_size, paginate
+from ..search import search_products
+
+# Upload form for each photo kind (the ``image_type`` posted by the upload page)
+UPLOAD_FORMS = {
+    'barcode': BarcodeUploadForm,
+    'nutrition': NutritionFactsUploadForm,
+    'ingredients': IngredientsUploadForm,
+    **{kind: ProductImageUploadForm for kind in PRODUCT_IMAGE_KINDS},
+}
+PHOTO_KINDS = [kind for kind, _label in KIND_CHOICES]
 
 
 class BaseProductTemplateView(LoginRequiredMixin, TemplateView):
@@ -28,9 +44,7 @@ class ProductDashboardView(BaseProductTemplateView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        username = self.request.user.email
-        
-        user_products = Product.objects.filter(created_by=username)
+        user_products = Product.objects.filter(created_by_user=self.request.user)
         
         context['total_products'] = user_products.count()
         context['completed_products'] = user_products.filter(submission_complete=True).count()
@@ -43,10 +57,7 @@ class ProductDashboardView(BaseProductTemplateView):
         thirty_days_ago = timezone.now() - timedelta(days=30)
         context['recent_products'] = user_products.filter(created_at__gte=thirty_days_ago).count()
         
-        products_with_images = user_products.annotate(
-            image_count=Count('product_images')
-        ).filter(image_count__gt=0).count()
-        context['products_with_images'] = products_with_images
+        context['products_with_images'] = user_products.with_photos().count()
         
         context['multi_nutrition_products'] = user_products.filter(has_multiple_nutrition_facts=True).count()
         context['multi_barcode_products'] = user_products.filter(has_multiple_barcodes=True).count()
@@ -59,6 +70,69 @@ class ProductDashboardView(BaseProductTemplateView):
         return context
 
 
+LIST_FIELDS = [
+    'id',
+    'created_at',
+    'product_name',
+    'manual_barcode',
+    'source_batch',
+    'submission_complete',
+    'is_offline',
+    'is_variety_pack',
+    'is_supplemented_food',
+    'is_tds',
+    'needs_manual_verification',
+    *Product.COUNTER_FIELDS,
+]
+
+
+def get_product_page(request):
+    """
+    The current user's products filtered by the query string, one keyset page
+    at a time (``?after=`` / ``?before=`` cursors), or the best matches for a
+    ``?q=`` search. Raises InvalidCursor.
+    """
+    form = ProductFilterForm(request.GET)
+    queryset = form.filter(
+        Product.objects.filter(created_by_user=request.user).only(*LIST_FIELDS)
+    )
+    page_size = get_page_size(request.GET.get('page_size'))
+    if form.is_valid() and form.cleaned_data['q']:
+        # Search results are ordered by relevance, so show the best page only
+        return form, KeysetPage(list(search_products(queryset, form.cleaned_data['q'])[:page_size]))
+    page = paginate(
+        queryset,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        page_size=page_size,
+    )
+    return form, page
+
+
+class ProductListView(BaseProductTemplateView):
+    template_name = 'pptp/products/product_list.html'
+
+    def get(self, request, *args, **kwargs):
+        try:
+            self.form, self.page = get_product_page(request)
+        except InvalidCursor:
+            return redirect('products:product_list')
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        for key in ('after', 'before'):
+            query.pop(key, None)
+        context.update({
+            'filter_form': self.form,
+            'page': self.page,
+            'products': self.page.object_list,
+            'filter_query': query.urlencode(),
+        })
+        return context
+
+
 class BaseProductStepView(BaseProductTemplateView):
     view_step = None
     template_name = 'pptp/products/base_submission.html'
@@ -97,23 +171,60 @@ class ProductSetupView(BaseProductStepView, UpdateView):
         return reverse_lazy('products:barcode_upload', kwargs={'pk': self.object.pk})
 
 
+def product_version(request, pk):
+    """``(updated_at, image_version)`` of product ``pk``, read once per request"""
+    versions = request.__dict__.setdefault('_product_versions', {})
+    if pk not in versions:
+        versions[pk] = Product.objects.filter(pk=pk).values_list('updated_at', 'image_version').first()
+    return versions[pk]
+
+
+def product_etag(request, pk=None, **kwargs):
+    """
+    Validator for JSON responses built from one product. Everything they show
+    moves updated_at or image_version, so an unchanged product gets a 304
+    before any context is built. Duplicate warnings raised by another
+    product's later upload appear with this product's next change. HTML pages
+    also carry a CSRF token, the active language and flash messages, which
+    the version knows nothing about, so they are never made conditional.
+    """
+    version = product_version(request, pk) if pk else None
+    if version is None:
+        return None
+    updated_at, image_version = version
+    return f'"{request.user.pk}-{pk}-{updated_at.timestamp():.6f}-{image_version}"'
+
+
+def product_last_modified(request, pk=None, **kwargs):
+    version = product_version(request, pk) if pk else None
+    return version[0] if version else None
+
+
+def product_conditional(view):
+    """Answer conditional GETs from the product's version; browsers revalidate every time"""
+    view = condition(etag_func=product_etag, last_modified_func=product_last_modified)(view)
+    return cache_control(private=True, no_cache=True)(view)
+
+
 class CombinedUploadView(LoginRequiredMixin, View):
     template_name = 'pptp/products/combined_upload.html'
 
     def get(self, request, pk=None):
         if pk:
             product = get_object_or_404(Product, pk=pk)
-            if not product.created_by:
-                product.created_by = request.user.email
-                product.save()
+            # Products the migration could not link are claimed by their own
+            # collector only; anyone else just views them
+            if not product.created_by_user_id and (product.created_by or '').lower() == request.user.email.lower():
+                product.created_by_user = request.user
+                product.save(update_fields=['created_by_user'])
             form = ProductSetupForm(instance=product)
             is_editing = True
         else:
-            product = Product.objects.create(
-                created_by=request.user.email,
-                product_name="",
-            )
-            return redirect('products:combined_upload_edit', pk=product.pk)
+            # Nothing is stored until the first upload or save, see get_draft()
+            product = None
+            form = ProductSetupForm()
+            form.instance.draft_token = uuid.uuid4()
+            is_editing = False
 
         context = self.get_context_data(product, form, is_editing)
         return render(request, self.template_name, context)
@@ -124,8 +235,9 @@ class CombinedUploadView(LoginRequiredMixin, View):
             form = ProductSetupForm(request.POST, instance=product)
             is_editing = True
         else:
-            form = ProductSetupForm(request.POST)
-            product = None
+            token, product = get_draft(request, request.POST.get('draft_token'))
+            form = ProductSetupForm(request.POST, instance=product)
+            form.instance.draft_token = token
             is_editing = False
 
         is_submit = 'submit_product' in request.POST
@@ -133,6 +245,7 @@ class CombinedUploadView(LoginRequiredMixin, View):
         if form.is_valid():
             with transaction.atomic():
                 if not is_editing:
+                    form.instance.created_by_user = request.user
                     form.instance.created_by = request.user.email
 
                 product = form.save()
@@ -180,32 +293,31 @@ class CombinedUploadView(LoginRequiredMixin, View):
         context = {
             'product': product,
             'form': form,
+            'draft_token': form.instance.draft_token,
+            'autosave_fields': list(form.fields),
             'is_editing': is_editing,
             'view_step': 'combined_upload'
         }
 
         if product:
+            # The whole photo set in one query
+            photos = product.photos_by_kind()
             context.update({
-                'existing_barcodes': product.barcodes.all(),
-                'existing_nutrition_facts': product.nutrition_facts.all(),
-                'existing_ingredients': product.ingredients.all(),
-                'product_images_by_type': {
-                    'front': product.product_images.filter(image_type='front'),
-                    'back': product.product_images.filter(image_type='back'),
-                    'side': product.product_images.filter(image_type='side'),
-                    'other': product.product_images.filter(image_type='other'),
-                },
-                'validation_errors': self.get_validation_errors(product)
+                'existing_barcodes': photos['barcode'],
+                'existing_nutrition_facts': photos['nutrition'],
+                'existing_ingredients': photos['ingredients'],
+                'product_images_by_type': {kind: photos[kind] for kind in PRODUCT_IMAGE_KINDS},
+                'validation_errors': self.get_validation_errors(product),
+                'duplicate_images': self.get_duplicate_images(product)
             })
         else:
             context.update({
                 'existing_barcodes': [],
                 'existing_nutrition_facts': [],
                 'existing_ingredients': [],
-                'product_images_by_type': {
-                    'front': [], 'back': [], 'side': [], 'other': []
-                },
-                'validation_errors': []
+                'product_images_by_type': {kind: [] for kind in PRODUCT_IMAGE_KINDS},
+                'validation_errors': [],
+                'duplicate_images': []
             })
 
         context.update({
@@ -220,7 +332,7 @@ class CombinedUploadView(LoginRequiredMixin, View):
     def process_uploads(self, request, product):
         errors = []
         
-        def process_upload(form_class, prefix, is_product_image=False, image_type=None):
+        def process_upload(kind, prefix):
             if request.POST.get(f'{prefix}-already_uploaded') == 'true':
                 return None
                 
@@ -228,21 +340,18 @@ class CombinedUploadView(LoginRequiredMixin, View):
             if not has_file:
                 return None
                 
-            form = form_class(request.POST, request.FILES, prefix=prefix)
+            form = UPLOAD_FORMS[kind](request.POST, request.FILES, prefix=prefix)
             if form.is_valid():
                 instance = form.save(commit=False)
                 instance.product = product
                 instance.is_uploaded = True
-                
-                if is_product_image and image_type:
-                    instance.image_type = image_type
-                    
+                instance.kind = kind
                 instance.save()
                 return None
             else:
                 return f"Error uploading {prefix}: {form.errors}"
         
-        def process_indexed_uploads(form_class, base_prefix):
+        def process_indexed_uploads(kind, base_prefix):
             index = 0
             while True:
                 prefix = f'{base_prefix}-{index}'
@@ -255,7 +364,7 @@ class CombinedUploadView(LoginRequiredMixin, View):
                 if not has_file:
                     break
                     
-                form = form_class(request.POST, request.FILES, prefix=prefix)
+                form = UPLOAD_FORMS[kind](request.POST, request.FILES, prefix=prefix)
                 if form.is_valid():
                     instance = form.save(commit=False)
                     instance.product = product
@@ -266,31 +375,32 @@ class CombinedUploadView(LoginRequiredMixin, View):
                 
                 index += 1
         
-        for form_class, prefix in [
-            (BarcodeUploadForm, 'barcode'),
-            (NutritionFactsUploadForm, 'nutrition'),
-            (IngredientsUploadForm, 'ingredients')
-        ]:
-            error = process_upload(form_class, prefix)
+        for kind in ['barcode', 'nutrition', 'ingredients']:
+            error = process_upload(kind, kind)
             if error:
                 errors.append(error)
+            process_indexed_uploads(kind, kind)
         
-        process_indexed_uploads(BarcodeUploadForm, 'barcode')
-        process_indexed_uploads(NutritionFactsUploadForm, 'nutrition')
-        process_indexed_uploads(IngredientsUploadForm, 'ingredients')
-        
-        for image_type in ['front', 'back', 'side', 'other']:
-            error = process_upload(
-                ProductImageUploadForm, 
-                f'image_{image_type}', 
-                is_product_image=True,
-                image_type=image_type
-            )
+        for kind in PRODUCT_IMAGE_KINDS:
+            error = process_upload(kind, f'image_{kind}')
             if error:
                 errors.append(error)
                 
         return errors
 
+    def get_duplicate_images(self, product):
+        """Photos of this product that look like photos already collected for another product"""
+        duplicates = []
+        for image, matches in find_duplicates_for_product(product).items():
+            duplicates.append({
+                'label': image.get_kind_display(),
+                'matches': [
+                    {'distance': distance, 'product': match.product, 'label': match.get_kind_display()}
+                    for distance, match in matches[:5]
+                ],
+            })
+        return duplicates
+
     def get_validation_errors(self, product):
         errors = []
 
@@ -304,21 +414,27 @@ class CombinedUploadView(LoginRequiredMixin, View):
         elif not product.package_size_unit:
             errors.append(_("Package size unit is required"))
 
-        if not product.barcodes.exists():
+        # Images may have been added since the product was loaded
+        product.refresh_from_db(fields=Product.COUNTER_FIELDS)
+
+        if not product.barcode_count:
             errors.append(_("At least one barcode image is required"))
-        elif product.has_multiple_barcodes and product.barcodes.count() < 2:
+        elif product.has_multiple_barcodes and product.barcode_count < 2:
             errors.append(_("Multiple barcodes were indicated but not all were uploaded"))
 
-        if not product.nutrition_facts.exists():
+        if not product.nutrition_count:
             errors.append(_("At least one nutrition facts image is required"))
-        elif product.has_multiple_nutrition_facts and product.nutrition_facts.count() < 2:
+        elif product.has_multiple_nutrition_facts and product.nutrition_count < 2:
             errors.append(_("Multiple nutrition facts were indicated but not all were uploaded"))
 
-        if not product.ingredients.exists():
+        if not product.ingredients_count:
             errors.append(_("At least one ingredients image is required"))
 
         required_types = {'front', 'back'}
-        existing_types = set(product.product_images.values_list('image_type', flat=True))
+        existing_types = {
+            kind for kind in PRODUCT_IMAGE_KINDS
+            if getattr(product, f'{kind}_image_count')
+        }
         missing_types = required_types - existing_types
 
         if missing_types:
@@ -346,90 +462,176 @@ class CombinedUploadView(LoginRequiredMixin, View):
                 if not image_id or not image_type:
                     continue
                 
-                try:
-                    if image_type == 'barcode':
-                        image = Barcode.objects.get(id=image_id, product_id=product_pk)
-                    elif image_type == 'nutrition':
-                        image = NutritionFacts.objects.get(id=image_id, product_id=product_pk)
-                    elif image_type == 'ingredients':
-                        image = Ingredients.objects.get(id=image_id, product_id=product_pk)
-                    elif image_type in ['front', 'back', 'side', 'other']:
-                        image = ProductImage.objects.get(id=image_id, product_id=product_pk)
-                    else:
-                        continue
-                    
-                    image.notes = notes
-                    image.save(update_fields=['notes'])
-                    
-                except Exception as e:
-                    print(f"Error updating notes for image {image_id}: {e}")
+                if image_type not in PHOTO_KINDS:
                     continue
+                # Notes only; a single UPDATE whatever the kind
+                updated = Photo.objects.filter(id=image_id, product_id=product_pk, kind=image_type).update(notes=notes)
+                if not updated:
+                    print(f"Error updating notes for image {image_id}: not found")
+            Product.objects.filter(pk=product_pk).touch_images()
                     
         except Exception as e:
             print(f"Error processing uploaded_images_notes: {e}")
 
-@require_POST
-@transaction.atomic
-def ajax_upload_image(request, pk):
+def get_draft(request, token, create=False):
+    """
+    ``(token, product)`` for the draft a new-submission page started, or
+    ``(new token, None)`` if the token is missing or malformed. With
+    ``create`` the product row is created on first use.
+    """
+    try:
+        token = uuid.UUID(str(token))
+    except ValueError:
+        return uuid.uuid4(), None
+    if create:
+        product, _created = Product.objects.get_or_create(
+            draft_token=token,
+            created_by_user=request.user,
+            defaults={'created_by': request.user.email, 'product_name': ''},
+        )
+    else:
+        product = Product.objects.filter(draft_token=token, created_by_user=request.user).first()
+    return token, product
+
+
+def upload_error(request):
+    """Why the posted photo cannot be stored, or None"""
     if 'file' not in request.FILES:
-        return JsonResponse({'success': False, 'error': _("No file provided")})
-
-    file_obj = request.FILES['file']
+        return _("No file provided")
     image_type = request.POST.get('image_type')
-    
     if not image_type:
-        return JsonResponse({'success': False, 'error': _("No image type specified")})
+        return _("No image type specified")
+    if image_type not in PHOTO_KINDS:
+        return _("Invalid image type")
+    return None
+
+
+def store_upload(request, product):
+    """Save the posted photo on ``product``; returns the JSON response data"""
+    image_type = request.POST['image_type']
+    image = Photo.objects.create(
+        product=product,
+        kind=image_type,
+        image=request.FILES['file'],
+        barcode_number=request.POST.get('barcode_number', '') if image_type == 'barcode' else '',
+        notes=request.POST.get('notes', ''),
+        is_uploaded=True
+    )
+    return {
+        'success': True,
+        'image_id': image.id,
+        'image_url': image.image.url if image.is_uploaded else None,
+        'image_type': image_type,
+        'is_uploaded': image.is_uploaded
+    }
+
+
+@require_POST
+@transaction.atomic
+def ajax_upload_image(request, pk):
+    error = upload_error(request)
+    if error:
+        return JsonResponse({'success': False, 'error': error})
 
     try:
         product = get_object_or_404(Product, pk=pk)
-        notes = request.POST.get('notes', '')
-        
-        if image_type == 'barcode':
-            barcode_number = request.POST.get('barcode_number', '')
-            image = Barcode.objects.create(
-                product=product,
-                image=file_obj,
-                barcode_number=barcode_number,
-                notes=notes,
-                is_uploaded=True
-            )
-        elif image_type == 'nutrition':
-            image = NutritionFacts.objects.create(
-                product=product,
-                image=file_obj,
-                notes=notes,
-                is_uploaded=True
-            )
-        elif image_type == 'ingredients':
-            image = Ingredients.objects.create(
-                product=product,
-                image=file_obj,
-                notes=notes,
-                is_uploaded=True
-            )
-        elif image_type in ['front', 'back', 'side', 'other']:
-            image = ProductImage.objects.create(
-                product=product,
-                image=file_obj,
-                image_type=image_type,
-                notes=notes,
-                is_uploaded=True
-            )
-        else:
-            return JsonResponse({'success': False, 'error': _("Invalid image type")})
+        return JsonResponse(store_upload(request, product))
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)})
 
-        return JsonResponse({
-            'success': True,
-            'image_id': image.id,
-            'image_url': image.image.url,
-            'image_type': image_type
-        })
 
+@require_POST
+@login_required
+@transaction.atomic
+def ajax_upload_draft(request, token):
+    """
+    First upload from a new-submission page: creates the draft product, then
+    stores the photo. The page switches to the product's own URLs from here on.
+    """
+    error = upload_error(request)
+    if error:
+        return JsonResponse({'success': False, 'error': error})
+
+    try:
+        _token, product = get_draft(request, token, create=True)
+        data = store_upload(request, product)
     except Exception as e:
+        # Don't commit a draft the photo never made it into
+        transaction.set_rollback(True)
         return JsonResponse({'success': False, 'error': str(e)})
+    data.update(draft_urls(product))
+    return JsonResponse(data)
 
 
-@require_POST
+def draft_urls(product):
+    """The product's own URLs, for a new-submission page whose draft now exists"""
+    return {
+        'product_id': product.pk,
+        'edit_url': reverse('products:combined_upload_edit', kwargs={'pk': product.pk}),
+        'upload_url': reverse('products:ajax_upload', kwargs={'pk': product.pk}),
+        'validate_url': reverse('products:validate_product', kwargs={'pk': product.pk}),
+        'delete_url': reverse('products:delete_image', kwargs={'pk': product.pk}),
+        'autosave_url': reverse('products:autosave_product', kwargs={'pk': product.pk}),
+    }
+
+
+def read_changes(request):
+    """The changed fields in an autosave body, or None unless it is a JSON object"""
+    try:
+        changes = json.loads(request.body)
+    except ValueError:
+        return None
+    return changes if isinstance(changes, dict) else None
+
+
+def autosave(product, changes):
+    """
+    Write the valid fields in ``changes`` with a single UPDATE of just those
+    columns; returns the JSON response data including the submission's new
+    validation state. Invalid fields are reported and left unsaved.
+    """
+    cleaned, errors = ProductSetupForm(instance=product).clean_partial(changes)
+    if cleaned:
+        for name, value in cleaned.items():
+            setattr(product, name, value)
+        product.save(update_fields=[*cleaned, 'updated_at'])
+    validation_errors = CombinedUploadView().get_validation_errors(product)
+    return {
+        'success': not errors,
+        'saved': sorted(cleaned),
+        'errors': errors,
+        'valid': not validation_errors,
+        'validation_errors': validation_errors,
+    }
+
+
+@require_http_methods(['PATCH'])
+@login_required
+@transaction.atomic
+def autosave_product(request, pk):
+    changes = read_changes(request)
+    if changes is None:
+        return JsonResponse({'success': False, 'error': _("Expected a JSON object of changed fields")}, status=400)
+    product = get_object_or_404(Product, pk=pk)
+    return JsonResponse(autosave(product, changes))
+
+
+@require_http_methods(['PATCH'])
+@login_required
+@transaction.atomic
+def autosave_draft(request, token):
+    """Autosave from a new-submission page; like an upload, creates the draft first"""
+    changes = read_changes(request)
+    if changes is None:
+        return JsonResponse({'success': False, 'error': _("Expected a JSON object of changed fields")}, status=400)
+    _token, product = get_draft(request, token, create=True)
+    data = autosave(product, changes)
+    data.update(draft_urls(product))
+    return JsonResponse(data)
+
+
+@require_http_methods(['GET', 'POST'])
+@product_conditional
 def validate_product_submission(request, pk):
     try:
         product = Product.objects.get(pk=pk)
@@ -465,16 +667,9 @@ def delete_image(request, pk):
         
         product = get_object_or_404(Product, pk=pk)
         
-        if image_type == 'barcode':
-            image = get_object_or_404(Barcode, id=image_id, product=product)
-        elif image_type == 'nutrition':
-            image = get_object_or_404(NutritionFacts, id=image_id, product=product)
-        elif image_type == 'ingredients':
-            image = get_object_or_404(Ingredients, id=image_id, product=product)
-        elif image_type in ['front', 'back', 'side', 'other']:
-            image = get_object_or_404(ProductImage, id=image_id, product=product, image_type=image_type)
-        else:
+        if image_type not in PHOTO_KINDS:
             return JsonResponse({'success': False, 'error': _("Invalid image type")})
+        image = get_object_or_404(Photo, id=image_id, product=product, kind=image_type)
         
         if image.image:
             try:
@@ -487,4 +682,60 @@ def delete_image(request, pk):
         return JsonResponse({'success': True})
         
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
\ No newline at end of file
+        return JsonResponse({'success': False, 'error': str(e)})
+
+
+@require_GET
+@login_required
+def barcode_lookup(request):
+    """
+    Products already collected with a barcode, for the as-you-type check on
+    the upload page. ``?code=`` is required; ``batch`` limits matches to one
+    source batch and ``exclude`` drops the product being edited.
+    """
+    exclude = request.GET.get('exclude')
+    normalized, matches = lookup_barcode(
+        request.GET.get('code', ''),
+        source_batch=request.GET.get('batch') or None,
+        exclude=int(exclude) if exclude and exclude.isdigit() else None,
+    )
+    return JsonResponse({
+        'code': normalized,
+        'valid': bool(normalized),
+        'matches': [
+            {**match, 'url': reverse('products:combined_upload_edit', kwargs={'pk': match['id']})}
+            for match in matches
+        ],
+    })
+
+
+@require_GET
+@login_required
+def product_list_api(request):
+    """JSON version of the product listing, with the same filters and cursors"""
+    try:
+        _form, page = get_product_page(request)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    results = []
+    for product in page:
+        row = {field: getattr(product, field) for field in LIST_FIELDS}
+        row['image_counts'] = {
+            'barcode': product.barcode_count,
+            'nutrition': product.nutrition_count,
+            'ingredients': product.ingredients_count,
+            'front': product.front_image_count,
+            'back': product.back_image_count,
+            'side': product.side_image_count,
+            'other': product.other_image_count,
+            'product_images': product.product_image_count,
+        }
+        row['url'] = reverse('products:combined_upload_edit', kwargs={'pk': product.pk})
+        results.append(row)
+
+    return JsonResponse({
+        'results': results,
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
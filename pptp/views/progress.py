@@ -0,0 +1,20 @@
+# views/progress.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from ..progress import batch_summaries
+
+
+@require_GET
+@staff_member_required
+def batch_progress(request):
+    """
+    Collection progress per source batch, read from the BatchProgress
+    summary rather than Product. ``?format=json`` returns the same data.
+    """
+    summaries = batch_summaries()
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'batches': summaries})
+    return render(request, 'pptp/products/batch_progress.html', {'batches': summaries})
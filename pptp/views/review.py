@@ -0,0 +1,71 @@
+# views/review.py
+from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from django.views.decorators.http import require_http_methods, require_POST
+
+from ..forms.products import ReviewForm
+from ..models import Photo, Product
+from ..models.products import PRODUCT_IMAGE_KINDS
+from ..models.review import ReviewTask
+from ..review import LeaseExpired, available_tasks, claim_next, complete, held_tasks, release, renew
+
+
+@require_http_methods(['GET', 'POST'])
+@staff_member_required
+def review_queue(request):
+    """The reviewer's claimed tasks; POST claims the next batch"""
+    if request.method == 'POST':
+        if not claim_next(request.user):
+            messages.info(request, _("There is nothing left to review right now."))
+        return redirect('products:review_queue')
+
+    now = timezone.now()
+    tasks = held_tasks(request.user, now).select_related('product').order_by('pk')
+    return render(request, 'pptp/products/review_queue.html', {
+        'tasks': tasks,
+        'waiting': available_tasks(now).count(),
+    })
+
+
+@require_http_methods(['GET', 'POST'])
+@staff_member_required
+def review_task(request, pk):
+    task = get_object_or_404(ReviewTask.objects.filter(completed_at__isnull=True), pk=pk)
+    if not renew(task.pk, request.user):
+        messages.error(request, _("This review is not assigned to you, claim it from the queue."))
+        return redirect('products:review_queue')
+
+    form = ReviewForm(request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        try:
+            complete(task.pk, request.user, form.cleaned_data['outcome'], form.cleaned_data['notes'])
+        except LeaseExpired as e:
+            messages.error(request, str(e))
+        else:
+            messages.success(request, _("Review saved."))
+        return redirect('products:review_queue')
+
+    # Everything the template shows, in two queries
+    product = get_object_or_404(
+        Product.objects.prefetch_related(Prefetch('photos', queryset=Photo.objects.order_by('pk'))),
+        pk=task.product_id,
+    )
+    photos = product.photos_by_kind()
+    return render(request, 'pptp/products/review.html', {
+        'task': task,
+        'product': product,
+        'photos': photos,
+        'product_images': [image for kind in PRODUCT_IMAGE_KINDS for image in photos[kind]],
+        'form': form,
+    })
+
+
+@require_POST
+@staff_member_required
+def release_review(request, pk):
+    release(pk, request.user)
+    return redirect('products:review_queue')